@@ -0,0 +1,227 @@
+"""
+Batch parsing of text resumes: several resumes per LLM call instead of one.
+
+Resumes are packed into requests up to a token budget (BATCH_TOKEN_BUDGET, estimated
+with the rate limiter's estimate_tokens) and at most BATCH_MAX_RESUMES each, with BATCH_SYSTEM_PROMPT
+sent once per request and a JSON-array output. Array items are mapped back to their
+source by "index" and validated one by one; only the items that are missing or
+invalid (or whose whole request failed) are re-run individually.
+
+Usage (from the ResumeParsing directory):
+    python BatchResumeAgent.py resumes/*.txt
+"""
+import argparse
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from Promptvariable import BATCH_SYSTEM_PROMPT
+import backend_path  # noqa: F401  (makes backend.core importable)
+from backend.core.llm_clients.structured import StructuredLLMCaller, LLMCallError
+from backend.core.llm_clients.rate_limiter import estimate_tokens, get_rate_limiter
+from backend.core.skill_index import SkillRegistry
+from ResumeSchema import validateResume
+from pymongo import MongoClient
+
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", "24000"))
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "10"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "2"))
+# Opening tags of the resume blocks (BATCH_SYSTEM_PROMPT itself mentions <resume index="N">).
+RESUME_TAG_RE = re.compile(r'<resume index="\d+">')
+
+
+def loadTextResumes(paths: List[str]) -> List[Tuple[str, str]]:
+    """(source path, text) for each readable text resume."""
+    items = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            items.append((path, f.read()))
+    return items
+
+
+def packBatches(items: List[Tuple[str, str]], tokenBudget: int = BATCH_TOKEN_BUDGET,
+                maxResumes: int = BATCH_MAX_RESUMES) -> List[List[int]]:
+    """
+    Greedy packing of item positions into batches whose estimated prompt size stays
+    within tokenBudget. A resume larger than the budget on its own gets its own batch.
+    """
+    base = estimate_tokens(BATCH_SYSTEM_PROMPT, expected_output=0)
+    batches, current, used = [], [], base
+    for position, (_, text) in enumerate(items):
+        cost = estimate_tokens(text, expected_output=0) + 16  # tag overhead
+        if current and (used + cost > tokenBudget or len(current) >= maxResumes):
+            batches.append(current)
+            current, used = [], base
+        current.append(position)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def expectedOutput(prompt: str) -> int:
+    """Output token estimate for a batch prompt: ~300 tokens per resume object."""
+    return 300 * max(1, len(RESUME_TAG_RE.findall(prompt)))
+
+
+def buildBatchPrompt(texts: List[str]) -> str:
+    blocks = [f'<resume index="{index}">\n{text.strip()}\n</resume>' for index, text in enumerate(texts)]
+    return BATCH_SYSTEM_PROMPT + "\n\n" + "\n\n".join(blocks)
+
+
+def mapBatchOutput(output: List[Any], size: int) -> Dict[int, Any]:
+    """
+    Array items keyed by their "index" field (falling back to array position when the
+    model dropped the indices but returned exactly one item per resume).
+    """
+    mapped = {}
+    for position, item in enumerate(output):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", None)
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            index = position if len(output) == size else None
+        if index is not None and 0 <= index < size and index not in mapped:
+            mapped[index] = item
+    return mapped
+
+
+class GeminiTextClient:
+    """generate(prompt) -> response text, in JSON mode (same client setup as ResumeAgent)."""
+
+    def __init__(self, modelName: Optional[str] = None):
+        from google import genai
+        self.modelName = modelName or os.environ.get("GEMINI_MODEL_NAME")
+        if not self.modelName:
+            raise ValueError("Model name not found.")
+        self.model = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+
+    def generate(self, prompt: str) -> str:
+        # Bulk ingestion yields to interactive search and single uploads in the shared limiter.
+        rateLimiter = get_rate_limiter()
+        callId = rateLimiter.acquire(estimate_tokens(prompt, expectedOutput(prompt)), "bulk") if rateLimiter else None
+        response = self.model.models.generate_content(
+            model=self.modelName,
+            contents=[prompt],
+            config={"response_mime_type": "application/json"},
+        )
+        if callId is not None:
+            rateLimiter.record_usage(callId, getattr(response.usage_metadata, "total_token_count", None))
+        return response.text
+
+
+class BatchResumeAgent:
+    def __init__(self, client=None, tokenBudget: int = BATCH_TOKEN_BUDGET,
+                 maxResumes: int = BATCH_MAX_RESUMES, concurrency: int = BATCH_CONCURRENCY,
+                 baseDelay: float = 0.5):
+        self.client = client or GeminiTextClient()
+        self.tokenBudget = tokenBudget
+        self.maxResumes = maxResumes
+        self.concurrency = concurrency
+        self.batchCaller = StructuredLLMCaller("resume_batch_parsing", self.client.generate, base_delay=baseDelay)
+        # Own caller (and circuit breaker) for the per-resume retries, so failed batches
+        # opening the batch circuit do not also short-circuit the fallback path.
+        self.singleCaller = StructuredLLMCaller("resume_single_parsing", self.client.generate, base_delay=baseDelay)
+        self.stats = {"calls": 0, "batched": 0, "retried": 0, "failed": 0}
+        self._statsLock = threading.Lock()
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._statsLock:
+            self.stats[key] += n
+
+    def parseBatch(self, texts: List[str], caller: Optional[StructuredLLMCaller] = None) -> Dict[int, Any]:
+        """Valid resumes of one packed request, keyed by position; invalid ones are left out."""
+        self.count("calls")
+        try:
+            output = (caller or self.batchCaller).call_json(buildBatchPrompt(texts), expect=list)
+        except LLMCallError as e:
+            print(f"❌ Batch of {len(texts)} resumes failed ({e.failure_mode}): {e}")
+            return {}
+        parsed = {}
+        for index, item in mapBatchOutput(output, len(texts)).items():
+            try:
+                parsed[index] = validateResume(item)
+            except ValueError as e:
+                print(f"⚠️  Resume {index} in batch failed validation: {e}")
+        return parsed
+
+    def parseAll(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Parses (source, text) items. Returns one entry per item, in input order:
+        {"source", "resume"} on success or {"source", "error"}, plus "mode" (batch/single).
+        """
+        batches = packBatches(items, self.tokenBudget, self.maxResumes)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        def runBatch(positions: List[int]) -> None:
+            parsed = self.parseBatch([items[p][1] for p in positions])
+            for index, resume in parsed.items():
+                results[positions[index]] = {"source": items[positions[index]][0], "resume": resume, "mode": "batch"}
+            self.count("batched", len(parsed))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            list(pool.map(runBatch, batches))
+
+        # Re-run only what the batches did not return valid.
+        failed = [p for p, result in enumerate(results) if result is None]
+
+        def runSingle(position: int) -> None:
+            source, text = items[position]
+            self.count("retried")
+            resume = self.parseBatch([text], self.singleCaller).get(0)
+            if resume is None:
+                self.count("failed")
+                results[position] = {"source": source, "error": "could not parse resume", "mode": "single"}
+            else:
+                results[position] = {"source": source, "resume": resume, "mode": "single"}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            list(pool.map(runSingle, failed))
+        return results
+
+    def sendToMongo(self, results: List[Dict[str, Any]]) -> int:
+        mongo_uri = os.getenv("MONGO_URI")
+        mongo_db = os.getenv("MONGO_DB")
+        mongo_collection = os.getenv("MONGO_COLLECTION")
+        if not mongo_uri or not mongo_db or not mongo_collection:
+            raise ValueError("MongoDB credentials are missing in the .env file.")
+
+        db = MongoClient(mongo_uri)[mongo_db]
+        registry = SkillRegistry(db)
+        resumes = []
+        for result in results:
+            if "resume" in result:
+                resume = dict(result["resume"], source=os.path.basename(result["source"]))
+                resume.update(registry.skill_fields(resume.get("skills", [])))
+                resumes.append(resume)
+        if resumes:
+            db[mongo_collection].insert_many(resumes, ordered=False)
+        print(f"✅ {len(resumes)} resumes inserted into MongoDB")
+        return len(resumes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--mongo", action="store_true", help="insert parsed resumes into MongoDB")
+    parser.add_argument("--token-budget", type=int, default=BATCH_TOKEN_BUDGET)
+    parser.add_argument("--max-resumes", type=int, default=BATCH_MAX_RESUMES)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    agent = BatchResumeAgent(tokenBudget=args.token_budget, maxResumes=args.max_resumes)
+    results = agent.parseAll(loadTextResumes(args.paths))
+    for result in results:
+        print(json.dumps(result, default=str))
+    print(f"stats: {agent.stats}")
+    if args.mongo:
+        agent.sendToMongo(results)
+
+
+if __name__ == "__main__":
+    main()
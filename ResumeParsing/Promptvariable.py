@@ -41,4 +41,26 @@ for example:
 }
 ```
 If unsure about the input, return the JSON with all values as empty strings or empty arrays.
-"""
\ No newline at end of file
+"""
+BATCH_SYSTEM_PROMPT = """
+You are an agent specialized in extracting structured information from resumes. Several plain-text resumes follow, each wrapped in <resume index="N"> ... </resume> tags. Extract the following details from every resume independently, preserving the original text exactly as it appears. If any detail is missing, return an empty string ("") or an empty array ([]).
+
+Details to extract:
+- index: The index attribute of the resume's <resume> tag (a number).
+- id: A unique identifier for the resume (use "1" as a placeholder if not provided).
+- name: Full name of the individual.
+- title: Current or most recent job title.
+- company: Current or most recent company name.
+- summary: A brief professional summary or objective statement.
+- skills: A list of technical and soft skills (e.g., ["React", "TypeScript", "Leadership"]).
+- location: Geographical location of the individual.
+- email: Email address of the individual.
+
+Output one JSON array with exactly one object per resume, in the same order as the input:
+```json
+[
+  {"index": 0, "id": "1", "name": "", "title": "", "company": "", "summary": "", "skills": [], "location": "", "email": ""}
+]
+```
+Never merge details from different resumes. If a resume is unreadable, still return its object with the index and all other values empty.
+"""
@@ -2,6 +2,11 @@ import json
 import os
 from google import genai
 from Promptvariable import SYSTEM_PROMPT
+import backend_path  # noqa: F401  (makes backend.core importable)
+from backend.core.llm_clients.structured import StructuredLLMCaller, LLMCallError, extract_json
+from backend.core.llm_clients.rate_limiter import estimate_tokens, get_rate_limiter
+from backend.core.skill_index import SkillRegistry
+from ResumeSchema import RESUME_FIELDS, validateResume  # noqa: F401  (re-exported for callers)
 from pdf2image import convert_from_path
 from PIL import Image
 from pymongo import MongoClient
@@ -28,6 +33,8 @@ class ResumeAgent:
         self.model = None
         self.pdf = pdf_path
         self.images = None
+        # Retries (with backoff) cover only the LLM step; the PDF is rasterized once.
+        self.llmCaller = StructuredLLMCaller("resume_parsing", self.generate)
     def getClient(self):
         if not self.model:
             try:
@@ -39,17 +46,14 @@ class ResumeAgent:
         if not self.response:
             raise ValueError("No response found.")
         try:
-            startIndex = self.response.index('{')
-            endIndex = self.response.rindex('}') + 1
-            jsonString = self.response[startIndex:endIndex]
-            jsonOutput = json.loads(jsonString)
-        except (ValueError, json.JSONDecodeError) as e:
+            jsonOutput = extract_json(self.response)
+        except ValueError as e:
             raise ValueError(f"Failed to parse JSON response: {e}")
-        if not isinstance(jsonOutput, dict):
-            raise ValueError("Parsed JSON is not a dictionary.")
-        return jsonOutput
+        return validateResume(jsonOutput)
     
     def getImages(self):
+        if self.images is not None:
+            return
         images = convert_from_path(self.pdf)
         image_contents = []
         for image in images:
@@ -66,6 +70,21 @@ class ResumeAgent:
         self.images = image_contents
 
 
+    def generate(self, contents):
+        # Single uploads rank below search traffic but ahead of batch ingestion.
+        rateLimiter = get_rate_limiter()
+        callId = rateLimiter.acquire(estimate_tokens(contents), "default") if rateLimiter else None
+        response = self.model.models.generate_content(
+            model=self.modelName,
+            contents=contents,
+            config={"response_mime_type": "application/json"},
+        )
+        if callId is not None:
+            rateLimiter.record_usage(callId, getattr(response.usage_metadata, "total_token_count", None))
+        self.response = response.text
+        print(self.response)
+        return self.response
+
     def getResponse(self):
         if not self.modelName:
             raise ValueError("Model name not set.")
@@ -77,27 +96,16 @@ class ResumeAgent:
         if not self.model:
             raise ValueError("Model not initialized.")
         try:
-
-            response = self.model.models.generate_content(
-                model=self.modelName,
-                contents=self.images + [self.systemPrompt],
+            self.jsonOutput = self.llmCaller.call_json(
+                self.images + [self.systemPrompt],
+                validate=validateResume,
             )
-        except Exception as e:
-            raise ValueError(f"Failed to get response: {e}")
-
-        self.response = response.text
-        print(self.response)
-        self.jsonOutput = self.parseRespone()
+        except LLMCallError as e:
+            raise ValueError(f"Failed to get response ({e.failure_mode}): {e}")
 
     def getJsonOutput(self):
         if not self.jsonOutput:
-            for _ in range(3):
-                try:
-                    self.getResponse()
-                    if self.jsonOutput:
-                        break
-                except ValueError:
-                    continue
+            self.getResponse()
             if not self.jsonOutput:
                 raise ValueError("No JSON output found.")
         return self.jsonOutput
@@ -125,7 +133,10 @@ class ResumeAgent:
 
             #print("📤 Sending data to MongoDB...",self.getJsonOutput())
 
-            collection.insert_one(self.getJsonOutput())
+            resume = self.getJsonOutput()
+            # Skill codes/bitset for the search API's SkillBitsetIndex (picked up on its next sync).
+            resume.update(SkillRegistry(db).skill_fields(resume.get("skills", [])))
+            collection.insert_one(resume)
             print(f"✅ Data successfully inserted into MongoDB")
         except Exception as e:
             print(f"❌ Error sending data to MongoDB: {e}")
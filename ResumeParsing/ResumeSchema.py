@@ -0,0 +1,12 @@
+RESUME_FIELDS = ["id", "name", "title", "company", "summary", "skills", "location", "email"]
+
+
+def validateResume(output):
+    """Fills missing resume fields with empty values; rejects non-object output."""
+    if not isinstance(output, dict):
+        raise ValueError("Parsed JSON is not a dictionary.")
+    for field in RESUME_FIELDS:
+        output.setdefault(field, [] if field == "skills" else "")
+    if not isinstance(output["skills"], list):
+        raise ValueError("skills must be a list.")
+    return output
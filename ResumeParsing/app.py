@@ -2,6 +2,8 @@ from flask import Flask
 from flask_cors import CORS
 from flasgger import Swagger
 from extract_resume import resume_extractor_bp
+import backend_path  # noqa: F401  (makes backend.core importable)
+from backend import config
 
 def create_app():
     app = Flask(__name__)
@@ -13,6 +15,10 @@ def create_app():
         return "backend is running!"
     
     app.register_blueprint(resume_extractor_bp, url_prefix="/")
+
+    if config.PROFILING_ENABLED:
+        from backend.core.profiling import install_flask_profiler
+        install_flask_profiler(app)
     return app
 
 app = create_app()
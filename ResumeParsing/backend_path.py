@@ -0,0 +1,8 @@
+# Makes the repository root importable so this Flask service (run from the
+# ResumeParsing directory) can reuse shared helpers under backend/.
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
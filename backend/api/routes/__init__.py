@@ -3,6 +3,8 @@ from .search import router as search_router
 from .features import router as features_router
 from .rank import router as rank_router
 from .feedback import router as feedback_router
+from .bulk_import import router as bulk_import_router
+from .outreach import router as outreach_router
 
 all_routers = [
     job_router,
@@ -10,4 +12,6 @@ all_routers = [
     features_router,
     rank_router,
     feedback_router,
+    bulk_import_router,
+    outreach_router,
 ]
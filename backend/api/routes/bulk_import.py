@@ -0,0 +1,164 @@
+# bulk_import.py
+import asyncio
+import json
+import threading
+from typing import AsyncIterator, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pymongo.collection import Collection
+from starlette.background import BackgroundTask
+from backend import config
+from backend.core.bulk_importer import BulkImporter, RecordParser
+from backend.core.embedder import SemanticEmbedder
+from backend.core.skill_index import SkillRegistry
+from backend.dependencies import get_embedder, get_mongo_collection, get_skill_registry
+
+router = APIRouter()
+
+import_slots = threading.BoundedSemaphore(config.IMPORT_MAX_CONCURRENT)
+
+
+class ImportSlot:
+    """One acquired import_slots permit. release() is idempotent so every exit path may call it."""
+
+    def __init__(self):
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        import_slots.release()
+
+
+async def iter_lines(request: Request) -> AsyncIterator[Optional[str]]:
+    """
+    Splits the request body into lines as it arrives. A line longer than
+    IMPORT_MAX_LINE_BYTES (encoded) is discarded up to its newline and yielded as a
+    single None, which the caller reports as one invalid row.
+    """
+    buffer = b""
+    skipping = False  # inside the rest of an oversized line
+    async for chunk in request.stream():
+        buffer += chunk
+        # b"\n" never occurs inside a multi-byte UTF-8 sequence, so lines can be split
+        # before decoding and measured in bytes.
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > config.IMPORT_MAX_LINE_BYTES:
+                yield None
+            else:
+                yield line.decode("utf-8", errors="replace") + "\n"
+        if len(buffer) > config.IMPORT_MAX_LINE_BYTES:
+            if not skipping:
+                yield None
+            skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield buffer.decode("utf-8", errors="replace") if len(buffer) <= config.IMPORT_MAX_LINE_BYTES else None
+
+
+_END = object()  # end-of-body marker on the line queue
+
+
+async def read_body(request: Request, lines: asyncio.Queue, disconnected: asyncio.Event) -> None:
+    """
+    Producer for the import: the only reader of the request's receive channel. Puts
+    body lines on the bounded `lines` queue, then _END (or the exception that stopped
+    it), and sets `disconnected` once the client has gone.
+    """
+    try:
+        async for line in iter_lines(request):
+            await lines.put(line)
+        await lines.put(_END)
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+    except Exception as e:
+        await lines.put(e)
+    finally:
+        disconnected.set()
+
+
+class ImportResponse(StreamingResponse):
+    """
+    StreamingResponse whose disconnect listener waits for read_body instead of calling
+    receive() itself. Under ASGI spec_version < 2.4 Starlette runs that listener next to
+    the body iterator, and it would swallow http.request messages the import still needs.
+    """
+
+    def __init__(self, content, disconnected: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.disconnected = disconnected
+
+    async def __call__(self, scope, receive, send) -> None:
+        async def wait_for_disconnect():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        await super().__call__(scope, wait_for_disconnect, send)
+
+
+@router.post("/candidates/bulk-import")
+async def bulk_import(
+    request: Request,
+    format: Literal["jsonl", "csv"] = "jsonl",
+    collection: Collection = Depends(get_mongo_collection),
+    embedder: SemanticEmbedder = Depends(get_embedder),
+    skill_registry: Optional[SkillRegistry] = Depends(get_skill_registry),
+):
+    """
+    Streams a JSONL or CSV body (raw request body, not multipart) into the candidate
+    collection and streams NDJSON progress/error events back. The body is read by a
+    producer task started here, at most one batch of lines ahead of the database: while
+    a batch is embedded and inserted the queue fills up and no more input is read, so a
+    slow import pushes back on the uploader instead of buffering.
+    """
+    if not import_slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Too many imports in progress, please retry.", headers={"Retry-After": "30"})
+    slot = ImportSlot()
+
+    importer = BulkImporter(collection, embedder, skill_registry)
+    lines: asyncio.Queue = asyncio.Queue(maxsize=importer.batch_size)
+    disconnected = asyncio.Event()
+    producer = asyncio.create_task(read_body(request, lines, disconnected))
+
+    def finish() -> None:
+        producer.cancel()
+        slot.release()
+
+    async def events():
+        try:
+            parser = RecordParser(format)
+            batch = []
+            while True:
+                line = await lines.get()
+                if line is _END:
+                    break
+                if isinstance(line, Exception):
+                    raise line
+                parsed = parser.oversized() if line is None else parser.feed(line)
+                if parsed is None:
+                    continue
+                batch.append(parsed)
+                if len(batch) >= importer.batch_size:
+                    for event in await run_in_threadpool(importer.import_batch, batch):
+                        yield json.dumps(event) + "\n"
+                    batch = []
+            trailing = parser.finish()
+            if trailing:
+                batch.append(trailing)
+            if batch:
+                for event in await run_in_threadpool(importer.import_batch, batch):
+                    yield json.dumps(event) + "\n"
+            yield json.dumps(importer.progress("done")) + "\n"
+        finally:
+            finish()
+
+    # The background task also runs when the body generator never started (e.g. the
+    # client went away first), so neither the slot nor the producer can leak.
+    return ImportResponse(events(), disconnected, media_type="application/x-ndjson", background=BackgroundTask(finish))
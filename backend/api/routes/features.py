@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 from backend.core.extractor import SemanticJobExtractor
+from backend.dependencies import get_embedder
 
 router = APIRouter()
-extractor = SemanticJobExtractor()
+extractor = SemanticJobExtractor(embedder=get_embedder())
 
 class JobDescriptionRequest(BaseModel):
     text: str
@@ -1,14 +1,14 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from backend.core.embedder import SemanticEmbedder
 from backend.core.extractor import SemanticJobExtractor
 from backend.core.llm_clients.gemini_client import GeminiClient
+from backend.dependencies import get_embedder
 
 router = APIRouter()
 
 # Instantiate core components
-embedder = SemanticEmbedder()
-extractor = SemanticJobExtractor(llm_client=GeminiClient())
+embedder = get_embedder()
+extractor = SemanticJobExtractor(llm_client=GeminiClient(), embedder=embedder)
 
 # --- Pydantic Models ---
 
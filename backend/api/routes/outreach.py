@@ -0,0 +1,66 @@
+# outreach.py
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from backend import config
+from backend.core.llm_clients.gemini_client import GeminiClient
+from backend.core.llm_clients.structured import LLMCallError
+from backend.core.outreach import OutreachGenerator
+
+router = APIRouter()
+
+# Outreach is user-facing but not latency critical: it ranks below search in the LLM rate limiter.
+generator = OutreachGenerator(GeminiClient(priority="default"))
+
+
+class OutreachCandidate(BaseModel):
+    name: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    skills: List[str] = []
+    location: Optional[str] = None
+    summary: Optional[str] = None
+    email: Optional[str] = None
+
+
+class TemplateRequest(BaseModel):
+    job_description: str = Field(min_length=1)
+    sender_name: str = Field(min_length=1)
+
+
+class OutreachRequest(TemplateRequest):
+    candidates: List[OutreachCandidate] = Field(min_length=1, max_length=config.OUTREACH_MAX_CANDIDATES)
+    # LLM-written personal notes (batched, rate limited); otherwise notes are filled locally.
+    refine: bool = False
+
+
+@router.post("/outreach/template")
+def outreach_template(req: TemplateRequest) -> Dict[str, Any]:
+    """The job-level email template (generated once per job description, then cached)."""
+    try:
+        return generator.template(req.job_description, req.sender_name)
+    except LLMCallError as e:
+        raise HTTPException(status_code=502, detail=f"Template generation failed ({e.failure_mode}).")
+
+
+@router.post("/outreach/emails")
+def outreach_emails(req: OutreachRequest) -> StreamingResponse:
+    """
+    Personalized emails for every candidate, streamed as NDJSON: a "template" event,
+    one "email" event per candidate as it is ready, then "done".
+    """
+    try:
+        # Generate (or fetch) the template before streaming so failures get a proper status code.
+        generator.template(req.job_description, req.sender_name)
+    except LLMCallError as e:
+        raise HTTPException(status_code=502, detail=f"Template generation failed ({e.failure_mode}).")
+
+    candidates = [c.model_dump() for c in req.candidates]
+
+    def events():
+        for event in generator.emails(req.job_description, req.sender_name, candidates, refine=req.refine):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
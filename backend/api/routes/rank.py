@@ -4,8 +4,9 @@ from typing import List
 from backend.core.model import FeedbackModel
 from backend.core.ranker import CandidateRanker
 from backend.core.extractor import SemanticJobExtractor
+from backend.dependencies import get_embedder, get_skill_index, get_skill_registry
 
-extractor = SemanticJobExtractor()
+extractor = SemanticJobExtractor(embedder=get_embedder())
 router = APIRouter()
 
 # Initialize or load model
@@ -18,12 +19,13 @@ except Exception:
     X, y = model.simulate_training_data()
     model.train(X, y)
 
-# Initialize ranker with model
-ranker = CandidateRanker(model, extractor)
+# Initialize ranker with model; skill overlap comes from the bitset index when candidates are indexed
+ranker = CandidateRanker(model, extractor, get_skill_index(), get_skill_registry())
 
 class RankingRequest(BaseModel):
     candidates: List[dict]
+    job: dict = {}  # extracted job fields: skills, experience, qualifications
 
 @router.post("/rank-candidates")
 def rank_candidates(req: RankingRequest):
-    return ranker.rank(req.candidates)
+    return ranker.rank(req.candidates, req.job)
@@ -1,24 +1,76 @@
 # search.py
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import math
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Dict, Any, Optional
-from backend.core.extractor import SemanticJobExtractor
-from backend.core.embedder import SemanticEmbedder
-from backend.core.searcher import CandidateSearcher
-from backend.dependencies import get_mongo_collection
+from typing import List, Dict, Any, Iterator, Optional, Literal, Tuple
+from backend.core.admission import AdaptiveConcurrencyLimiter, Deadline, DeadlineExceeded
+from backend.core.extractor import SemanticJobExtractor, TieredJobExtractor
+from backend.core.searcher import CandidateSearcher, RESULT_FIELDS
+from backend.core.candidate_cache import CandidateCardCache
+from backend.core.llm_clients.structured import failure_counts
+from backend.core.llm_clients.rate_limiter import get_rate_limiter
+from backend.core.result_cache import SemanticResultCache, CachedSearch
+from backend.core.projection import VectorProjection
+from backend.core.vector_snapshot import SnapshotWatcher
+from backend.core.search_router import SearchRouter
+from backend.core.skill_index import SkillRegistry
+from backend.dependencies import get_embedder, get_mongo_collection, get_shard_collections, get_skill_index, get_skill_registry
+from backend import config
 from pymongo.collection import Collection
+from pymongo.errors import ExecutionTimeout
 from bson import ObjectId
 
 router = APIRouter()
 
 # Shared components
-extractor = SemanticJobExtractor()
-embedder = SemanticEmbedder()
+embedder = get_embedder()
+extractor = TieredJobExtractor(embedder=embedder) if config.EXTRACTION_MODE == "tiered" else SemanticJobExtractor(embedder=embedder)
+result_cache = SemanticResultCache() if config.SEMANTIC_CACHE_ENABLED else None
+card_cache = CandidateCardCache() if config.CARD_CACHE_ENABLED else None
+limiter = AdaptiveConcurrencyLimiter() if config.ADMISSION_ENABLED else None
+snapshots = SnapshotWatcher(projection=VectorProjection.load()) if config.VECTOR_BACKEND == "snapshot" else None
+shards = get_shard_collections()
+shard_card_caches = {name: CandidateCardCache() for name in shards} if config.CARD_CACHE_ENABLED else {}
+shard_skill_registries = {name: SkillRegistry(shard.database) for name, shard in shards.items()}
+# Built (and fully loaded) at startup rather than by the first snapshot search.
+skill_index = get_skill_index() if snapshots is not None else None
+
+
+def make_searcher(collection: Collection, deadline: Optional[Deadline] = None):
+    """SearchRouter over SEARCH_SHARDS when configured, otherwise a CandidateSearcher on `collection`."""
+    if shards:
+        return SearchRouter(shards, card_caches=shard_card_caches, deadline=deadline, skill_registries=shard_skill_registries)
+    if snapshots is None:
+        # required_skills are matched on the canonical skill_codes in the $vectorSearch pre-filter.
+        return CandidateSearcher(collection, card_cache=card_cache, deadline=deadline, skill_registry=get_skill_registry())
+    # Snapshot search filters required_skills through the skill bitset index.
+    return CandidateSearcher(
+        collection, card_cache=card_cache, deadline=deadline, local_index=snapshots.current(),
+        skill_index=skill_index, skill_registry=get_skill_registry(),
+    )
+
+
+ResultField = Literal["name", "title", "company", "summary", "skills", "avatarUrl", "location", "email"]
+
+
+class SearchFilters(BaseModel):
+    locations: Optional[List[str]] = None
+    min_experience: Optional[int] = Field(default=None, ge=0)
+    required_skills: Optional[List[str]] = None
+    qualifications: Optional[List[str]] = None
 
 
 class SearchRequest(BaseModel):
     job_description: str
     top_k: int = Field(default=100, gt=0, le=1000)
+    filters: Optional[SearchFilters] = None
+    mode: Literal["vector", "hybrid"] = "vector"
+    # Share of the lexical ranking in hybrid fusion; defaults to HYBRID_LEXICAL_WEIGHT.
+    lexical_weight: Optional[float] = Field(default=None, ge=0, le=1)
+    # Result fields to return; defaults to every SearchResultItem field.
+    fields: Optional[List[ResultField]] = None
 
 
 class SearchResultItem(BaseModel):
@@ -49,68 +101,215 @@ class SearchResponse(BaseModel):
     query: str
     extracted_features: Dict[str, Any]
     results: List[SearchResultItem]
+    # Per-shard outcome ("ok", "timeout", "error: ...") for scatter-gather searches.
+    shards: Optional[Dict[str, str]] = None
 
 
-@router.post("/semantic-search", response_model=SearchResponse)
-def semantic_search(req: SearchRequest, collection: Collection = Depends(get_mongo_collection)) -> SearchResponse:
-    try:
-        # Step 1: Extract fields from job description
-        features = extractor.extract_fields(req.job_description)
-        if not isinstance(features, dict):
-            raise HTTPException(status_code=500, detail="Feature extraction failed.")
-
-        skills = features.get("skills", [])
-        experience = features.get("experience", None)
-        qualifications = features.get("qualifications", [])
-
-        query_parts = []
-        if skills:
-            query_parts.append(f"skills in {', '.join(skills)}")
-        if experience:
-            query_parts.append(f"experience of {experience}")
-        if qualifications:
-            query_parts.append(f"qualifications like {', '.join(qualifications)}")
-
-        standardized_query = (
-            f"Seeking a candidate with {'; '.join(query_parts)}."
-            if query_parts else
-            "Seeking a general candidate profile based on the job description."
+def build_standardized_query(features: Dict[str, Any]) -> str:
+    skills = features.get("skills", [])
+    experience = features.get("experience", None)
+    qualifications = features.get("qualifications", [])
+
+    query_parts = []
+    if skills:
+        query_parts.append(f"skills in {', '.join(skills)}")
+    if experience:
+        query_parts.append(f"experience of {experience}")
+    if qualifications:
+        query_parts.append(f"qualifications like {', '.join(qualifications)}")
+
+    return (
+        f"Seeking a candidate with {'; '.join(query_parts)}."
+        if query_parts else
+        "Seeking a general candidate profile based on the job description."
+    )
+
+
+def run_search(
+    req: SearchRequest,
+    searcher: CandidateSearcher | SearchRouter,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[str, Dict[str, Any], List[Dict]]:
+    """
+    Full pipeline: extraction -> standardized query -> embedding -> retrieval.
+    Returns (standardized_query, features, raw_results).
+    """
+    # Step 1: Extract fields from job description
+    features = extractor.extract_fields(req.job_description, deadline=deadline)
+    if not isinstance(features, dict):
+        raise HTTPException(status_code=500, detail="Feature extraction failed.")
+    standardized_query = build_standardized_query(features)
+
+    # Step 2: Embed the standardized query
+    if deadline is not None:
+        deadline.check("embedding")
+    query_embedding = embedder.encode(standardized_query)
+    if not query_embedding or not isinstance(query_embedding, list):
+        raise HTTPException(status_code=500, detail="Query embedding failed.")
+
+    # Step 3: Perform vector search in MongoDB
+    filters = req.filters.model_dump(exclude_none=True) if req.filters else None
+    if req.mode == "hybrid":
+        # Exact skill tokens are the lexical query; fall back to the raw JD if none were extracted.
+        lexical_query = " ".join(features.get("skills", []) + features.get("qualifications", [])) or req.job_description
+        raw_results = searcher.hybrid_search(
+            embedding=query_embedding,
+            query_text=lexical_query,
+            top_k=req.top_k,
+            filters=filters,
+            lexical_weight=req.lexical_weight if req.lexical_weight is not None else config.HYBRID_LEXICAL_WEIGHT,
+            fields=req.fields,
         )
+    else:
+        raw_results = searcher.search(embedding=query_embedding, top_k=req.top_k, filters=filters, fields=req.fields)
+    return standardized_query, features, raw_results
+
+
+def cache_key(req: SearchRequest) -> str:
+    """Everything besides the JD text that changes the result set."""
+    return json.dumps({
+        "filters": req.filters.model_dump(exclude_none=True) if req.filters else None,
+        "mode": req.mode,
+        "lexical_weight": req.lexical_weight,
+    }, sort_keys=True)
 
-        # Step 2: Embed the standardized query
-        query_embedding = embedder.encode(standardized_query)
-        if not query_embedding or not isinstance(query_embedding, list):
-            raise HTTPException(status_code=500, detail="Query embedding failed.")
-
-        # Step 3: Perform vector search in MongoDB
-        searcher = CandidateSearcher(collection)
-        raw_results = searcher.search(embedding=query_embedding, top_k=req.top_k)
-
-        # Step 4: Normalize MongoDB results
-        results = []
-        for doc in raw_results:
-            result = {
-                "id": str(doc.get("_id", "")),
-                "name": doc.get("name"),
-                "title": doc.get("title"),
-                "company": doc.get("company"),
-                "summary": doc.get("summary"),
-                "skills": doc.get("skills", []),
-                "matchScore": doc.get("score"),
-                "avatarUrl": doc.get("avatarUrl"),
-                "location": doc.get("location"),
-                "email": doc.get("email")
-            }
-            results.append(result)
-
-        return SearchResponse(
+
+def search_and_cache(
+    req: SearchRequest,
+    searcher: CandidateSearcher | SearchRouter,
+    jd_embedding: List[float],
+    deadline: Optional[Deadline] = None,
+    replace: Optional[CachedSearch] = None,
+) -> Tuple[str, Dict[str, Any], List[Dict]]:
+    """run_search, then caches the result (in place of `replace` when refreshing a stale entry)."""
+    standardized_query, features, raw_results = run_search(req, searcher, deadline)
+    if result_cache is not None:
+        result_cache.store(jd_embedding, CachedSearch(
+            key=cache_key(req),
+            top_k=req.top_k,
             query=standardized_query,
-            extracted_features=features,
-            results=results
+            features=features,
+            hits=[(doc["_id"], doc.get("score")) for doc in raw_results],
+        ), text=req.job_description, replace=replace)
+    return standardized_query, features, raw_results
+
+
+def build_response(
+    standardized_query: str,
+    features: Dict[str, Any],
+    raw_results: List[Dict],
+    fields: Optional[List[str]] = None,
+) -> SearchResponse:
+    # Step 4: Normalize MongoDB results (only the requested fields are copied)
+    wanted = fields or RESULT_FIELDS
+    results = []
+    for doc in raw_results:
+        result = {field: doc.get(field) for field in wanted}
+        result["id"] = str(doc.get("_id", ""))
+        result["matchScore"] = doc.get("score")
+        if "shard" in doc:
+            result["shard"] = doc["shard"]
+        results.append(result)
+
+    return SearchResponse(
+        query=standardized_query,
+        extracted_features=features,
+        results=results
+    )
+
+
+def admit(request: Request) -> Iterator[Deadline]:
+    """
+    Admission control for search: fails fast with 503 + Retry-After when the adaptive
+    concurrency limit is reached, otherwise yields the request's Deadline (REQUEST_DEADLINE,
+    or lower via the X-Request-Timeout header) and feeds the observed latency back.
+    """
+    timeout = config.REQUEST_DEADLINE
+    header = request.headers.get("X-Request-Timeout")
+    if header is not None:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = math.nan
+        if not math.isfinite(requested):
+            raise HTTPException(status_code=400, detail="X-Request-Timeout must be a number of seconds.")
+        timeout = min(max(requested, config.REQUEST_MIN_DEADLINE), timeout)
+    # A 504 only signals overload when the request had the full deadline; one the client
+    # shortened itself says nothing about capacity and must not shrink the shared limit.
+    client_shortened = timeout < config.REQUEST_DEADLINE
+    deadline = Deadline(timeout)
+    if limiter is None:
+        yield deadline
+        return
+
+    if not limiter.try_acquire():
+        raise HTTPException(
+            status_code=503,
+            detail="Search is over capacity, please retry.",
+            headers={"Retry-After": str(limiter.retry_after())},
         )
+    start = time.monotonic()
+    dropped = False
+    try:
+        yield deadline
+    except HTTPException as e:
+        dropped = e.status_code == 504 and not client_shortened
+        raise
+    finally:
+        limiter.release(time.monotonic() - start, dropped=dropped)
+
+
+@router.post("/semantic-search", response_model=SearchResponse)
+def semantic_search(
+    req: SearchRequest,
+    background_tasks: BackgroundTasks,
+    collection: Collection = Depends(get_mongo_collection),
+    deadline: Deadline = Depends(admit),
+) -> SearchResponse:
+    try:
+        searcher = make_searcher(collection, deadline)
+        if result_cache is None:
+            response = build_response(*run_search(req, searcher, deadline), fields=req.fields)
+        else:
+            # Near-duplicate JDs reuse a prior search and skip extraction, embedding and $vectorSearch.
+            result_cache.refresh_corpus_version(*(shards.values() if shards else [collection]))
+            jd_embedding = embedder.encode(req.job_description)
+            cached = result_cache.lookup(jd_embedding, cache_key(req), req.top_k, text=req.job_description)
+            if cached is None:
+                response = build_response(*search_and_cache(req, searcher, jd_embedding, deadline), fields=req.fields)
+            else:
+                if config.SEMANTIC_CACHE_MODE == "refresh":
+                    # Runs after the response is sent, so it gets its own searcher without the request deadline.
+                    background_tasks.add_task(search_and_cache, req, make_searcher(collection), jd_embedding, replace=cached)
+                raw_results = searcher.fetch_by_ids(cached.hits[:req.top_k], fields=req.fields)
+                response = build_response(cached.query, cached.features, raw_results, fields=req.fields)
+
+        if isinstance(searcher, SearchRouter):
+            response.shards = searcher.shard_status
+        return response
 
     except HTTPException:
         raise
+    except (DeadlineExceeded, ExecutionTimeout) as e:
+        print(f"semantic_search exceeded its deadline: {e}")
+        raise HTTPException(status_code=504, detail="Search did not complete within the request deadline.")
     except Exception as e:
         print(f"An unexpected error occurred in semantic_search: {str(e)}")
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {str(e)}")
+
+
+@router.get("/extraction-stats")
+def extraction_stats() -> Dict[str, Any]:
+    """
+    Local vs LLM hit rates of the tiered job extractor since process start, plus
+    LLM failure-mode counters and circuit breaker states.
+    """
+    stats = extractor.hit_rates() if isinstance(extractor, TieredJobExtractor) else {"counts": {}}
+    stats["mode"] = config.EXTRACTION_MODE
+    stats["llm"] = failure_counts()
+    stats["result_cache"] = result_cache.stats() if result_cache is not None else None
+    stats["card_cache"] = card_cache.stats() if card_cache is not None else None
+    stats["admission"] = limiter.stats() if limiter is not None else None
+    rate_limiter = get_rate_limiter()
+    stats["llm_rate"] = rate_limiter.stats() if rate_limiter is not None else None
+    return stats
@@ -0,0 +1,161 @@
+import os
+from dotenv import find_dotenv, load_dotenv
+
+# Settings are read at import, so .env must be loaded first: the running app's own
+# .env (working directory, e.g. ResumeParsing/) wins over the repository one.
+load_dotenv(find_dotenv(usecwd=True))
+load_dotenv()
+
+# --- Vector search ---
+VECTOR_INDEX_NAME = os.getenv("VECTOR_INDEX_NAME", "default")
+VECTOR_PATH = os.getenv("VECTOR_PATH", "embedding")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+# Atlas caps numCandidates at 10000. When a pre-filter is present the base
+# numCandidates is divided by the estimated filter selectivity (capped).
+NUM_CANDIDATES_MAX = int(os.getenv("NUM_CANDIDATES_MAX", "10000"))
+MIN_FILTER_SELECTIVITY = float(os.getenv("MIN_FILTER_SELECTIVITY", "0.01"))
+# Tuned per-top_k numCandidates table (scripts/tune_num_candidates.py) and the recall@k
+# it should meet. Without the table, max(2 * top_k, top_k + 50) is used.
+NUM_CANDIDATES_POLICY_PATH = os.getenv("NUM_CANDIDATES_POLICY_PATH", "data/num_candidates_policy.json")
+TARGET_RECALL = float(os.getenv("TARGET_RECALL", "0.95"))
+
+# --- Hybrid (lexical + vector) retrieval ---
+LEXICAL_INDEX_NAME = os.getenv("LEXICAL_INDEX_NAME", "lexical")
+# Weight of the lexical ranking in reciprocal rank fusion; the vector ranking gets 1 - weight.
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "0.5"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+# Each retriever fetches top_k * this many results before fusion.
+HYBRID_OVERFETCH = int(os.getenv("HYBRID_OVERFETCH", "2"))
+
+# --- Job description extraction ---
+# "tiered" runs the local extractor first and calls the LLM only when needed; "llm" always calls it.
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "tiered")
+EXTRACTION_CONFIDENCE_THRESHOLD = float(os.getenv("EXTRACTION_CONFIDENCE_THRESHOLD", "0.7"))
+# JDs longer than this always go to the LLM.
+EXTRACTION_MAX_LOCAL_WORDS = int(os.getenv("EXTRACTION_MAX_LOCAL_WORDS", "400"))
+# Cosine threshold for the embedding skill classifier.
+EXTRACTION_SKILL_SIMILARITY = float(os.getenv("EXTRACTION_SKILL_SIMILARITY", "0.55"))
+
+# --- LLM calls (retry/backoff and circuit breaker) ---
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+# --- Semantic (near-duplicate JD) result cache ---
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+# Cosine similarity between raw JD embeddings above which a cached search is reused.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "900"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+SEMANTIC_CACHE_CORPUS_CHECK_INTERVAL = float(os.getenv("SEMANTIC_CACHE_CORPUS_CHECK_INTERVAL", "10"))
+# "serve" returns cached results as-is; "refresh" also recomputes them in the background.
+SEMANTIC_CACHE_MODE = os.getenv("SEMANTIC_CACHE_MODE", "serve")
+# Words of the JD the embedder reliably sees (MiniLM truncates at 256 tokens); any text
+# after them must match exactly for a cached search to be reused.
+SEMANTIC_CACHE_EMBED_WORDS = int(os.getenv("SEMANTIC_CACHE_EMBED_WORDS", "150"))
+
+# --- Candidate card cache (slim search-result documents by _id) ---
+CARD_CACHE_ENABLED = os.getenv("CARD_CACHE_ENABLED", "true").lower() == "true"
+CARD_CACHE_SIZE = int(os.getenv("CARD_CACHE_SIZE", "20000"))
+CARD_CACHE_TTL = float(os.getenv("CARD_CACHE_TTL", "300"))
+
+# --- Admission control and deadlines for /semantic-search ---
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_INITIAL_LIMIT = int(os.getenv("ADMISSION_INITIAL_LIMIT", "8"))
+ADMISSION_MIN_LIMIT = int(os.getenv("ADMISSION_MIN_LIMIT", "1"))
+# Keep below the FastAPI/anyio threadpool size (40) so sync routes never queue for a thread.
+ADMISSION_MAX_LIMIT = int(os.getenv("ADMISSION_MAX_LIMIT", "32"))
+# Requests slower than this shrink the concurrency limit (AIMD).
+ADMISSION_LATENCY_TARGET = float(os.getenv("ADMISSION_LATENCY_TARGET", "5"))
+# Default per-request deadline in seconds; clients can lower it with X-Request-Timeout.
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "15"))
+# Lower bound for X-Request-Timeout.
+REQUEST_MIN_DEADLINE = float(os.getenv("REQUEST_MIN_DEADLINE", "1"))
+# Minimum time left for the tiered extractor to still try the LLM.
+LLM_MIN_REMAINING = float(os.getenv("LLM_MIN_REMAINING", "1.0"))
+
+# --- Embedding engine ---
+# "torch" encodes in the calling thread; "pool" uses a pool of worker processes.
+EMBEDDER_BACKEND = os.getenv("EMBEDDER_BACKEND", "torch")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# 0 = one worker per EMBEDDING_THREADS_PER_WORKER cores.
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "0"))
+EMBEDDING_THREADS_PER_WORKER = int(os.getenv("EMBEDDING_THREADS_PER_WORKER", "1"))
+# How long the pool waits for every worker to load the model before giving up.
+EMBEDDING_POOL_START_TIMEOUT = float(os.getenv("EMBEDDING_POOL_START_TIMEOUT", "300"))
+# Inference precision: "none" (fp32 PyTorch), "int8" (PyTorch dynamic quantization),
+# "onnx" (ONNX Runtime fp32) or "onnx-int8" (ONNX Runtime, quantized export).
+EMBEDDER_QUANTIZATION = os.getenv("EMBEDDER_QUANTIZATION", "none")
+EMBEDDER_ONNX_INT8_FILE = os.getenv("EMBEDDER_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+# Quantized backends must match fp32 outputs to at least this cosine similarity on the
+# probe sentences at load time, otherwise the embedder falls back to fp32.
+EMBEDDER_MIN_COSINE = float(os.getenv("EMBEDDER_MIN_COSINE", "0.98"))
+EMBEDDER_VALIDATE = os.getenv("EMBEDDER_VALIDATE", "true").lower() == "true"
+
+# --- Two-tier local search (projection first pass) ---
+# Reduced first pass (scripts/fit_projection.py) over the corpus, then exact
+# rescoring of top_k * PROJECTION_OVERSAMPLE candidates with the full vectors.
+PROJECTION_PATH = os.getenv("PROJECTION_PATH", "data/projection.npz")
+PROJECTION_OVERSAMPLE = int(os.getenv("PROJECTION_OVERSAMPLE", "4"))
+
+# --- Vector search backend ---
+# "atlas" ($vectorSearch) or "snapshot" (brute force over the shared, mmapped
+# snapshot published by scripts/refresh_vector_snapshot.py).
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "atlas")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/snapshots")
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "10"))
+
+# --- Scatter-gather search over SEARCH_SHARDS ---
+# Fan-out threads per shard (0 = ADMISSION_MAX_LIMIT, one per admitted search), and the
+# per-shard time limit within the request deadline (shards are configured in
+# backend/dependencies.py).
+SHARD_FANOUT_WORKERS = int(os.getenv("SHARD_FANOUT_WORKERS", "0"))
+SHARD_TIMEOUT = float(os.getenv("SHARD_TIMEOUT", "5"))
+
+# --- Skill bitset index (backend/core/skill_index.py) ---
+# Registry collection for integer skill codes, and how often the in-memory index
+# pulls newly indexed candidates.
+SKILL_REGISTRY_COLLECTION = os.getenv("SKILL_REGISTRY_COLLECTION", "skill_registry")
+SKILL_INDEX_SYNC_INTERVAL = float(os.getenv("SKILL_INDEX_SYNC_INTERVAL", "30"))
+
+# --- Bulk candidate import (/api/candidates/bulk-import, scripts/bulk_import.py) ---
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "256"))
+IMPORT_MAX_CONCURRENT = int(os.getenv("IMPORT_MAX_CONCURRENT", "2"))
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", str(1 << 20)))
+
+# --- Request profiling (backend/core/profiling.py) ---
+# Off by default: the middleware is not even installed unless PROFILING_ENABLED is set.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Requests carrying this header with a value equal to PROFILE_TOKEN are profiled (the header
+# is ignored while PROFILE_TOKEN is empty), plus a random PROFILE_SAMPLE_RATE share of all requests.
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# "sample" (stack sampling, all threads) or "cprofile" (deterministic, request thread only;
+# Flask app only, the FastAPI app always samples since its sync handlers run in the threadpool).
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sample")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+# --- Shared LLM rate limit (backend/core/llm_clients/rate_limiter.py) ---
+# Host-wide requests/tokens per minute across all processes; 0 disables that limit.
+LLM_RPM = int(os.getenv("LLM_RPM", "0"))
+LLM_TPM = int(os.getenv("LLM_TPM", "0"))
+# Absolute by default so the API and ResumeParsing (run from its own directory) share one file.
+LLM_RATE_DB = os.getenv("LLM_RATE_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "llm_rate.sqlite3"))
+# Share of the per-minute budget the lower priority classes may fill (interactive may use all of it).
+LLM_DEFAULT_SHARE = float(os.getenv("LLM_DEFAULT_SHARE", "0.85"))
+LLM_BULK_SHARE = float(os.getenv("LLM_BULK_SHARE", "0.6"))
+LLM_RATE_MAX_WAIT = float(os.getenv("LLM_RATE_MAX_WAIT", "60"))
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "512"))
+
+# --- Outreach emails (/api/outreach/*) ---
+OUTREACH_TEMPLATE_CACHE_SIZE = int(os.getenv("OUTREACH_TEMPLATE_CACHE_SIZE", "256"))
+OUTREACH_TEMPLATE_TTL = float(os.getenv("OUTREACH_TEMPLATE_TTL", "86400"))
+# Candidates per LLM refinement call, and refinement calls in flight per request.
+OUTREACH_REFINE_BATCH = int(os.getenv("OUTREACH_REFINE_BATCH", "10"))
+OUTREACH_REFINE_CONCURRENCY = int(os.getenv("OUTREACH_REFINE_CONCURRENCY", "3"))
+OUTREACH_MAX_CANDIDATES = int(os.getenv("OUTREACH_MAX_CANDIDATES", "1000"))
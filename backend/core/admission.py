@@ -0,0 +1,108 @@
+# backend/core/admission.py
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+from backend import config
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"Request deadline exceeded before/while {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    Absolute per-request deadline (time.monotonic based) passed down through
+    extraction, embedding and vector search so each stage can bound its own work.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+    def remaining_ms(self) -> int:
+        return max(int(self.remaining() * 1000), 1)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit driven by observed latency:
+
+    - a request that finishes within latency_target grows the limit additively
+      (+1/limit per request, i.e. about +1 per "window" of limit requests);
+    - a slower request shrinks it multiplicatively (x backoff);
+    - a request that blew its deadline (dropped) halves it.
+
+    Requests over the limit are rejected immediately instead of queueing on the
+    threadpool, so the admitted ones keep finishing inside their deadlines when the
+    LLM slows down, and goodput stays high under overload.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = config.ADMISSION_INITIAL_LIMIT,
+        min_limit: int = config.ADMISSION_MIN_LIMIT,
+        max_limit: int = config.ADMISSION_MAX_LIMIT,
+        latency_target: float = config.ADMISSION_LATENCY_TARGET,
+        backoff: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.inflight = 0
+        self.latency: Optional[float] = None  # EWMA of completed request latency
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.inflight >= int(self.limit):
+                self.rejected += 1
+                return False
+            self.inflight += 1
+            self.accepted += 1
+            return True
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        with self._lock:
+            self.inflight -= 1
+            self.latency = latency if self.latency is None else 0.2 * latency + 0.8 * self.latency
+            if dropped:
+                self.dropped += 1
+                self.limit = max(self.min_limit, self.limit / 2)
+            elif latency <= self.latency_target:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: roughly one request's latency."""
+        return max(1, math.ceil(self.latency or 1.0))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "inflight": self.inflight,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+                "latency_s": self.latency,
+                "latency_target_s": self.latency_target,
+            }
@@ -0,0 +1,239 @@
+# backend/core/bulk_importer.py
+"""
+Streaming bulk import of candidate records (JSONL or CSV).
+
+Records are parsed line by line (RecordParser), validated, given a summary,
+embedded in batches with SemanticEmbedder.encode_batch and written with unordered
+insert_many. Only one batch is held in memory at a time; callers feed lines in and
+get progress/error events out, so the same code backs the /candidates/bulk-import
+endpoint and scripts/bulk_import.py.
+"""
+import csv
+import datetime
+import json
+import math
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from backend import config
+
+STRING_FIELDS = ["name", "title", "company", "location", "email", "avatarUrl", "summary"]
+LIST_FIELDS = ["skills", "qualifications"]
+
+
+def build_candidate_summary(candidate: dict) -> str:
+    name = candidate.get("name", "A candidate")
+    experience = candidate.get("experience", 0)
+    experience_str = f"{experience}+ years of experience" if experience else "some experience"
+
+    skills = candidate.get("skills", [])
+    skills_str = ", ".join(skills) if skills else "various skills"
+
+    qualifications = candidate.get("qualifications", [])
+    qualifications_str = ", ".join(qualifications) if qualifications else "relevant qualifications"
+
+    return f"{name} with {experience_str}, skilled in {skills_str}, and holding {qualifications_str}."
+
+
+def _as_list(value: Any, field: str) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        # CSV cells hold lists as "Python; AWS" (or comma separated).
+        separator = ";" if ";" in value else ","
+        return [item.strip() for item in value.split(separator) if item.strip()]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return [item.strip() for item in value if item.strip()]
+    raise ValueError(f"{field} must be a list of strings")
+
+
+def validate_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalizes one input record into a candidate document; raises ValueError when invalid."""
+    if not isinstance(raw, dict):
+        raise ValueError("record is not an object")
+    name = raw.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("name is required")
+
+    doc: Dict[str, Any] = {}
+    for field in STRING_FIELDS:
+        value = raw.get(field)
+        if value not in (None, ""):
+            if not isinstance(value, str):
+                raise ValueError(f"{field} must be a string")
+            doc[field] = value.strip()
+    for field in LIST_FIELDS:
+        doc[field] = _as_list(raw.get(field), field)
+
+    experience = raw.get("experience")
+    if experience in (None, ""):
+        doc["experience"] = 0
+    else:
+        try:
+            experience = float(experience)
+        except (TypeError, ValueError):
+            raise ValueError("experience must be a number")
+        if not math.isfinite(experience):
+            raise ValueError("experience must be a finite number")
+        if experience < 0:
+            raise ValueError("experience must be >= 0")
+        doc["experience"] = int(experience) if experience.is_integer() else experience
+    return doc
+
+
+class RecordParser:
+    """
+    Incremental JSONL/CSV parser: feed() takes one text line and returns
+    (row number, record dict or error message), or None while a quoted CSV
+    field spans several lines (or for blank lines and the CSV header).
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported import format: {fmt}")
+        self.fmt = fmt
+        self.row = 0
+        self._header: Optional[List[str]] = None
+        self._pending = ""
+
+    def feed(self, line: str) -> Optional[Tuple[int, Union[Dict[str, Any], str]]]:
+        if self.fmt == "jsonl":
+            if not line.strip():
+                return None
+            self.row += 1
+            try:
+                return self.row, json.loads(line)
+            except json.JSONDecodeError as e:
+                return self.row, f"invalid JSON: {e.msg}"
+
+        self._pending += line if line.endswith("\n") else line + "\n"
+        if self._pending.count('"') % 2:
+            return None  # inside a quoted field that continues on the next line
+        record, self._pending = self._pending, ""
+        if not record.strip():
+            return None
+        values = next(csv.reader([record]))
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return None
+        self.row += 1
+        if len(values) != len(self._header):
+            return self.row, f"expected {len(self._header)} columns, got {len(values)}"
+        return self.row, dict(zip(self._header, values))
+
+    def oversized(self) -> Tuple[int, str]:
+        """Error for a line that was discarded for exceeding IMPORT_MAX_LINE_BYTES."""
+        self._pending = ""
+        self.row += 1
+        return self.row, f"line longer than {config.IMPORT_MAX_LINE_BYTES} bytes"
+
+    def finish(self) -> Optional[Tuple[int, str]]:
+        """Error for a trailing unterminated CSV record, if any."""
+        if self._pending.strip():
+            self.row += 1
+            return self.row, "unterminated quoted field"
+        return None
+
+
+class BulkImporter:
+    """
+    Validates, summarizes, embeds and inserts candidates one batch at a time.
+    import_batch() is the unit of work; run() drives it over a record stream and
+    yields NDJSON-ready events:
+
+        {"event": "error", "row": n, "error": "..."}       per rejected row
+        {"event": "progress", "rows": ..., "inserted": ..., "failed": ..., "rows_per_s": ...}
+        {"event": "done", ...same counters...}
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        embedder,
+        skill_registry=None,
+        batch_size: int = config.IMPORT_BATCH_SIZE,
+    ):
+        self.collection = collection
+        self.embedder = embedder
+        self.skill_registry = skill_registry
+        self.batch_size = batch_size
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    def import_batch(self, records: List[Tuple[int, Union[Dict[str, Any], str]]]) -> List[Dict[str, Any]]:
+        """Imports one batch and returns its events (row errors followed by a progress event)."""
+        events, docs, rows = [], [], []
+        for row, record in records:
+            self.rows += 1
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                doc = validate_record(record)
+            except ValueError as e:
+                events.append({"event": "error", "row": row, "error": str(e)})
+                continue
+            doc.setdefault("summary", build_candidate_summary(doc))
+            docs.append(doc)
+            rows.append(row)
+
+        if docs:
+            try:
+                vectors = self.embedder.encode_batch([doc["summary"] for doc in docs])
+            except Exception as e:
+                events.extend({"event": "error", "row": row, "error": f"embedding failed: {e}"} for row in rows)
+                docs = []
+            else:
+                now = datetime.datetime.now(datetime.timezone.utc)
+                for doc, vector in zip(docs, vectors):
+                    doc[config.VECTOR_PATH] = vector
+                    doc["imported_at"] = now
+                    if self.skill_registry is not None:
+                        doc.update(self.skill_registry.skill_fields(doc["skills"]))
+
+        if docs:
+            try:
+                self.inserted += len(self.collection.insert_many(docs, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                self.inserted += e.details.get("nInserted", 0)
+                events.extend(
+                    {"event": "error", "row": rows[err["index"]], "error": err.get("errmsg", "write failed")}
+                    for err in write_errors
+                )
+            except Exception as e:
+                events.extend({"event": "error", "row": row, "error": f"insert failed: {e}"} for row in rows)
+
+        self.failed += sum(1 for event in events if event["event"] == "error")
+        events.append(self.progress("progress"))
+        return events
+
+    def progress(self, event: str) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "event": event,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "rows_per_s": round(self.rows / elapsed, 1) if elapsed else None,
+        }
+
+    def run(self, lines: Iterable[str], fmt: str) -> Iterator[Dict[str, Any]]:
+        parser = RecordParser(fmt)
+        batch = []
+        for line in lines:
+            parsed = parser.feed(line)
+            if parsed is None:
+                continue
+            batch.append(parsed)
+            if len(batch) >= self.batch_size:
+                yield from self.import_batch(batch)
+                batch = []
+        trailing = parser.finish()
+        if trailing:
+            batch.append(trailing)
+        if batch:
+            yield from self.import_batch(batch)
+        yield self.progress("done")
@@ -0,0 +1,61 @@
+# backend/core/candidate_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+from backend import config
+
+
+class CandidateCardCache:
+    """
+    Thread-safe LRU of slim candidate "cards" (only the fields search results show),
+    keyed by candidate _id. Lets repeat results skip the document fetch so the vector
+    stage only has to return ids and scores.
+    """
+
+    def __init__(self, max_size: int = config.CARD_CACHE_SIZE, ttl: float = config.CARD_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cards: "OrderedDict[Any, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for doc_id in ids:
+                item = self._cards.get(doc_id)
+                if item is None or now - item[0] > self.ttl:
+                    if item is not None:
+                        del self._cards[doc_id]
+                    self.misses += 1
+                    continue
+                self._cards.move_to_end(doc_id)
+                found[doc_id] = item[1]
+                self.hits += 1
+        return found
+
+    def put_many(self, cards: Dict[Any, Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for doc_id, card in cards.items():
+                self._cards[doc_id] = (now, card)
+                self._cards.move_to_end(doc_id)
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+
+    def invalidate(self, ids: Optional[Iterable[Any]] = None) -> None:
+        with self._lock:
+            if ids is None:
+                self._cards.clear()
+                return
+            for doc_id in ids:
+                self._cards.pop(doc_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._cards)
+        total = self.hits + self.misses
+        return {"size": size, "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
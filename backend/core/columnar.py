@@ -0,0 +1,241 @@
+# backend/core/columnar.py
+"""
+Columnar export/import of the candidate collection for offline work.
+
+An export directory contains:
+
+    manifest.json          collection, counts, vector fields/dims and the chunk list
+    part-00000.parquet     candidate fields, one file per chunk (Arrow schema below)
+    <vector_field>.npy     count x dim float32 matrix per vector field, row-aligned
+                           with the parquet rows (zeros where has_<field> is false)
+
+Card/filter fields get typed columns; every other field is kept losslessly as an
+Extended JSON string in the "extra" column, as is the _id. Export and import both
+work one chunk at a time, so memory stays bounded by the chunk size.
+"""
+import datetime
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from bson import json_util
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from pymongo import ReplaceOne
+from backend import config
+
+MANIFEST = "manifest.json"
+STRING_FIELDS = ["name", "title", "company", "summary", "location", "email", "avatarUrl"]
+LIST_FIELDS = ["skills", "qualifications"]
+NUMBER_FIELDS = ["experience"]
+
+
+def _schema(vector_fields: List[str]):
+    import pyarrow as pa
+
+    columns = [pa.field("_id", pa.string())]
+    columns += [pa.field(f, pa.string()) for f in STRING_FIELDS]
+    columns += [pa.field(f, pa.list_(pa.string())) for f in LIST_FIELDS]
+    columns += [pa.field(f, pa.float64()) for f in NUMBER_FIELDS]
+    columns += [pa.field(f"has_{f}", pa.bool_()) for f in vector_fields]
+    columns.append(pa.field("extra", pa.string()))
+    return pa.schema(columns)
+
+
+def _typed(field: str, value: Any) -> bool:
+    """Whether value fits the typed column for field (otherwise it goes to "extra")."""
+    if field in STRING_FIELDS:
+        return isinstance(value, str)
+    if field in LIST_FIELDS:
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    if field in NUMBER_FIELDS:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return False
+
+
+def _to_row(doc: Dict[str, Any], vectors: Dict[str, bool]) -> Dict[str, Any]:
+    """vectors maps each vector field to whether it went into the .npy matrix."""
+    row = {"_id": json_util.dumps(doc["_id"])}
+    extra = {}
+    for field, value in doc.items():
+        if field == "_id" or vectors.get(field):
+            continue
+        if _typed(field, value):
+            row[field] = value
+        else:
+            extra[field] = value  # includes vectors of the wrong dimension
+    for field, stored in vectors.items():
+        row[f"has_{field}"] = stored
+    row["extra"] = json_util.dumps(extra) if extra else None
+    return row
+
+
+def _from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    doc = {"_id": json_util.loads(row["_id"])}
+    for field in STRING_FIELDS + LIST_FIELDS:
+        if row.get(field) is not None:
+            doc[field] = row[field]
+    for field in NUMBER_FIELDS:
+        value = row.get(field)
+        if value is not None:
+            doc[field] = int(value) if float(value).is_integer() else value
+    if row.get("extra"):
+        doc.update(json_util.loads(row["extra"]))
+    return doc
+
+
+def export_collection(
+    collection: Collection,
+    out_dir: str,
+    vector_fields: Optional[List[str]] = None,
+    dim: int = config.EMBEDDING_DIM,
+    chunk_size: int = 10000,
+    query: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Exports `collection` (sorted by _id) to out_dir and returns the manifest."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    vector_fields = vector_fields or [config.VECTOR_PATH]
+    query = query or {}
+    os.makedirs(out_dir, exist_ok=True)
+    schema = _schema(vector_fields)
+
+    # Sized up front so vectors stream straight into the .npy files; documents
+    # inserted during the export are not included (the cursor is limited to this count).
+    expected = collection.count_documents(query)
+    matrices = {
+        field: np.lib.format.open_memmap(os.path.join(out_dir, f"{field}.npy"), mode="w+", dtype=np.float32, shape=(expected, dim))
+        for field in vector_fields
+    }
+    if expected == 0:
+        # limit(0) means "no limit": documents inserted since the count would be written
+        # into the 0-row matrices. Nothing matched, so the export is empty.
+        return _write_manifest(out_dir, collection, 0, dim, vector_fields, [])
+
+    chunks, rows, offset = [], [], 0
+
+    def flush():
+        name = f"part-{len(chunks):05d}.parquet"
+        pq.write_table(pa.Table.from_pylist(rows, schema=schema), os.path.join(out_dir, name))
+        chunks.append({"file": name, "rows": len(rows)})
+        print(f"  {name}: {offset} rows exported")
+        rows.clear()
+
+    cursor = collection.find(query, batch_size=min(chunk_size, 10000)).sort("_id", 1).limit(expected)
+    for doc in cursor:
+        stored = {}
+        for field, matrix in matrices.items():
+            vector = doc.get(field)
+            stored[field] = isinstance(vector, list) and len(vector) == dim
+            if stored[field]:
+                matrix[offset] = vector
+        rows.append(_to_row(doc, stored))
+        offset += 1
+        if len(rows) == chunk_size:
+            flush()
+    if rows:
+        flush()
+    for matrix in matrices.values():
+        matrix.flush()
+    return _write_manifest(out_dir, collection, offset, dim, vector_fields, chunks)
+
+
+def _write_manifest(
+    out_dir: str,
+    collection: Collection,
+    count: int,
+    dim: int,
+    vector_fields: List[str],
+    chunks: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    manifest = {
+        "collection": collection.full_name,
+        "exported_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        # Rows actually written; the .npy files can be longer if documents were deleted mid-export.
+        "count": count,
+        "dim": dim,
+        "vector_fields": vector_fields,
+        "chunks": chunks,
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(export_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(export_dir, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_vectors(export_dir: str, field: Optional[str] = None) -> np.ndarray:
+    """Memory-mapped count x dim matrix of one exported vector field."""
+    manifest = read_manifest(export_dir)
+    field = field or manifest["vector_fields"][0]
+    return np.load(os.path.join(export_dir, f"{field}.npy"), mmap_mode="r")[:manifest["count"]]
+
+
+def iter_chunks(export_dir: str, columns: Optional[List[str]] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Yields (row offset, rows) per parquet chunk, optionally reading only some columns."""
+    import pyarrow.parquet as pq
+
+    offset = 0
+    for chunk in read_manifest(export_dir)["chunks"]:
+        rows = pq.read_table(os.path.join(export_dir, chunk["file"]), columns=columns).to_pylist()
+        yield offset, rows
+        offset += len(rows)
+
+
+def load_local_index(export_dir: str, field: Optional[str] = None, **kwargs):
+    """LocalVectorIndex over an export, without touching Mongo (rows lacking the vector are skipped)."""
+    from backend.core.local_index import LocalVectorIndex
+
+    manifest = read_manifest(export_dir)
+    field = field or manifest["vector_fields"][0]
+    vectors = read_vectors(export_dir, field)
+    ids, metadata, keep = [], [], []
+    columns = ["_id", "location", "experience", "skills", "qualifications", f"has_{field}"]
+    for offset, rows in iter_chunks(export_dir, columns):
+        for i, row in enumerate(rows):
+            if row[f"has_{field}"]:
+                ids.append(json_util.loads(row["_id"]))
+                metadata.append(row)
+                keep.append(offset + i)
+    return LocalVectorIndex(ids, vectors[np.asarray(keep, dtype=np.int64)], metadata, **kwargs)
+
+
+def import_collection(
+    collection: Collection,
+    export_dir: str,
+    batch_size: int = 1000,
+    upsert: bool = False,
+) -> Dict[str, int]:
+    """
+    Loads an export into `collection` in unordered batches: insert_many by default
+    (existing _ids are reported as errors), or ReplaceOne upserts with upsert=True.
+    """
+    manifest = read_manifest(export_dir)
+    vectors = {field: read_vectors(export_dir, field) for field in manifest["vector_fields"]}
+    stats = {"written": 0, "errors": 0}
+
+    for offset, rows in iter_chunks(export_dir):
+        for start in range(0, len(rows), batch_size):
+            docs = []
+            for i, row in enumerate(rows[start:start + batch_size], start=offset + start):
+                doc = _from_row(row)
+                for field, matrix in vectors.items():
+                    if row.get(f"has_{field}"):
+                        doc[field] = matrix[i].tolist()
+                docs.append(doc)
+            try:
+                if upsert:
+                    result = collection.bulk_write([ReplaceOne({"_id": d["_id"]}, d, upsert=True) for d in docs], ordered=False)
+                    stats["written"] += result.upserted_count + result.matched_count
+                else:
+                    stats["written"] += len(collection.insert_many(docs, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                details = e.details or {}
+                stats["written"] += details.get("nInserted", 0) + details.get("nUpserted", 0) + details.get("nMatched", 0)
+                stats["errors"] += len(details.get("writeErrors", []))
+        print(f"  {offset + len(rows)}/{manifest['count']} rows imported")
+    return stats
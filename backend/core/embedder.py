@@ -1,11 +1,96 @@
-from sentence_transformers import SentenceTransformer
+from backend import config
+import numpy as np
+
+# Sentences used to check a quantized backend against the fp32 model at load time.
+PROBE_SENTENCES = [
+    "Seeking a candidate with skills in Python, Kubernetes, AWS; experience of 5.",
+    "Senior Frontend Developer with 8+ years building scalable web applications in React.",
+    "Data scientist with an MSc in Computer Science, skilled in PySpark and machine learning.",
+    "Backend developer with Java and Spring expertise.",
+    "Seeking a general candidate profile based on the job description.",
+]
+
+
+def load_sentence_model(model_name: str, quantization: str = "none"):
+    """
+    Loads the SentenceTransformer with the requested inference precision:
+    "none" (fp32 PyTorch), "int8" (dynamic int8 quantization of the Linear layers),
+    "onnx" (ONNX Runtime) or "onnx-int8" (ONNX Runtime with the quantized export).
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if quantization == "none":
+        return SentenceTransformer(model_name)
+    if quantization == "int8":
+        import torch
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if quantization == "onnx":
+        return SentenceTransformer(model_name, device="cpu", backend="onnx")
+    if quantization == "onnx-int8":
+        return SentenceTransformer(
+            model_name,
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": config.EMBEDDER_ONNX_INT8_FILE},
+        )
+    raise ValueError(f"Unknown EMBEDDER_QUANTIZATION: {quantization}")
+
+
+def cosine_agreement(model, reference, sentences=PROBE_SENTENCES) -> float:
+    """Lowest cosine similarity between the two models' embeddings of the probe sentences."""
+    a = model.encode(sentences, normalize_embeddings=True)
+    b = reference.encode(sentences, normalize_embeddings=True)
+    return float(np.min(np.sum(a * b, axis=1)))
+
+
+def load_validated_model(model_name: str, quantization: str = config.EMBEDDER_QUANTIZATION):
+    """
+    load_sentence_model, plus (for quantized backends) a check against fp32: if any
+    probe embedding drifts below EMBEDDER_MIN_COSINE the fp32 model is used instead.
+    """
+    model = load_sentence_model(model_name, quantization)
+    if quantization == "none" or not config.EMBEDDER_VALIDATE:
+        return model
+
+    reference = load_sentence_model(model_name, "none")
+    agreement = cosine_agreement(model, reference)
+    if agreement < config.EMBEDDER_MIN_COSINE:
+        print(f"Warning: {quantization} embedder min cosine vs fp32 is {agreement:.4f} "
+              f"(< {config.EMBEDDER_MIN_COSINE}), falling back to fp32")
+        return reference
+    print(f"{quantization} embedder validated against fp32 (min cosine {agreement:.4f})")
+    return model
+
 
 class SemanticEmbedder:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        backend: str = config.EMBEDDER_BACKEND,
+        quantization: str = config.EMBEDDER_QUANTIZATION,
+    ):
+        """
+        backend="torch" runs the model in the calling thread; backend="pool" sends work
+        to the process-wide EmbeddingPool (pinned threads per worker, shared-memory output).
+        quantization selects the inference precision (see load_sentence_model) for either.
+        """
+        self.backend = backend
+        self.quantization = quantization
+        if backend == "pool":
+            from backend.core.embedding_pool import get_embedding_pool
+            self.pool = get_embedding_pool()
+            self.model = None
+        else:
+            self.pool = None
+            self.model = load_validated_model(model_name, quantization)
 
     def encode(self, text: str) -> list:
+        if self.pool is not None:
+            return self.pool.encode(text).tolist()
         return self.model.encode(text).tolist()
 
     def encode_batch(self, texts: list[str]) -> list[list[float]]:
+        if self.pool is not None:
+            return self.pool.encode_batch(texts).tolist()
         return self.model.encode(texts).tolist()
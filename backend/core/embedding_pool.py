@@ -0,0 +1,216 @@
+# backend/core/embedding_pool.py
+"""
+Process-pool embedding engine.
+
+Each worker process pins its torch/BLAS thread counts, loads the SentenceTransformer
+once and serves encode jobs from a shared task queue. Output vectors are written
+straight into a multiprocessing.shared_memory buffer owned by the caller, so only
+texts and a small completion message cross the process boundary.
+"""
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+import numpy as np
+from backend import config
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to the caller's buffer without registering it with this process's
+    resource tracker (which would otherwise try to unlink it when the worker exits).
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def _worker_main(model_name: str, quantization: str, threads: int, dim: int, tasks, results) -> None:
+    # Must be set before torch is imported so intra-op pools are sized correctly.
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    import torch
+    from backend.core.embedder import load_validated_model
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    model = load_validated_model(model_name, quantization)
+    results.put(("ready", os.getpid(), None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, shm_name, offset, texts = task
+        try:
+            vectors = model.encode(texts, batch_size=config.EMBEDDING_BATCH_SIZE, convert_to_numpy=True)
+            shm = _attach(shm_name)
+            try:
+                out = np.ndarray((offset + len(texts), dim), dtype=np.float32, buffer=shm.buf)
+                out[offset:offset + len(texts)] = vectors
+                del out
+            finally:
+                shm.close()
+            results.put((job_id, offset, None))
+        except Exception as e:  # reported back to the caller, worker keeps serving
+            results.put((job_id, offset, repr(e)))
+
+
+class _Job:
+    def __init__(self, parts: int):
+        self.remaining = parts
+        self.errors: List[str] = []
+        self.done = threading.Event()
+
+
+_pool: Optional["EmbeddingPool"] = None
+_pool_lock = threading.Lock()
+
+
+def get_embedding_pool() -> "EmbeddingPool":
+    """Process-wide pool shared by every SemanticEmbedder using the "pool" backend."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EmbeddingPool()
+        return _pool
+
+
+class EmbeddingPool:
+    """
+    Pool of embedding worker processes. encode_batch() splits the texts into chunks,
+    dispatches them to the workers and returns the vectors in order. Safe to call from
+    many threads (e.g. the FastAPI threadpool) at once.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        quantization: str = config.EMBEDDER_QUANTIZATION,
+        workers: int = config.EMBEDDING_WORKERS,
+        threads_per_worker: int = config.EMBEDDING_THREADS_PER_WORKER,
+        dim: int = config.EMBEDDING_DIM,
+        chunk_size: int = config.EMBEDDING_BATCH_SIZE,
+        start_timeout: float = config.EMBEDDING_POOL_START_TIMEOUT,
+    ):
+        self.dim = dim
+        self.chunk_size = chunk_size
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        ctx = mp.get_context("spawn")  # fork + torch threads is unsafe
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._processes = [
+            ctx.Process(
+                target=_worker_main,
+                args=(model_name, quantization, threads_per_worker, dim, self._tasks, self._results),
+                daemon=True,
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._wait_ready(start_timeout)
+        print(f"EmbeddingPool ready: {self.workers} workers x {threads_per_worker} threads")
+
+        self._jobs: Dict[int, _Job] = {}
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def _dead_workers(self) -> List[int]:
+        return [process.pid for process in self._processes if not process.is_alive()]
+
+    def _wait_ready(self, timeout: float) -> None:
+        """
+        Waits for every worker to load the model. Fails (and stops the workers) if one
+        exits during startup, e.g. because the calling script builds an embedder at import
+        time and spawned workers re-import it, or if startup takes longer than timeout.
+        """
+        deadline = time.monotonic() + timeout
+        ready = 0
+        while ready < len(self._processes):
+            try:
+                self._results.get(timeout=1.0)
+                ready += 1
+                continue
+            except queue.Empty:
+                pass
+            dead = self._dead_workers()
+            if dead or time.monotonic() > deadline:
+                for process in self._processes:
+                    process.terminate()
+                reason = f"worker(s) {dead} exited" if dead else f"not ready after {timeout}s"
+                raise RuntimeError(f"EmbeddingPool failed to start: {reason}")
+
+    def _collect(self) -> None:
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            job_id, _, error = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            if error:
+                job.errors.append(error)
+            job.remaining -= 1  # only this thread mutates remaining
+            if job.remaining == 0:
+                job.done.set()
+
+    def encode_batch(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        if self._closed:
+            raise RuntimeError("EmbeddingPool is closed")
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        shm = shared_memory.SharedMemory(create=True, size=len(texts) * self.dim * 4)
+        chunks = range(0, len(texts), self.chunk_size)
+        job = _Job(len(chunks))
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._jobs[job_id] = job
+        try:
+            for offset in chunks:
+                self._tasks.put((job_id, shm.name, offset, texts[offset:offset + self.chunk_size]))
+            # Waits in short slices so a crashed worker (whose chunk will never complete)
+            # fails the call instead of hanging it.
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not job.done.wait(1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic()))):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Embedding {len(texts)} texts timed out after {timeout}s")
+                dead = self._dead_workers()
+                if dead:
+                    raise RuntimeError(f"Embedding worker(s) {dead} exited")
+            if job.errors:
+                raise RuntimeError(f"Embedding worker failed: {job.errors[0]}")
+            return np.ndarray((len(texts), self.dim), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            shm.close()
+            shm.unlink()
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        return self.encode_batch([text], timeout)[0]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+        self._results.put(None)
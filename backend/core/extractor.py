@@ -1,18 +1,96 @@
 from backend.core.llm_clients.gemini_client import GeminiClient
-from typing import Dict, Any
-from sentence_transformers import SentenceTransformer
+from backend.core.llm_clients.structured import StructuredLLMCaller, LLMCallError, get_breaker
+from backend.core.taxonomy import get_taxonomy
+from backend.core.admission import Deadline
+from backend.core.embedder import SemanticEmbedder
+from backend import config
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import numpy as np
 import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+EXPERIENCE_RE = re.compile(r'(\d+)\+?\s+years? of experience', re.I)
+# Any mention of years at all; if present but EXPERIENCE_RE missed it, the phrasing is unusual.
+YEARS_MENTION_RE = re.compile(r'\byears?\b|\byrs?\b', re.I)
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?;\n])\s+')
+
+JOB_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "experience": {"type": "integer"},
+        "qualifications": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["skills", "experience", "qualifications"],
+}
+
+
+def _validate_job_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerces LLM output to the extraction shape; raises ValueError if it can't."""
+    skills = fields.get("skills") or []
+    qualifications = fields.get("qualifications") or []
+    if not isinstance(skills, list) or not isinstance(qualifications, list):
+        raise ValueError("skills and qualifications must be lists")
+    try:
+        experience = int(fields.get("experience") or 0)
+    except (TypeError, ValueError):
+        match = re.search(r'\d+', str(fields.get("experience")))
+        experience = int(match.group()) if match else 0
+    return {
+        "skills": [str(s) for s in skills if s],
+        "experience": experience,
+        "qualifications": [str(q) for q in qualifications if q],
+    }
+
+def _normalized(vectors: List[List[float]]) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
 
 class SemanticJobExtractor:
-    def __init__(self, llm_client=None):
+    def __init__(self, llm_client=None, embedder: Optional[SemanticEmbedder] = None):
         """
         llm_client should have a .complete(prompt: str) -> str interface.
         This allows plugging in OpenAI, Anthropic, or other models.
+        embedder is shared with the caller when given (EMBEDDER_BACKEND/EMBEDDER_QUANTIZATION
+        apply to every encode), otherwise one is created.
         """
         self.llm_client = llm_client or GeminiClient()
-        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        self.embedder = embedder or SemanticEmbedder()
+        self.taxonomy = get_taxonomy()
+        self.llm_caller = StructuredLLMCaller(
+            "job_extraction",
+            self._generate,
+            max_attempts=config.LLM_MAX_ATTEMPTS,
+            base_delay=config.LLM_BACKOFF_BASE,
+            breaker=get_breaker(
+                "job_extraction",
+                failure_threshold=config.LLM_BREAKER_THRESHOLD,
+                reset_timeout=config.LLM_BREAKER_RESET,
+            ),
+        )
 
-    def extract_fields(self, job_description: str) -> Dict[str, Any]:
+    def _generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        # Prefer JSON mode with a response schema when the client supports it.
+        if hasattr(self.llm_client, "complete_json"):
+            return self.llm_client.complete_json(prompt, response_schema=JOB_FIELDS_SCHEMA, timeout=timeout)
+        return self.llm_client.complete(prompt)
+
+    def extract_fields(self, job_description: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        if self.llm_client:
+            return self._llm_extract(job_description, deadline)
+
+        # Fallback simple extractor if LLM is unavailable
+        return self._simple_extract(job_description)
+
+    def _llm_extract(self, job_description: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         prompt = f"""
         Extract the following from this job description:
         1. Required Skills (as a list of strings)
@@ -25,25 +103,40 @@ class SemanticJobExtractor:
         Return the result as a JSON object with keys: skills, experience, qualifications. Don't wrap it in ```.
         """
 
-        if self.llm_client:
-            response = self.llm_client.complete(prompt)
-            return self._safe_parse_json(response)
-
-        # Fallback simple extractor if LLM is unavailable
-        return self._simple_extract(job_description)
+        try:
+            fields = self.llm_caller.call_json(prompt, validate=_validate_job_fields, deadline=deadline)
+        except LLMCallError as e:
+            # Retries exhausted or circuit open: degrade to the local extractor instead
+            # of returning an empty extraction.
+            print(f"LLM job extraction failed ({e.failure_mode}), using local extractor")
+            fields = self._simple_extract(job_description)
+            fields["extraction_path"] = "local_fallback"
+            return fields
+        return self._with_canonical_ids(fields)
 
     def _simple_extract(self, job_description: str) -> Dict[str, Any]:
-        # Basic regex fallback for demo or offline environments
-        skills = re.findall(r'\b(Python|Java|SQL|AWS|Docker|ML|AI)\b', job_description, re.I)
-        experience = re.search(r'(\d+)\+?\s+years? of experience', job_description, re.I)
-        qualifications = re.findall(r'\b(B\.?Sc|M\.?Sc|Ph\.?D|Bachelor|Master)\b', job_description, re.I)
+        # Taxonomy matcher fallback for offline environments (single pass per kind)
+        skill_ids = self.taxonomy.match(job_description, "skills")
+        qualification_ids = self.taxonomy.match(job_description, "qualifications")
+        experience = EXPERIENCE_RE.search(job_description)
 
         return {
-            "skills": list(set(skills)),
+            "skills": [self.taxonomy.label(s, "skills") for s in skill_ids],
             "experience": int(experience.group(1)) if experience else 0,
-            "qualifications": list(set(qualifications))
+            "qualifications": [self.taxonomy.label(q, "qualifications") for q in qualification_ids],
+            "skill_ids": skill_ids,
+            "qualification_ids": qualification_ids,
         }
 
+    def _with_canonical_ids(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds taxonomy ids for the skills/qualifications returned by the LLM so
+        downstream features compare the same normalized ids as the local extractor.
+        """
+        fields["skill_ids"] = self.taxonomy.canonicalize(fields.get("skills", []), "skills")
+        fields["qualification_ids"] = self.taxonomy.canonicalize(fields.get("qualifications", []), "qualifications")
+        return fields
+
     def vectorize_job(self, job_fields: Dict[str, Any]) -> list[float]:
         """
         Turns structured job fields into a single text and vectorizes it.
@@ -53,11 +146,102 @@ class SemanticJobExtractor:
             f"Experience: {job_fields.get('experience', 0)} years. " +
             "Qualifications: " + ", ".join(job_fields.get("qualifications", [])) + "."
         )
-        return self.embedder.encode(job_text).tolist()
+        return self.embedder.encode(job_text)
 
-    def _safe_parse_json(self, text: str) -> Dict[str, Any]:
-        try:
-            import json
-            return json.loads(text)
-        except Exception:
-            return {"skills": [], "experience": 0, "qualifications": []}
+
+class TieredJobExtractor(SemanticJobExtractor):
+    """
+    Runs the local extractor (taxonomy matcher + embedding skill classifier) first and
+    only calls the LLM when the local result is low-confidence or the JD is long.
+
+    The path taken is recorded on each result ("extraction_path": "local" | "llm" |
+    "local_fallback") and counted in self.stats for hit-rate tracking.
+    """
+
+    def __init__(
+        self,
+        llm_client=None,
+        embedder: Optional[SemanticEmbedder] = None,
+        confidence_threshold: float = config.EXTRACTION_CONFIDENCE_THRESHOLD,
+        max_local_words: int = config.EXTRACTION_MAX_LOCAL_WORDS,
+        skill_similarity: float = config.EXTRACTION_SKILL_SIMILARITY,
+    ):
+        super().__init__(llm_client, embedder)
+        self.confidence_threshold = confidence_threshold
+        self.max_local_words = max_local_words
+        self.skill_similarity = skill_similarity
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._skill_ids: List[str] = []
+        self._skill_matrix = None  # normalized label embeddings, built lazily
+
+    def _skill_prototypes(self) -> Tuple[List[str], np.ndarray]:
+        if self._skill_matrix is None:
+            ids = list(self.taxonomy.labels["skills"])
+            labels = [self.taxonomy.label(i, "skills") for i in ids]
+            self._skill_ids = ids
+            self._skill_matrix = _normalized(self.embedder.encode_batch(labels))
+        return self._skill_ids, self._skill_matrix
+
+    def classify_skills(self, job_description: str) -> List[str]:
+        """
+        Embedding-based skill classifier: skills whose label embedding is close to
+        some sentence of the JD. Catches paraphrases the dictionary does not list.
+        """
+        sentences = [s for s in SENTENCE_SPLIT_RE.split(job_description) if s.strip()][:64]
+        if not sentences:
+            return []
+        ids, prototypes = self._skill_prototypes()
+        sentence_vectors = _normalized(self.embedder.encode_batch(sentences))
+        best = (sentence_vectors @ prototypes.T).max(axis=0)
+        return [ids[i] for i in np.flatnonzero(best >= self.skill_similarity)]
+
+    def local_confidence(self, job_description: str, fields: Dict[str, Any], classified: List[str]) -> float:
+        """
+        Heuristic confidence in [0, 1] that the local result is as good as the LLM's:
+        - enough skills found by the dictionary,
+        - experience parsed whenever the JD talks about years,
+        - the dictionary and the embedding classifier agree on the skill set.
+        """
+        matched = set(fields["skill_ids"])
+        skill_score = min(len(matched) / 3, 1.0)
+        experience_score = 1.0 if fields["experience"] or not YEARS_MENTION_RE.search(job_description) else 0.0
+        union = matched | set(classified)
+        agreement = len(matched & set(classified)) / len(union) if union else 0.0
+        return round(0.4 * skill_score + 0.2 * experience_score + 0.4 * agreement, 3)
+
+    def _record(self, path: str) -> None:
+        with self._stats_lock:
+            self.stats[path] += 1
+            self.stats["total"] += 1
+
+    def hit_rates(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            total = self.stats["total"] or 1
+            return {
+                "counts": dict(self.stats),
+                "local_rate": self.stats["local"] / total,
+                "llm_rate": self.stats["llm"] / total,
+            }
+
+    def extract_fields(self, job_description: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        local = self._simple_extract(job_description)
+        classified = self.classify_skills(job_description)
+        confidence = self.local_confidence(job_description, local, classified)
+        too_long = len(job_description.split()) > self.max_local_words
+
+        if confidence >= self.confidence_threshold and not too_long:
+            path, fields = "local", local
+        elif deadline is not None and deadline.remaining() < config.LLM_MIN_REMAINING:
+            # Not enough time left for an LLM round trip; answer with what we have.
+            path, fields = "local_deadline", local
+        else:
+            fields = self._llm_extract(job_description, deadline)
+            path = fields.pop("extraction_path", "llm")
+
+        self._record(path)
+        fields["extraction_path"] = path
+        fields["extraction_confidence"] = confidence
+        logger.debug("Job extraction via %s (confidence=%s, %.0f ms)", path, confidence, 1000 * (time.perf_counter() - start))
+        return fields
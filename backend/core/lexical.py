@@ -0,0 +1,126 @@
+# backend/core/lexical.py
+import math
+import re
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from pymongo.collection import Collection
+
+# Keeps skill tokens such as "c++", "c#", "node.js" and "pyspark" intact.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> List[str]:
+    return [tok.rstrip(".") for tok in _TOKEN_RE.findall(text.lower())]
+
+
+def candidate_text(doc: Dict[str, Any]) -> str:
+    """
+    Text indexed for lexical search: skills (repeated once more so an exact skill
+    hit outweighs an incidental summary mention) followed by the summary.
+    """
+    skills = " ".join(doc.get("skills") or [])
+    return f"{skills} {skills} {doc.get('summary') or ''}"
+
+
+class BM25Index:
+    """
+    Local inverted index with Okapi BM25 scoring over candidate skills/summary.
+    Used when Atlas Search ($search) is not available, and by the offline benchmark.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[Any] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # term -> [(row, tf)]
+        self._total_length = 0
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Dict[str, Any]]) -> "BM25Index":
+        index = cls()
+        for doc in docs:
+            index.add(doc["_id"], candidate_text(doc))
+        return index
+
+    @classmethod
+    def from_collection(cls, collection: Collection) -> "BM25Index":
+        return cls.from_documents(collection.find({}, {"skills": 1, "summary": 1}))
+
+    def add(self, doc_id: Any, text: str) -> None:
+        row = len(self.ids)
+        terms = Counter(tokenize(text))
+        self.ids.append(doc_id)
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self._total_length += length
+        for term, tf in terms.items():
+            self.postings[term].append((row, tf))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, top_k: int = 100, allowed_rows: Optional[Iterable[int]] = None) -> List[Dict]:
+        """
+        Returns [{"_id": ..., "score": ...}] sorted by BM25 score. allowed_rows restricts
+        scoring to a pre-filtered subset (e.g. LocalVectorIndex.filter_mask rows).
+        """
+        if not self.ids:
+            return []
+        allowed = set(allowed_rows) if allowed_rows is not None else None
+        n_docs = len(self.ids)
+        avg_len = self._total_length / n_docs or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row, tf in postings:
+                if allowed is not None and row not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[row] / avg_len)
+                scores[row] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [{"_id": self.ids[row], "score": score} for row, score in ranked]
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[Dict]],
+    weights: Optional[Dict[str, float]] = None,
+    k: int = 60,
+    top_k: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Fuses named ranked result lists with weighted reciprocal rank fusion:
+        score(d) = sum_source weight_source / (k + rank_source(d))
+    normalized by the best achievable score so it stays in [0, 1] like vectorSearchScore.
+
+    Documents are matched on str(_id). Each source's original score is kept on the
+    fused document as "<source>_score" (e.g. vector_score, lexical_score).
+    """
+    weights = weights or {name: 1.0 for name in rankings}
+    best_possible = sum(weights.get(name, 0.0) for name in rankings) / (k + 1) or 1.0
+    fused: Dict[str, float] = defaultdict(float)
+    docs: Dict[str, Dict] = {}
+
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 0.0)
+        for rank, doc in enumerate(ranking, start=1):
+            key = str(doc["_id"])
+            fused[key] += weight / (k + rank)
+            if key not in docs:
+                docs[key] = dict(doc)
+            docs[key][f"{name}_score"] = doc.get("score")
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    if top_k is not None:
+        ordered = ordered[:top_k]
+    results = []
+    for key, score in ordered:
+        doc = docs[key]
+        doc["score"] = score / best_possible
+        results.append(doc)
+    return results
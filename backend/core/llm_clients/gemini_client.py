@@ -1,8 +1,10 @@
 import os
+import time
 import google.generativeai as genai
 from google.generativeai.types import GenerationConfigDict, SafetySettingDict, HarmCategory, HarmBlockThreshold
 from dotenv import load_dotenv
 from typing import Optional, List, Union, Dict, Any
+from backend.core.llm_clients.rate_limiter import estimate_tokens, get_rate_limiter
 
 # It's good practice to call load_dotenv() once at the application entry point
 # but having it here ensures it's loaded if this module is imported directly.
@@ -17,6 +19,7 @@ class GeminiClient:
         self,
         api_key: Optional[str] = None,
         model_name: str = "gemini-1.5-flash-latest", # A more common and recent model
+        priority: str = "interactive",
     ):
         """
         Initializes the Gemini client.
@@ -26,6 +29,8 @@ class GeminiClient:
                                      from the "GEMINI_API" environment variable.
             model_name (str): The name of the Gemini model to use.
                               Defaults to "gemini-1.5-flash-latest".
+            priority (str): Class of this client's calls in the shared LLM rate limiter
+                            ("interactive", "default" or "bulk").
         """
         if api_key is None:
             api_key = os.getenv("GEMINI_API_KEY") # Common practice to name it GEMINI_API_KEY
@@ -39,6 +44,8 @@ class GeminiClient:
 
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
+        self.priority = priority
+        self.rate_limiter = get_rate_limiter()
         print(f"GeminiClient initialized with model: {model_name}")
 
     def complete(
@@ -46,7 +53,8 @@ class GeminiClient:
         prompt: Union[str, List[Union[str, genai.types.ContentDict]]],
         generation_config: Optional[GenerationConfigDict] = None,
         safety_settings: Optional[List[SafetySettingDict]] = None,
-        stream: bool = False # Added stream option
+        stream: bool = False, # Added stream option
+        timeout: Optional[float] = None
     ) -> Union[str, genai.types.GenerateContentResponse]: # Return type changes if streaming
         """
         Generates content based on the provided prompt.
@@ -58,6 +66,9 @@ class GeminiClient:
                 (e.g., temperature, max_output_tokens).
             safety_settings (Optional[List[SafetySettingDict]]): Safety settings for content generation.
             stream (bool): Whether to stream the response. If True, returns an iterator.
+            timeout (Optional[float]): Per-request timeout in seconds (e.g. the time left
+                before the caller's deadline). Time spent waiting for the shared rate
+                limiter counts against it.
 
         Returns:
             Union[str, Iterator[GenerateContentResponse]]: The generated text, or an iterator
@@ -68,12 +79,23 @@ class GeminiClient:
             RuntimeError: If the API call fails or content is not generated properly.
         """
         try:
+            call_id = None
+            if self.rate_limiter is not None:
+                waited_from = time.monotonic()
+                call_id = self.rate_limiter.acquire(estimate_tokens(prompt), self.priority, timeout=timeout)
+                if timeout:
+                    timeout = max(timeout - (time.monotonic() - waited_from), 0.1)
+
             response = self.model.generate_content(
                 prompt,
                 generation_config=generation_config,
                 safety_settings=safety_settings,
-                stream=stream
+                stream=stream,
+                request_options={"timeout": timeout} if timeout else None
             )
+            if call_id is not None and not stream:
+                usage = getattr(response, "usage_metadata", None)
+                self.rate_limiter.record_usage(call_id, getattr(usage, "total_token_count", None))
 
             if stream:
                 # If streaming, the caller is responsible for iterating and handling errors/parts
@@ -125,6 +147,24 @@ class GeminiClient:
             print(f"Error during Gemini API request: {e}")
             raise RuntimeError(f"Gemini API request failed: {e}") from e
 
+    def complete_json(
+        self,
+        prompt: Union[str, List[Union[str, genai.types.ContentDict]]],
+        response_schema: Optional[Dict[str, Any]] = None,
+        generation_config: Optional[GenerationConfigDict] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Same as complete(), but asks Gemini for JSON output (JSON mode), optionally
+        constrained by an OpenAPI-style response schema. Returns the raw text; parse it
+        with backend.core.llm_clients.structured.extract_json.
+        """
+        config: Dict[str, Any] = dict(generation_config or {})
+        config["response_mime_type"] = "application/json"
+        if response_schema is not None:
+            config["response_schema"] = response_schema
+        return self.complete(prompt, generation_config=config, timeout=timeout)
+
     def start_chat(
         self,
         history: Optional[List[genai.types.ContentDict]] = None,
@@ -0,0 +1,150 @@
+# backend/core/llm_clients/rate_limiter.py
+"""
+Host-wide LLM rate limiter shared by every Python process that calls Gemini
+(API workers, ResumeParsing, batch ingestion), backed by a local SQLite file.
+
+Each admitted call is logged with its timestamp and token estimate; a call is
+admitted when the last 60 seconds stay under LLM_RPM requests and LLM_TPM tokens.
+Priority classes keep interactive traffic ahead of bulk work:
+
+- each class may only fill its share of the window (interactive 100%, default
+  LLM_DEFAULT_SHARE, bulk LLM_BULK_SHARE), so headroom is left for search;
+- while a higher-priority caller is waiting, lower classes are not admitted.
+
+BEGIN IMMEDIATE serializes the check-and-insert across processes. The frontend's
+TypeScript email routes call Gemini directly and are not covered.
+"""
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+from backend import config
+
+PRIORITIES = {"interactive": 0, "default": 1, "bulk": 2}
+WINDOW = 60.0
+WAITER_TTL = 2.0  # a waiter that has not polled for this long is considered gone
+IMAGE_TOKENS = 258  # Gemini's fixed cost per image part
+
+
+class RateLimitTimeout(RuntimeError):
+    def __init__(self, priority: str, waited: float):
+        super().__init__(f"LLM rate limit: no capacity for '{priority}' call after {waited:.1f}s")
+        self.priority = priority
+
+
+def estimate_tokens(prompt: Any, expected_output: int = config.LLM_EXPECTED_OUTPUT_TOKENS) -> int:
+    """Rough token count of a prompt (text ~4 chars/token, images a fixed cost) plus expected output."""
+    parts = prompt if isinstance(prompt, (list, tuple)) else [prompt]
+    tokens = 0
+    for part in parts:
+        tokens += len(part) // 4 + 1 if isinstance(part, str) else IMAGE_TOKENS
+    return tokens + expected_output
+
+
+class SQLiteRateLimiter:
+    def __init__(
+        self,
+        path: str = config.LLM_RATE_DB,
+        rpm: int = config.LLM_RPM,
+        tpm: int = config.LLM_TPM,
+    ):
+        self.path = path
+        self.rpm = rpm
+        self.tpm = tpm
+        self.shares = {"interactive": 1.0, "default": config.LLM_DEFAULT_SHARE, "bulk": config.LLM_BULK_SHARE}
+        self._local = threading.local()
+        self._waiter_ids = itertools.count()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS calls (id INTEGER PRIMARY KEY, ts REAL, tokens INTEGER, priority INTEGER)")
+            db.execute("CREATE INDEX IF NOT EXISTS calls_ts ON calls (ts)")
+            db.execute("CREATE TABLE IF NOT EXISTS waiters (id TEXT PRIMARY KEY, priority INTEGER, heartbeat REAL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _try_admit(self, db: sqlite3.Connection, tokens: int, level: int, share: float, waiter: str) -> Optional[int]:
+        """One admission attempt inside a write transaction; returns the call id or None."""
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM calls WHERE ts < ?", (now - WINDOW,))
+            db.execute("DELETE FROM waiters WHERE heartbeat < ?", (now - WAITER_TTL,))
+            count, used = db.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM calls").fetchone()
+            ahead = db.execute(
+                "SELECT COUNT(*) FROM waiters WHERE priority < ? AND id != ?", (level, waiter)
+            ).fetchone()[0]
+            fits = (
+                (not self.rpm or count + 1 <= self.rpm * share)
+                and (not self.tpm or used + tokens <= self.tpm * share or count == 0)
+            )
+            if fits and not ahead:
+                call_id = db.execute(
+                    "INSERT INTO calls (ts, tokens, priority) VALUES (?, ?, ?)", (now, tokens, level)
+                ).lastrowid
+                db.execute("DELETE FROM waiters WHERE id = ?", (waiter,))
+                db.execute("COMMIT")
+                return call_id
+            db.execute(
+                "INSERT OR REPLACE INTO waiters (id, priority, heartbeat) VALUES (?, ?, ?)", (waiter, level, now)
+            )
+            db.execute("COMMIT")
+            return None
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def acquire(self, tokens: int, priority: str = "default", timeout: Optional[float] = None) -> int:
+        """
+        Blocks until the call fits the shared budget and returns its id (pass it to
+        record_usage once the real token count is known). Raises RateLimitTimeout
+        after `timeout` seconds (LLM_RATE_MAX_WAIT by default).
+        """
+        level = PRIORITIES.get(priority, PRIORITIES["default"])
+        share = self.shares.get(priority, 1.0)
+        timeout = config.LLM_RATE_MAX_WAIT if timeout is None else timeout
+        waiter = f"{os.getpid()}-{threading.get_ident()}-{next(self._waiter_ids)}"
+        db = self._connect()
+        start = time.monotonic()
+        try:
+            while True:
+                call_id = self._try_admit(db, tokens, level, share, waiter)
+                if call_id is not None:
+                    return call_id
+                waited = time.monotonic() - start
+                if waited >= timeout:
+                    raise RateLimitTimeout(priority, waited)
+                time.sleep(min(0.25, max(timeout - waited, 0.01)))
+        finally:
+            db.execute("DELETE FROM waiters WHERE id = ?", (waiter,))
+
+    def record_usage(self, call_id: int, tokens: Optional[int]) -> None:
+        """Replaces the estimate with the provider-reported token count."""
+        if tokens:
+            self._connect().execute("UPDATE calls SET tokens = ? WHERE id = ?", (int(tokens), call_id))
+
+    def stats(self) -> dict:
+        now = time.time()
+        db = self._connect()
+        count, used = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM calls WHERE ts >= ?", (now - WINDOW,)
+        ).fetchone()
+        waiting = db.execute("SELECT COUNT(*) FROM waiters WHERE heartbeat >= ?", (now - WAITER_TTL,)).fetchone()[0]
+        return {"rpm_used": count, "rpm_limit": self.rpm, "tpm_used": used, "tpm_limit": self.tpm, "waiting": waiting}
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> Optional[SQLiteRateLimiter]:
+    """Process-wide limiter, or None when LLM_RPM and LLM_TPM are both 0 (disabled)."""
+    if not config.LLM_RPM and not config.LLM_TPM:
+        return None
+    return SQLiteRateLimiter()
@@ -0,0 +1,266 @@
+# backend/core/llm_clients/structured.py
+"""
+Shared LLM-call layer for structured (JSON) output.
+
+Used by the job extractor (backend) and the resume parser (ResumeParsing), so it only
+depends on the standard library:
+
+- extract_json: tolerant parsing of fenced, prefixed or truncated JSON.
+- StructuredLLMCaller: retries the LLM step only, with exponential backoff and full
+  jitter, behind a per-name CircuitBreaker; every failure mode is counted.
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.S)
+
+
+class LLMCallError(RuntimeError):
+    """The LLM step failed after all retries; failure_mode says why."""
+
+    def __init__(self, message: str, failure_mode: str):
+        super().__init__(message)
+        self.failure_mode = failure_mode
+
+
+class CircuitOpenError(LLMCallError):
+    def __init__(self, name: str):
+        super().__init__(f"Circuit '{name}' is open, LLM calls are short-circuited", "circuit_open")
+
+
+class JSONExtractionError(ValueError):
+    pass
+
+
+def _close_truncated(fragment: str) -> str:
+    """
+    Best-effort repair of JSON cut off mid-way (e.g. max_output_tokens reached):
+    drops a dangling key/comma and closes any open string, arrays and objects.
+    """
+    stack, in_string, escaped = [], False, False
+    for ch in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    repaired = fragment + ('"' if in_string else "")
+    repaired = re.sub(r',\s*"[^"]*"\s*:?\s*$', "", repaired)  # dangling "key" or "key":
+    repaired = re.sub(r"[,:]\s*$", "", repaired)
+    return repaired + "".join(reversed(stack))
+
+
+def extract_json(text: str, expect: type = dict) -> Any:
+    """
+    Parses the first JSON value of the expected type (dict or list) out of an LLM
+    response. Handles ```json fences, leading/trailing prose, trailing commas and
+    truncated output. Raises JSONExtractionError when nothing usable is found.
+    """
+    if not text or not text.strip():
+        raise JSONExtractionError("empty response")
+
+    candidates = [m.group(1) for m in _FENCE_RE.finditer(text)] + [text]
+    opener = "{" if expect is dict else "["
+    decoder = json.JSONDecoder()
+
+    for candidate in candidates:
+        start = candidate.find(opener)
+        if start == -1:
+            continue
+        fragment = candidate[start:].strip()
+        cleaned = re.sub(r",\s*([}\]])", r"\1", fragment)  # trailing commas
+        for attempt in (fragment, cleaned, _close_truncated(cleaned)):
+            try:
+                value, _ = decoder.raw_decode(attempt)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(value, expect):
+                return value
+    raise JSONExtractionError(f"no JSON {expect.__name__} found in response")
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures; after reset_timeout seconds
+    a single trial call is let through (half-open) and closes the circuit on success.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_abandoned(self) -> None:
+        """The call ended without a verdict on the LLM; only frees a half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_failure_counts: Counter = Counter()
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Process-wide breaker per LLM use case, so all callers see the same state."""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+
+def record_failure_mode(name: str, failure_mode: str) -> None:
+    with _registry_lock:
+        _failure_counts[f"{name}.{failure_mode}"] += 1
+
+
+def failure_counts() -> Dict[str, Any]:
+    with _registry_lock:
+        counts = dict(_failure_counts)
+    return {"failures": counts, "circuits": {name: b.state for name, b in _breakers.items()}}
+
+
+class StructuredLLMCaller:
+    """
+    Wraps a `generate(prompt) -> str` callable. call_json() retries transport errors,
+    empty responses and unparseable/invalid output with exponential backoff + full
+    jitter, then raises LLMCallError. `validate` may raise ValueError to reject a
+    parsed value (counted as "schema_error", as is any other exception it raises).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        generate: Callable[[Any], str],
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.generate = generate
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or get_breaker(name)
+        self._sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call_json(
+        self,
+        prompt: Any,
+        expect: type = dict,
+        validate: Optional[Callable[[Any], Any]] = None,
+        deadline: Optional[Any] = None,
+    ) -> Any:
+        """
+        deadline (optional) is any object with remaining() -> seconds, e.g.
+        backend.core.admission.Deadline. Its remaining time is passed to generate() as
+        `timeout`, and no retry is started or slept into once it would be exceeded.
+        """
+        if not self.breaker.allow():
+            record_failure_mode(self.name, "circuit_open")
+            raise CircuitOpenError(self.name)
+
+        last_error, failure_mode = None, "unknown"
+        for attempt in range(self.max_attempts):
+            if deadline is not None and deadline.remaining() <= 0:
+                if attempt == 0:
+                    failure_mode = "deadline_exceeded"
+                    record_failure_mode(self.name, failure_mode)
+                break  # after a failed attempt, that attempt's failure mode stands
+            try:
+                if deadline is not None:
+                    text = self.generate(prompt, timeout=deadline.remaining())
+                else:
+                    text = self.generate(prompt)
+            except Exception as e:
+                last_error, failure_mode = e, "transport_error"
+                if deadline is not None and deadline.remaining() <= 0:
+                    failure_mode = "deadline_exceeded"  # generate() timed out on the caller's deadline
+            else:
+                try:
+                    value = extract_json(text, expect)
+                    if validate is not None:
+                        value = validate(value) or value
+                    self.breaker.record_success()
+                    return value
+                except JSONExtractionError as e:
+                    last_error = e
+                    failure_mode = "empty_response" if not (text or "").strip() else "parse_error"
+                except Exception as e:
+                    # ValueError from validate is the documented rejection; anything else
+                    # (a buggy validator) is counted the same so the breaker always gets
+                    # a verdict and a half-open trial can never stay in flight.
+                    last_error, failure_mode = e, "schema_error"
+
+            record_failure_mode(self.name, failure_mode)
+            print(f"LLM call '{self.name}' attempt {attempt + 1}/{self.max_attempts} failed ({failure_mode}): {last_error}")
+            if attempt + 1 == self.max_attempts or failure_mode == "deadline_exceeded":
+                break
+            delay = self.backoff(attempt)
+            if deadline is not None and delay >= deadline.remaining():
+                # No time left to retry. The attempt that just failed (already counted
+                # above) is the verdict, so the breaker is charged for it below.
+                break
+            self._sleep(delay)
+
+        if failure_mode == "deadline_exceeded":
+            # The caller ran out of time (deadlines can be client-supplied); that says
+            # nothing about the LLM's health, so the shared circuit is left as it was.
+            self.breaker.record_abandoned()
+        else:
+            self.breaker.record_failure()
+        raise LLMCallError(f"LLM call '{self.name}' failed: {last_error}", failure_mode)
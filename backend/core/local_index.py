@@ -0,0 +1,152 @@
+# backend/core/local_index.py
+from typing import List, Dict, Any, Optional
+import numpy as np
+from pymongo.collection import Collection
+from backend import config
+from backend.core.projection import VectorProjection
+
+
+class LocalVectorIndex:
+    """
+    Brute-force in-memory vector index over the candidate corpus.
+
+    Mirrors CandidateSearcher.search for environments without Atlas (local Mongo,
+    tests, offline tools). Filters are applied as a boolean mask over the corpus
+    *before* scoring, the same semantics as the $vectorSearch pre-filter.
+
+    With a VectorProjection attached, search() scans the reduced copy first and only
+    rescores the best top_k * oversample rows with the full vectors.
+    """
+
+    def __init__(
+        self,
+        ids: List[Any],
+        vectors: np.ndarray,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+        projection: Optional[VectorProjection] = None,
+        oversample: int = config.PROJECTION_OVERSAMPLE,
+        normalized: bool = False,
+    ):
+        self.ids = list(ids)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not normalized:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = vectors / norms
+        # Kept as-is when already normalized, so a read-only memmap is never copied.
+        self.vectors = vectors
+        self.oversample = oversample
+        self.set_projection(projection)
+        metadata = metadata or [{} for _ in self.ids]
+
+        self.locations = np.array([m.get("location") or "" for m in metadata], dtype=object)
+        self.experience = np.array([m.get("experience") or 0 for m in metadata], dtype=np.float32)
+        self._skills = [set(m.get("skills") or []) for m in metadata]
+        self._qualifications = [set(m.get("qualifications") or []) for m in metadata]
+        # value -> boolean posting mask, built lazily on first use
+        self._skill_masks: Dict[str, np.ndarray] = {}
+        self._qualification_masks: Dict[str, np.ndarray] = {}
+        # str(id) -> row, built lazily for the "ids" filter
+        self._rows_by_key: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_collection(
+        cls,
+        collection: Collection,
+        vector_path: str = config.VECTOR_PATH,
+        projection: Optional[VectorProjection] = None,
+    ) -> "LocalVectorIndex":
+        fields = {vector_path: 1, "location": 1, "experience": 1, "skills": 1, "qualifications": 1}
+        ids, vectors, metadata = [], [], []
+        for doc in collection.find({vector_path: {"$exists": True}}, fields):
+            ids.append(doc["_id"])
+            vectors.append(doc[vector_path])
+            metadata.append(doc)
+        if not vectors:
+            return cls([], np.zeros((0, config.EMBEDDING_DIM), dtype=np.float32), projection=projection)
+        return cls(ids, np.array(vectors, dtype=np.float32), metadata, projection=projection)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def set_projection(self, projection: Optional[VectorProjection]) -> None:
+        """Attaches (or with None, removes) the reduced first-pass representation."""
+        self.projection = projection
+        self.reduced = projection.transform_corpus(self.vectors) if projection is not None else None
+
+    def _posting(self, cache: Dict[str, np.ndarray], sets: List[set], value: str) -> np.ndarray:
+        mask = cache.get(value)
+        if mask is None:
+            mask = np.fromiter((value in s for s in sets), dtype=bool, count=len(sets))
+            cache[value] = mask
+        return mask
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Boolean mask of candidates passing the filters (same keys as
+        searcher.build_vector_filter). Returns None when nothing is constrained.
+        """
+        if not filters:
+            return None
+        mask = np.ones(len(self.ids), dtype=bool)
+        constrained = False
+
+        if filters.get("locations"):
+            mask &= np.isin(self.locations, list(filters["locations"]))
+            constrained = True
+        if filters.get("min_experience"):
+            mask &= self.experience >= filters["min_experience"]
+            constrained = True
+        for skill in filters.get("required_skills") or []:
+            mask &= self._posting(self._skill_masks, self._skills, skill)
+            constrained = True
+        if filters.get("ids") is not None:
+            # Candidate ids (as strings) allowed by an external filter, e.g. the required-skill
+            # bitmap intersection from SkillBitsetIndex.filter_skills.
+            if self._rows_by_key is None:
+                self._rows_by_key = {str(doc_id): row for row, doc_id in enumerate(self.ids)}
+            allowed = np.zeros(len(self.ids), dtype=bool)
+            rows = [self._rows_by_key[key] for key in map(str, filters["ids"]) if key in self._rows_by_key]
+            allowed[rows] = True
+            mask &= allowed
+            constrained = True
+        if filters.get("qualifications"):
+            any_qual = np.zeros(len(self.ids), dtype=bool)
+            for qual in filters["qualifications"]:
+                any_qual |= self._posting(self._qualification_masks, self._qualifications, qual)
+            mask &= any_qual
+            constrained = True
+
+        return mask if constrained else None
+
+    def search(self, embedding: List[float], top_k: int = 100, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        Returns [{"_id": ..., "score": ...}] sorted by cosine similarity, highest first.
+        """
+        if not self.ids:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= (np.linalg.norm(query) or 1.0)
+
+        mask = self.filter_mask(filters)
+        rows = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return []
+
+        shortlist = top_k * self.oversample
+        if self.projection is not None and rows.size > shortlist:
+            # First pass on the reduced copy, exact cosine only for the shortlist.
+            reduced = self.reduced if mask is None else self.reduced[rows]
+            coarse = self.projection.scores(reduced, self.projection.transform_query(query))
+            rows = rows[np.argpartition(-coarse, shortlist - 1)[:shortlist]]
+            scores = self.vectors[rows] @ query
+        elif mask is None:
+            scores = self.vectors @ query
+        else:
+            scores = self.vectors[rows] @ query
+
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        # Rescale cosine [-1, 1] to [0, 1] to match Atlas' vectorSearchScore for cosine.
+        return [{"_id": self.ids[rows[i]], "score": float((1 + scores[i]) / 2)} for i in top]
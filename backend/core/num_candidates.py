@@ -0,0 +1,46 @@
+# backend/core/num_candidates.py
+import json
+import os
+from typing import Any, Dict, List, Optional
+from backend import config
+
+
+def default_num_candidates(top_k: int) -> int:
+    """Fallback rule used when no tuned policy table is available."""
+    return max(top_k * 2, top_k + 50)
+
+
+class NumCandidatesPolicy:
+    """
+    Per-top_k numCandidates table written by scripts/tune_num_candidates.py.
+
+    File layout:
+        {"generated_at": ..., "corpus_size": ..., "sweeps": {
+            "<top_k>": [{"num_candidates": n, "recall": r, "p50_ms": t, "p95_ms": t}, ...]}}
+
+    num_candidates(top_k, target_recall) picks the cheapest swept value whose recall@k
+    meets the target, using the closest tuned top_k >= the requested one (scaled
+    proportionally above the largest tuned top_k).
+    """
+
+    def __init__(self, sweeps: Dict[int, List[Dict[str, Any]]]):
+        self.sweeps = {int(k): sorted(rows, key=lambda r: r["num_candidates"]) for k, rows in sweeps.items() if rows}
+
+    @classmethod
+    def load(cls, path: str = config.NUM_CANDIDATES_POLICY_PATH) -> Optional["NumCandidatesPolicy"]:
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            policy = cls(json.load(f).get("sweeps", {}))
+        print(f"Loaded numCandidates policy for top_k {sorted(policy.sweeps)} from {path}")
+        return policy if policy.sweeps else None
+
+    def num_candidates(self, top_k: int, target_recall: float = config.TARGET_RECALL) -> int:
+        tuned = sorted(self.sweeps)
+        reference = next((k for k in tuned if k >= top_k), tuned[-1])
+        rows = self.sweeps[reference]
+        chosen = next((r for r in rows if r["recall"] >= target_recall), rows[-1])
+        value = chosen["num_candidates"]
+        if top_k > reference:
+            value = int(value * top_k / reference)
+        return max(value, top_k)
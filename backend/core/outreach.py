@@ -0,0 +1,255 @@
+# backend/core/outreach.py
+import hashlib
+import html
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+from backend import config
+from backend.core.llm_clients.structured import StructuredLLMCaller, LLMCallError, get_breaker
+from backend.core.taxonomy import get_taxonomy
+
+TEMPLATE_PROMPT = """
+You are an expert recruiter writing professional outreach emails. Generate ONE email template for the following job opportunity that will be personalized for many candidates.
+
+Job Description/Opportunity:
+{job_description}
+
+Sender: {sender_name}
+
+Requirements:
+1. Use exactly these placeholders, which are replaced for each candidate: [Candidate Name], [Current Title], [Current Company], [Location], [Sender Name]
+2. Include the placeholder [Personal Note] as its own sentence or paragraph near the start; it is replaced with one or two sentences about why this specific candidate fits
+3. Make it warm, professional and genuine, without overly salesy language
+4. Highlight the key aspects and selling points of the opportunity from the job description
+5. Include a clear call-to-action
+6. Keep it concise (200-400 words) and format it as clean HTML
+7. Suggest a subject line with good open rates (it may use [Candidate Name])
+
+Return JSON: {{"subject": "...", "emailTemplate": "..."}}
+"""
+
+REFINE_PROMPT = """
+You are an expert recruiter. For each candidate below, write a one or two sentence personal note for an outreach email about the job described, explaining why their background fits. Be specific to the candidate, factual (use only the details given) and not salesy. Plain text, no greeting.
+
+Job Description:
+{job_description}
+
+Candidates:
+{candidates}
+
+Return a JSON array with one object per candidate: [{{"index": 0, "note": "..."}}]
+"""
+
+TEMPLATE_SCHEMA = {
+    "type": "object",
+    "properties": {"subject": {"type": "string"}, "emailTemplate": {"type": "string"}},
+    "required": ["subject", "emailTemplate"],
+}
+
+
+def jd_hash(job_description: str, sender_name: str) -> str:
+    normalized = re.sub(r"\s+", " ", job_description.strip().lower())
+    return hashlib.sha256(f"{normalized}\x00{sender_name.strip()}".encode("utf-8")).hexdigest()
+
+
+def validate_template(template: Any) -> Dict[str, str]:
+    if not isinstance(template, dict) or not template.get("subject") or not template.get("emailTemplate"):
+        raise ValueError("template must have subject and emailTemplate")
+    if "[Candidate Name]" not in template["emailTemplate"]:
+        raise ValueError("template does not use [Candidate Name]")
+    if "[Personal Note]" not in template["emailTemplate"]:
+        # Template without the slot: put the note after the greeting paragraph.
+        if "</p>" not in template["emailTemplate"]:
+            raise ValueError("template has no [Personal Note] slot and no paragraph to add it after")
+        template["emailTemplate"] = template["emailTemplate"].replace("</p>", "</p><p>[Personal Note]</p>", 1)
+    return {"subject": template["subject"], "emailTemplate": template["emailTemplate"]}
+
+
+class TemplateCache:
+    """Thread-safe LRU (with TTL) of generated templates keyed by jd_hash."""
+
+    def __init__(self, max_size: int = config.OUTREACH_TEMPLATE_CACHE_SIZE, ttl: float = config.OUTREACH_TEMPLATE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._templates: "OrderedDict[str, tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            item = self._templates.get(key)
+            if item is None or time.monotonic() - item[0] > self.ttl:
+                self._templates.pop(key, None)
+                return None
+            self._templates.move_to_end(key)
+            return item[1]
+
+    def put(self, key: str, template: Dict[str, str]) -> None:
+        with self._lock:
+            self._templates[key] = (time.monotonic(), template)
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+
+class OutreachGenerator:
+    """
+    Job-level template generated once per JD (cached by jd_hash), then per-candidate
+    emails by local slot filling. With refine=True, the [Personal Note] slot is
+    written by the LLM for bounded batches of candidates, several batches in flight
+    at once (the GeminiClient goes through the shared LLM rate limiter); a batch
+    that fails keeps the local note.
+    """
+
+    def __init__(self, llm_client, cache: Optional[TemplateCache] = None):
+        self.llm_client = llm_client
+        self.cache = cache or TemplateCache()
+        self.taxonomy = get_taxonomy()
+        # Separate breakers: failing refine batches (many per request) must not block templates.
+        self.template_caller = StructuredLLMCaller(
+            "outreach_template", self._generate_template, max_attempts=config.LLM_MAX_ATTEMPTS,
+            base_delay=config.LLM_BACKOFF_BASE,
+            breaker=get_breaker("outreach_template", failure_threshold=config.LLM_BREAKER_THRESHOLD, reset_timeout=config.LLM_BREAKER_RESET),
+        )
+        self.refine_caller = StructuredLLMCaller(
+            "outreach_refine", self._generate, max_attempts=config.LLM_MAX_ATTEMPTS,
+            base_delay=config.LLM_BACKOFF_BASE,
+            breaker=get_breaker("outreach_refine", failure_threshold=config.LLM_BREAKER_THRESHOLD, reset_timeout=config.LLM_BREAKER_RESET),
+        )
+        self._templates_in_flight: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _generate_template(self, prompt: str, timeout: Optional[float] = None) -> str:
+        return self.llm_client.complete_json(prompt, response_schema=TEMPLATE_SCHEMA, timeout=timeout)
+
+    def _generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        return self.llm_client.complete_json(prompt, timeout=timeout)
+
+    def template(self, job_description: str, sender_name: str) -> Dict[str, Any]:
+        """Cached template for this JD/sender; concurrent requests for the same JD share one LLM call."""
+        key = jd_hash(job_description, sender_name)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True, "template_id": key}
+        with self._lock:
+            key_lock = self._templates_in_flight.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self.cache.get(key)
+            if cached is None:
+                prompt = TEMPLATE_PROMPT.format(job_description=job_description, sender_name=sender_name)
+                cached = self.template_caller.call_json(prompt, validate=validate_template)
+                self.cache.put(key, cached)
+                hit = False
+            else:
+                hit = True
+        with self._lock:
+            self._templates_in_flight.pop(key, None)
+        return {**cached, "cached": hit, "template_id": key}
+
+    def local_note(self, candidate: Dict[str, Any], job_skills: List[str]) -> str:
+        """Personal note from the candidate's skills that the JD asks for (taxonomy match)."""
+        candidate_skills = self.taxonomy.canonicalize(candidate.get("skills", []), "skills")
+        shared = [self.taxonomy.label(s) for s in candidate_skills if s in job_skills][:3]
+        role = " at ".join(part for part in (candidate.get("title"), candidate.get("company")) if part)
+        if shared and role:
+            return f"Your work as {role} with {', '.join(shared)} is exactly the kind of experience this role calls for."
+        if shared:
+            return f"Your experience with {', '.join(shared)} lines up closely with what this role needs."
+        if role:
+            return f"Your background as {role} caught our attention for this role."
+        return "Your background caught our attention for this role."
+
+    def fill(self, template: Dict[str, str], candidate: Dict[str, Any], sender_name: str, note: str) -> Dict[str, str]:
+        values = {
+            "[Candidate Name]": candidate.get("name") or "there",
+            "[Current Title]": candidate.get("title") or "your current role",
+            "[Current Company]": candidate.get("company") or "your current company",
+            "[Location]": candidate.get("location") or "",
+            "[Personal Note]": note,
+            "[Sender Name]": sender_name,
+        }
+        body, subject = template["emailTemplate"], template["subject"]
+        for placeholder, value in values.items():
+            body = body.replace(placeholder, html.escape(value))
+            subject = subject.replace(placeholder, value)
+        return {"subject": subject, "body": body}
+
+    def refine_notes(self, job_description: str, candidates: List[Dict[str, Any]]) -> Dict[int, str]:
+        """LLM-written notes for one bounded batch, keyed by position in the batch."""
+        lines = [
+            json.dumps({
+                "index": i,
+                "name": c.get("name"),
+                "title": c.get("title"),
+                "company": c.get("company"),
+                "skills": (c.get("skills") or [])[:15],
+                "summary": (c.get("summary") or "")[:400],
+            })
+            for i, c in enumerate(candidates)
+        ]
+        prompt = REFINE_PROMPT.format(job_description=job_description, candidates="\n".join(lines))
+        notes = {}
+        for item in self.refine_caller.call_json(prompt, expect=list):
+            if isinstance(item, dict) and isinstance(item.get("note"), str) and item["note"].strip():
+                try:
+                    index = int(item.get("index"))
+                except (TypeError, ValueError):
+                    continue
+                if 0 <= index < len(candidates):
+                    notes[index] = item["note"].strip()
+        return notes
+
+    def emails(
+        self,
+        job_description: str,
+        sender_name: str,
+        candidates: List[Dict[str, Any]],
+        refine: bool = False,
+        batch_size: int = config.OUTREACH_REFINE_BATCH,
+        concurrency: int = config.OUTREACH_REFINE_CONCURRENCY,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields {"event": "template", ...} once, then {"event": "email", "index", ...} per
+        candidate as each is ready (input order without refine, completion order with it),
+        then {"event": "done"}.
+        """
+        template = self.template(job_description, sender_name)
+        yield {"event": "template", **template}
+
+        job_skills = self.taxonomy.match(job_description, "skills")
+
+        def email(index: int, note: str, refined: bool) -> Dict[str, Any]:
+            candidate = candidates[index]
+            return {"event": "email", "index": index, "name": candidate.get("name"), "email": candidate.get("email"),
+                    "refined": refined, **self.fill(template, candidate, sender_name, note)}
+
+        if not refine:
+            for index, candidate in enumerate(candidates):
+                yield email(index, self.local_note(candidate, job_skills), False)
+        else:
+            batches = [list(range(start, min(start + batch_size, len(candidates))))
+                       for start in range(0, len(candidates), batch_size)]
+            pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+            try:
+                futures = {
+                    pool.submit(self.refine_notes, job_description, [candidates[i] for i in batch]): batch
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        notes = future.result()
+                    except LLMCallError as e:
+                        print(f"Outreach refinement failed for {len(batch)} candidates ({e.failure_mode}), using local notes")
+                        notes = {}
+                    for position, index in enumerate(batch):
+                        note = notes.get(position)
+                        yield email(index, note or self.local_note(candidates[index], job_skills), note is not None)
+            finally:
+                # Also runs when the client disconnects (GeneratorExit): queued batches are
+                # dropped instead of spending the shared LLM budget for nobody.
+                pool.shutdown(wait=False, cancel_futures=True)
+        yield {"event": "done", "count": len(candidates), "template_id": template["template_id"]}
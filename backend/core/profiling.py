@@ -0,0 +1,206 @@
+# backend/core/profiling.py
+"""
+Opt-in per-request profiling for the FastAPI (backend.main) and Flask (ResumeParsing)
+apps. Nothing here is imported or installed unless PROFILING_ENABLED is set, so a
+disabled profiler costs nothing per request.
+
+A request is profiled when it carries PROFILE_HEADER equal to PROFILE_TOKEN (the
+header is ignored while no token is configured, so clients cannot trigger profiles
+on their own) or falls in the random PROFILE_SAMPLE_RATE share. Two modes:
+
+- "sample": a background thread snapshots every thread's stack each PROFILE_INTERVAL
+  seconds (sys._current_frames). It sees work the request hands to the threadpool,
+  the search fan-out and the LLM client; concurrent requests show up too, under their
+  own thread names.
+- "cprofile": deterministic cProfile of the request thread. Flask only: FastAPI runs
+  the middleware on the event loop and sync handlers in the threadpool, so a cProfile
+  there would miss the handler; the FastAPI app always uses "sample".
+
+Profiles are written to PROFILE_DIR in collapsed-stack format ("frame;frame;frame N"
+per line; open with speedscope or flamegraph.pl), or as .prof (pstats, e.g. for
+snakeviz/flameprof) for cProfile. Only the newest PROFILE_MAX_FILES are kept, and at
+most one request is profiled at a time.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+_active = threading.Lock()  # one profiled request at a time
+
+
+def should_profile(header_value: Optional[str]) -> bool:
+    if header_value is not None and config.PROFILE_TOKEN and hmac.compare_digest(header_value, config.PROFILE_TOKEN):
+        return True
+    return config.PROFILE_SAMPLE_RATE > 0 and random.random() < config.PROFILE_SAMPLE_RATE
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Collapsed-stack counts of every thread (except itself), sampled every `interval` seconds."""
+
+    def __init__(self, interval: float = config.PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfile:
+    """One profiled request: start() before the handler, finish() after it returns."""
+
+    def __init__(self, method: str, path: str, mode: str = config.PROFILE_MODE):
+        self.method = method
+        self.path = path
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == "cprofile" else StackSampler()
+        self.started = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        if isinstance(self.profiler, StackSampler):
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def finish(self, status: Optional[int] = None) -> Optional[str]:
+        """Stops profiling, writes the file and returns its name (None if writing failed)."""
+        if isinstance(self.profiler, StackSampler):
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.path).strip("-")[:60] or "root"
+        extension = "prof" if self.mode == "cprofile" else "collapsed"
+        name = (f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}-{self.method}-{slug}"
+                f"-{status or 0}-{elapsed_ms:.0f}ms.{extension}")
+        try:
+            os.makedirs(config.PROFILE_DIR, exist_ok=True)
+            path = os.path.join(config.PROFILE_DIR, name)
+            if isinstance(self.profiler, StackSampler):
+                self.profiler.write(path)
+            else:
+                self.profiler.dump_stats(path)
+            prune(config.PROFILE_DIR, config.PROFILE_MAX_FILES)
+        except OSError as e:
+            logger.warning("Could not write request profile %s: %s", name, e)
+            return None
+        logger.info("Profiled %s %s (%.0f ms) -> %s", self.method, self.path, elapsed_ms, path)
+        return name
+
+
+def prune(directory: str, keep: int) -> None:
+    """Deletes all but the `keep` newest profile files."""
+    files = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory) if name.endswith((".collapsed", ".prof"))),
+        key=os.path.getmtime,
+    )
+    for path in files[:-keep] if keep > 0 else files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def begin(method: str, path: str, header_value: Optional[str], mode: str = config.PROFILE_MODE) -> Optional[RequestProfile]:
+    """Starts a RequestProfile if this request should be profiled and none is running."""
+    if not should_profile(header_value) or not _active.acquire(blocking=False):
+        return None
+    profile = RequestProfile(method, path, mode)
+    profile.start()
+    return profile
+
+
+def end(profile: RequestProfile, status: Optional[int]) -> Optional[str]:
+    try:
+        return profile.finish(status)
+    finally:
+        _active.release()
+
+
+def install_fastapi_profiler(app) -> None:
+    """Adds the profiling middleware to a FastAPI/Starlette app (always in "sample" mode)."""
+    if config.PROFILE_MODE == "cprofile":
+        logger.warning("PROFILE_MODE=cprofile only applies to the Flask app; FastAPI requests are stack-sampled")
+
+    @app.middleware("http")
+    async def profile_request(request, call_next):
+        profile = begin(request.method, request.url.path, request.headers.get(config.PROFILE_HEADER), mode="sample")
+        if profile is None:
+            return await call_next(request)
+        status = None
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            name = end(profile, status)
+        if name:
+            response.headers["X-Profile-File"] = name
+        return response
+
+
+def install_flask_profiler(app) -> None:
+    """Adds before/after hooks to a Flask app (the handler runs on the request thread)."""
+    from flask import g, request
+
+    @app.before_request
+    def start_profile():
+        g.request_profile = begin(request.method, request.path, request.headers.get(config.PROFILE_HEADER))
+
+    @app.after_request
+    def stop_profile(response):
+        profile = g.pop("request_profile", None)
+        if profile is not None:
+            name = end(profile, response.status_code)
+            if name:
+                response.headers["X-Profile-File"] = name
+        return response
+
+    @app.teardown_request
+    def abandon_profile(error=None):
+        profile = g.pop("request_profile", None)  # only set here when after_request did not run
+        if profile is not None:
+            end(profile, 500)
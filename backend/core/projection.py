@@ -0,0 +1,82 @@
+# backend/core/projection.py
+import os
+from typing import Optional
+import numpy as np
+from backend import config
+
+# Number of set bits in every byte value, for Hamming distance over packed codes.
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class VectorProjection:
+    """
+    Low-dimension copy of the candidate vectors, used for a cheap first pass over
+    the whole corpus before exact rescoring of a shortlist with the full vectors.
+
+    kind:
+      - "pca":      project onto the top `dim` principal components (float32, dim values)
+      - "truncate": keep the first `dim` coordinates (float32, dim values)
+      - "binary":   one sign bit per centered coordinate, compared by Hamming distance
+                    (dim / 8 bytes per vector)
+
+    For the float kinds the corpus is centered before projecting and the query is not,
+    so reduced dot products rank candidates like the full cosine (the mean term is the
+    same for every candidate).
+    """
+
+    KINDS = ("pca", "truncate", "binary")
+
+    def __init__(self, kind: str, mean: np.ndarray, components: Optional[np.ndarray] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown projection kind: {kind}")
+        self.kind = kind
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = None if components is None else np.asarray(components, dtype=np.float32)
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[1] if self.components is not None else self.mean.shape[0]
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, kind: str = "pca", dim: int = 128) -> "VectorProjection":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        mean = vectors.mean(axis=0)
+        if kind == "binary":
+            return cls(kind, mean)
+        if kind == "truncate":
+            return cls(kind, np.zeros_like(mean), np.eye(vectors.shape[1], dim, dtype=np.float32))
+        # Principal axes from the SVD of the centered sample, largest variance first.
+        _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        return cls(kind, mean, vt[:dim].T)
+
+    @classmethod
+    def load(cls, path: str = config.PROJECTION_PATH) -> Optional["VectorProjection"]:
+        if not path or not os.path.exists(path):
+            return None
+        data = np.load(path)
+        components = data["components"] if data["components"].size else None
+        projection = cls(str(data["kind"]), data["mean"], components)
+        print(f"Loaded {projection.kind} projection (dim {projection.dim}) from {path}")
+        return projection
+
+    def save(self, path: str = config.PROJECTION_PATH) -> None:
+        components = self.components if self.components is not None else np.zeros((0, 0), dtype=np.float32)
+        np.savez(path, kind=self.kind, mean=self.mean, components=components)
+
+    def transform_corpus(self, vectors: np.ndarray) -> np.ndarray:
+        centered = np.asarray(vectors, dtype=np.float32) - self.mean
+        if self.kind == "binary":
+            return np.packbits(centered > 0, axis=1)
+        return np.ascontiguousarray(centered @ self.components)
+
+    def transform_query(self, query: np.ndarray) -> np.ndarray:
+        query = np.asarray(query, dtype=np.float32)
+        if self.kind == "binary":
+            return np.packbits((query - self.mean) > 0)
+        return query @ self.components
+
+    def scores(self, reduced: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """First-pass scores (higher is better) of reduced corpus rows against a transformed query."""
+        if self.kind == "binary":
+            return -POPCOUNT[reduced ^ query].sum(axis=1, dtype=np.int32)
+        return reduced @ query
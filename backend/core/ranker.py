@@ -1,13 +1,53 @@
+from typing import Optional
 from backend.core.extractor import SemanticJobExtractor
 from backend.core.model import FeedbackModel
+from backend.core.skill_index import SkillBitsetIndex, SkillRegistry
+from backend.core.taxonomy import get_taxonomy
 
 class CandidateRanker:
-    def __init__(self, model: FeedbackModel, extractor: SemanticJobExtractor):
+    def __init__(
+        self,
+        model: FeedbackModel,
+        extractor: SemanticJobExtractor,
+        skill_index: Optional[SkillBitsetIndex] = None,
+        registry: Optional[SkillRegistry] = None,
+    ):
         self.model = model
         self.extractor = extractor
+        self.taxonomy = get_taxonomy()
+        # With both set, skill_overlap of indexed candidates is a bitset popcount.
+        self.skill_index = skill_index
+        self.registry = registry
+
+    def features(self, candidate: dict, job: dict, skill_overlap: Optional[int] = None) -> list[float]:
+        """
+        [skill_overlap, experience_gap, qualification_match], the feature layout
+        FeedbackModel is trained on. Skills and qualifications are compared as
+        canonical taxonomy ids, so "k8s" and "Kubernetes" count as the same skill.
+        skill_overlap may be passed in precomputed (from the skill bitset index).
+        """
+        job_skills = set(job.get("skill_ids") or self.taxonomy.canonicalize(job.get("skills", []), "skills"))
+        job_quals = set(job.get("qualification_ids") or self.taxonomy.canonicalize(job.get("qualifications", []), "qualifications"))
+        candidate_quals = set(self.taxonomy.canonicalize(candidate.get("qualifications", []), "qualifications"))
+
+        if skill_overlap is None:
+            skill_overlap = len(job_skills & set(self.taxonomy.canonicalize(candidate.get("skills", []), "skills")))
+        experience_gap = max((job.get("experience") or 0) - (candidate.get("experience") or 0), 0)
+        qualification_match = int(bool(job_quals & candidate_quals))
+        return [skill_overlap, experience_gap, qualification_match]
+
+    def skill_overlaps(self, candidates: list[dict], job: dict) -> list[Optional[int]]:
+        """Overlap counts from the bitset index; None for candidates it does not cover."""
+        if self.skill_index is None or self.registry is None:
+            return [None] * len(candidates)
+        self.skill_index.maybe_sync()
+        job_skills = job.get("skill_ids") or self.taxonomy.canonicalize(job.get("skills", []), "skills")
+        job_codes = self.registry.codes_for(job_skills, create=False)
+        return self.skill_index.overlap(job_codes, [c.get("_id") or c.get("id") for c in candidates])
 
     def rank(self, candidates: list[dict], job: dict) -> list[dict]:
-        features = [self.extractor.to_vector(self.extractor.extract(c, job)) for c in candidates]
+        overlaps = self.skill_overlaps(candidates, job)
+        features = [self.features(c, job, overlap) for c, overlap in zip(candidates, overlaps)]
         scores = self.model.predict_proba(features)
         ranked = sorted(zip(candidates, scores), key=lambda x: x[1], reverse=True)
         return [{"candidate": c, "score": s} for c, s in ranked]
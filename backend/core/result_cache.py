@@ -0,0 +1,146 @@
+# backend/core/result_cache.py
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from pymongo.collection import Collection
+from backend import config
+
+
+@dataclass
+class CachedSearch:
+    """A previous search: its extracted features, query and ranked (id, score) list."""
+    key: str
+    top_k: int
+    query: str
+    features: Dict[str, Any]
+    hits: List[Tuple[Any, float]]
+    created: float = field(default_factory=time.monotonic)
+    corpus_version: Any = None
+    # Hash of the JD text past the embedder's window, and the ring slot holding the entry.
+    tail_hash: str = ""
+    slot: Optional[int] = None
+
+
+class SemanticResultCache:
+    """
+    Small in-memory vector index of recent job-description embeddings -> ranked
+    candidate ids. A new JD whose embedding is within `threshold` cosine similarity of
+    a cached one (same filters/mode key, enough results) reuses that search.
+
+    Entries expire after `ttl` seconds and are all dropped when the corpus
+    fingerprint (document count + newest _id) changes, i.e. after resumes are ingested.
+
+    The embedder truncates long inputs (MiniLM: 256 tokens), so two JDs that only differ
+    past that point embed identically; text beyond the first embed_words words must
+    therefore match exactly (tail_hash) for an entry to be reused.
+    """
+
+    def __init__(
+        self,
+        threshold: float = config.SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = config.SEMANTIC_CACHE_TTL,
+        max_entries: int = config.SEMANTIC_CACHE_MAX_ENTRIES,
+        corpus_check_interval: float = config.SEMANTIC_CACHE_CORPUS_CHECK_INTERVAL,
+        dim: int = config.EMBEDDING_DIM,
+        embed_words: int = config.SEMANTIC_CACHE_EMBED_WORDS,
+    ):
+        self.threshold = threshold
+        self.embed_words = embed_words
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.corpus_check_interval = corpus_check_interval
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._entries: List[Optional[CachedSearch]] = [None] * max_entries
+        self._next_slot = 0  # ring buffer: the oldest entry is overwritten first
+        self._corpus_version: Any = None
+        self._corpus_checked_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def tail_hash(self, text: str) -> str:
+        """Hash of the normalized words the embedding does not see ("" for short texts)."""
+        tail = text.lower().split()[self.embed_words:]
+        return hashlib.sha256(" ".join(tail).encode("utf-8")).hexdigest() if tail else ""
+
+    def corpus_fingerprint(self, collection: Collection) -> Any:
+        newest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return collection.estimated_document_count(), newest["_id"] if newest else None
+
+    def refresh_corpus_version(self, *collections: Collection) -> None:
+        """
+        Re-reads the corpus fingerprint (of every collection searched, e.g. all shards)
+        at most every corpus_check_interval seconds and invalidates everything when it changed.
+        """
+        now = time.monotonic()
+        if now - self._corpus_checked_at < self.corpus_check_interval:
+            return
+        version = tuple(self.corpus_fingerprint(collection) for collection in collections)
+        with self._lock:
+            self._corpus_checked_at = now
+            if version != self._corpus_version:
+                if self._corpus_version is not None:
+                    print("Candidate corpus changed, clearing semantic result cache")
+                self._clear_locked()
+                self._corpus_version = version
+
+    def _clear_locked(self) -> None:
+        self._entries = [None] * self.max_entries
+        self._vectors[:] = 0
+        self._next_slot = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def lookup(self, embedding: List[float], key: str, top_k: int, text: str = "") -> Optional[CachedSearch]:
+        query = self._normalize(embedding)
+        tail_hash = self.tail_hash(text)
+        now = time.monotonic()
+        with self._lock:
+            similarities = self._vectors @ query
+            for slot in np.argsort(-similarities):
+                if similarities[slot] < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry is None or entry.key != key or entry.top_k < top_k or entry.tail_hash != tail_hash:
+                    continue
+                if now - entry.created > self.ttl or entry.corpus_version != self._corpus_version:
+                    self._entries[slot] = None
+                    self._vectors[slot] = 0
+                    continue
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def store(self, embedding: List[float], entry: CachedSearch, text: str = "", replace: Optional[CachedSearch] = None) -> None:
+        """
+        Adds entry in the next ring slot, or in place of `replace` (the stale entry a
+        "refresh" recomputed) when that is still cached, so lookups see the new results.
+        """
+        entry.tail_hash = self.tail_hash(text)
+        with self._lock:
+            entry.corpus_version = self._corpus_version
+            if replace is not None and replace.slot is not None and self._entries[replace.slot] is replace:
+                slot = replace.slot
+            else:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.max_entries
+            entry.slot = slot
+            self._vectors[slot] = self._normalize(embedding)
+            self._entries[slot] = entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = sum(entry is not None for entry in self._entries)
+        total = self.hits + self.misses
+        return {"entries": size, "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,135 @@
+# backend/core/search_router.py
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pymongo.collection import Collection
+from backend import config
+from backend.core.admission import Deadline, DeadlineExceeded
+from backend.core.candidate_cache import CandidateCardCache
+from backend.core.searcher import CandidateSearcher
+from backend.core.skill_index import SkillRegistry
+
+# One pool per shard, shared by every request so fan-out does not pay thread start-up
+# per query. Separate pools keep a slow shard (whose queries run on until their own
+# time limit) from taking the threads the healthy shards need.
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def shard_executor(name: str) -> ThreadPoolExecutor:
+    with _executors_lock:
+        if name not in _executors:
+            # Enough threads for every admitted search to have one query on this shard.
+            workers = config.SHARD_FANOUT_WORKERS or config.ADMISSION_MAX_LIMIT
+            _executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"shard-{name}")
+        return _executors[name]
+
+
+def merge_top_k(partials: List[List[Dict]], top_k: int) -> List[Dict]:
+    """k-way heap merge of per-shard result lists, each already sorted by score (highest first)."""
+    merged = heapq.merge(*partials, key=lambda doc: doc.get("score") or 0.0, reverse=True)
+    return list(itertools.islice(merged, top_k))
+
+
+class SearchRouter:
+    """
+    Scatter-gather search over several candidate collections (SEARCH_SHARDS), with the
+    same search/hybrid_search/fetch_by_ids interface as CandidateSearcher.
+
+    Each shard is queried concurrently through its own CandidateSearcher; the router
+    waits until every shard answered, or until the shard timeout / request deadline,
+    then merges whatever arrived. Slow or failing shards are left out of the result
+    and reported in shard_status; only when no shard answered is an error raised.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, Collection],
+        card_caches: Optional[Dict[str, CandidateCardCache]] = None,
+        deadline: Optional[Deadline] = None,
+        shard_timeout: float = config.SHARD_TIMEOUT,
+        skill_registries: Optional[Dict[str, SkillRegistry]] = None,
+    ):
+        self.shards = shards
+        self.card_caches = card_caches or {}
+        # Per shard, since each shard database allocates its own skill codes.
+        self.skill_registries = skill_registries or {}
+        self.deadline = deadline
+        self.shard_timeout = shard_timeout
+        self.shard_status: Dict[str, str] = {}
+
+    def _scatter(self, call: Callable[[CandidateSearcher], List[Dict]]) -> List[List[Dict]]:
+        timeout = self.shard_timeout
+        if self.deadline is not None:
+            self.deadline.check("shard fan-out")
+            timeout = min(timeout, self.deadline.remaining())
+
+        # Each shard query gets its own Deadline of the shard timeout, so its server-side
+        # maxTimeMS ends it at the shard timeout rather than the full request deadline.
+        futures = {}
+        for name, collection in self.shards.items():
+            searcher = CandidateSearcher(
+                collection, card_cache=self.card_caches.get(name), deadline=Deadline(timeout),
+                skill_registry=self.skill_registries.get(name),
+            )
+            futures[shard_executor(name).submit(call, searcher)] = name
+        done, pending = wait(futures, timeout=timeout)
+
+        partials, errors = [], []
+        for future in pending:
+            future.cancel()  # running ones stop at their own deadline's maxTimeMS
+            self.shard_status[futures[future]] = "timeout"
+        for future in done:
+            name = futures[future]
+            try:
+                hits = future.result()
+            except Exception as e:
+                print(f"Shard {name} failed: {e}")
+                self.shard_status[name] = f"error: {e}"
+                errors.append(e)
+                continue
+            for hit in hits:
+                hit["shard"] = name
+            partials.append(hits)
+            self.shard_status[name] = "ok"
+
+        if not partials:
+            if errors:
+                raise errors[0]
+            raise DeadlineExceeded("waiting for shards")
+        return partials
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        return merge_top_k(self._scatter(lambda s: s.search(embedding, top_k, filters, fields)), top_k)
+
+    def hybrid_search(
+        self,
+        embedding: List[float],
+        query_text: str,
+        top_k: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        lexical_weight: float = config.HYBRID_LEXICAL_WEIGHT,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Per-shard fused rankings merged by their normalized fusion score. Fusion runs
+        inside each shard, so the merged order approximates (not equals) a global fusion.
+        """
+        partials = self._scatter(lambda s: s.hybrid_search(embedding, query_text, top_k, filters, lexical_weight, fields))
+        return merge_top_k(partials, top_k)
+
+    def fetch_by_ids(self, hits: List[Tuple[Any, float]], fields: Optional[List[str]] = None) -> List[Dict]:
+        """Cached (id, score) hits do not record their shard, so every shard is asked; ranking order is kept."""
+        found = {}
+        for partial in self._scatter(lambda s: s.fetch_by_ids(hits, fields)):
+            for doc in partial:
+                found[doc["_id"]] = doc
+        return [found[doc_id] for doc_id, _ in hits if doc_id in found]
@@ -1,40 +1,304 @@
 # backend/core/searcher.py
 from pymongo.collection import Collection
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from backend import config
+from backend.core.admission import Deadline
+from backend.core.candidate_cache import CandidateCardCache
+from backend.core.lexical import reciprocal_rank_fusion
+from backend.core.local_index import LocalVectorIndex
+from backend.core.num_candidates import NumCandidatesPolicy, default_num_candidates
+from backend.core.skill_index import SkillBitsetIndex, SkillRegistry
+
+# Candidate fields that can be used in the $vectorSearch pre-filter. Each one must
+# be declared as a "filter" field in the vector index (see vector_index_definition).
+FILTER_FIELDS = ["location", "experience", "skills", "skill_codes", "qualifications"]
+
+# Candidate fields a search result card needs (SearchResultItem). Anything else
+# (embedding, vector, raw resume text) is never projected out of the search stages.
+RESULT_FIELDS = ["name", "title", "company", "summary", "skills", "avatarUrl", "location", "email"]
+
+
+def vector_index_definition(num_dimensions: int = config.EMBEDDING_DIM) -> Dict[str, Any]:
+    """
+    Atlas Vector Search index definition for the candidate collection, including
+    the filter fields used by build_vector_filter.
+    """
+    fields = [{
+        "type": "vector",
+        "path": config.VECTOR_PATH,
+        "numDimensions": num_dimensions,
+        "similarity": "cosine",
+    }]
+    fields.extend({"type": "filter", "path": field} for field in FILTER_FIELDS)
+    return {"fields": fields}
+
+
+def build_vector_filter(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Translates structured search filters into an MQL filter supported by $vectorSearch
+    ($eq, $in, $gte and $and only). Returns {} when nothing is constrained.
+
+    Supported keys:
+    - locations: candidate location must be one of these values
+    - min_experience: candidate experience (years) must be >= this value
+    - required_skills: candidate must have every one of these skills (raw strings)
+    - skill_codes: candidate must have every one of these registry codes; this is
+      what CandidateSearcher.atlas_filters turns required_skills into
+    - qualifications: candidate must hold at least one of these qualifications
+    """
+    if not filters:
+        return {}
+
+    clauses = []
+    if filters.get("locations"):
+        clauses.append({"location": {"$in": list(filters["locations"])}})
+    if filters.get("min_experience"):
+        clauses.append({"experience": {"$gte": filters["min_experience"]}})
+    # $all is not supported inside $vectorSearch, so each skill gets its own $eq,
+    # which matches any element of the skills array.
+    for skill in filters.get("required_skills") or []:
+        clauses.append({"skills": {"$eq": skill}})
+    for code in filters.get("skill_codes") or []:
+        clauses.append({"skill_codes": {"$eq": code}})
+    if filters.get("qualifications"):
+        clauses.append({"qualifications": {"$in": list(filters["qualifications"])}})
+
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def lexical_index_definition() -> Dict[str, Any]:
+    """
+    Atlas Search index definition for the lexical leg of hybrid search. skills and
+    summary are full-text fields; the filter fields are mapped as tokens/numbers so
+    build_search_filter can use the "in" and "range" operators on them.
+    """
+    return {
+        "mappings": {
+            "dynamic": False,
+            "fields": {
+                "skills": [{"type": "string"}, {"type": "token"}],
+                "skill_codes": {"type": "number"},
+                "summary": {"type": "string"},
+                "location": {"type": "token"},
+                "qualifications": {"type": "token"},
+                "experience": {"type": "number"},
+            },
+        }
+    }
+
+
+def build_search_filter(filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Same constraints as build_vector_filter, expressed as Atlas Search compound
+    "filter" clauses for the $search stage.
+    """
+    if not filters:
+        return []
+    clauses = []
+    if filters.get("locations"):
+        clauses.append({"in": {"path": "location", "value": list(filters["locations"])}})
+    if filters.get("min_experience"):
+        clauses.append({"range": {"path": "experience", "gte": filters["min_experience"]}})
+    for skill in filters.get("required_skills") or []:
+        clauses.append({"in": {"path": "skills", "value": [skill]}})
+    for code in filters.get("skill_codes") or []:
+        clauses.append({"equals": {"path": "skill_codes", "value": code}})
+    if filters.get("qualifications"):
+        clauses.append({"in": {"path": "qualifications", "value": list(filters["qualifications"])}})
+    return clauses
+
+
+@lru_cache(maxsize=1)
+def get_num_candidates_policy() -> Optional[NumCandidatesPolicy]:
+    return NumCandidatesPolicy.load()
+
 
 class CandidateSearcher:
-    def __init__(self, collection: Collection):
+    def __init__(
+        self,
+        collection: Collection,
+        card_cache: Optional[CandidateCardCache] = None,
+        target_recall: float = config.TARGET_RECALL,
+        deadline: Optional[Deadline] = None,
+        local_index: Optional[LocalVectorIndex] = None,
+        skill_index: Optional[SkillBitsetIndex] = None,
+        skill_registry: Optional[SkillRegistry] = None,
+    ):
         self.collection = collection
-        self.index_name = "default"  # Ensure this matches your Atlas Search index name
-        self.vector_path = "embedding" # Ensure this matches the field with vectors
+        self.card_cache = card_cache
+        self.deadline = deadline
+        # When set (VECTOR_BACKEND="snapshot"), vector hits come from this in-process index instead of Atlas.
+        self.local_index = local_index
+        # required_skills are resolved to registry codes, matched on skill_codes in Atlas or by
+        # intersecting the skill posting bitmaps with a local index, so both agree on synonyms.
+        self.skill_index = skill_index
+        self.skill_registry = skill_registry
+        self.num_candidates_policy = get_num_candidates_policy()
+        self.target_recall = target_recall
+        self.index_name = config.VECTOR_INDEX_NAME  # Ensure this matches your Atlas Search index name
+        self.vector_path = config.VECTOR_PATH  # Ensure this matches the field with vectors
+        self.lexical_index_name = config.LEXICAL_INDEX_NAME
 
-    def search(self, embedding: List[float], top_k: int = 100) -> List[Dict]:
+    def _time_limit(self, stage: str, option: str = "maxTimeMS") -> Dict[str, Any]:
         """
-        Performs a vector search on MongoDB Atlas using the $vectorSearch operator.
+        Server-side time limit for the next Mongo operation so it cannot outlive the
+        request deadline (aggregate/count take maxTimeMS, find takes max_time_ms).
         """
-        # numCandidates should typically be greater than top_k (limit)
-        # A common rule of thumb is 10 * top_k, or at least top_k + some buffer,
-        # but adjust based on performance and accuracy needs.
-        num_candidates = max(top_k * 2, top_k + 50) # Example logic for num_candidates
+        if self.deadline is None:
+            return {}
+        self.deadline.check(stage)
+        return {option: self.deadline.remaining_ms()}
 
-        pipeline = [
-            {
-                "$vectorSearch": {
-                    "index": self.index_name,
-                    "queryVector": embedding,
-                    "path": self.vector_path,
-                    "numCandidates": num_candidates,
-                    "limit": top_k
-                    # You can add a "filter" here if needed:
-                    # "filter": { "some_field": "some_value" }
-                }
-            },
-            {
-                "$project": {
-                    "embedding": 0,  # Exclude the embedding field
-                    "score": {"$meta": "vectorSearchScore"}  # Get the search score
-                }
+    def ensure_vector_index(self) -> None:
+        """
+        Creates (or updates) the vector index with its filter fields and the lexical
+        Atlas Search index used by hybrid search.
+        Requires pymongo >= 4.7 and an Atlas cluster.
+        """
+        from pymongo.operations import SearchIndexModel
+
+        existing = {idx["name"] for idx in self.collection.list_search_indexes()}
+        indexes = [
+            (self.index_name, vector_index_definition(), "vectorSearch"),
+            (self.lexical_index_name, lexical_index_definition(), "search"),
+        ]
+        for name, definition, index_type in indexes:
+            if name in existing:
+                self.collection.update_search_index(name, definition)
+            else:
+                self.collection.create_search_index(
+                    SearchIndexModel(definition=definition, name=name, type=index_type)
+                )
+
+    def estimate_selectivity(self, mql_filter: Dict[str, Any]) -> float:
+        """
+        Fraction of the collection that passes the filter (1.0 when unfiltered).
+        """
+        if not mql_filter:
+            return 1.0
+        total = self.collection.estimated_document_count()
+        if not total:
+            return 1.0
+        return self.collection.count_documents(mql_filter, **self._time_limit("filter estimation")) / total
+
+    def num_candidates_for(self, top_k: int, selectivity: float = 1.0) -> int:
+        """
+        numCandidates should typically be greater than top_k (limit). The base value
+        comes from the tuned policy table for target_recall when one is available.
+        With a selective pre-filter, ANN traversal has to visit more nodes to find
+        top_k matching documents, so the base value is scaled up by 1 / selectivity.
+        """
+        if self.num_candidates_policy is not None:
+            base = self.num_candidates_policy.num_candidates(top_k, self.target_recall)
+        else:
+            base = default_num_candidates(top_k)
+        selectivity = max(selectivity, config.MIN_FILTER_SELECTIVITY)
+        return int(min(max(base / selectivity, top_k), config.NUM_CANDIDATES_MAX))
+
+    def projection(self, fields: Optional[List[str]], score_meta: str) -> Dict[str, Any]:
+        """
+        Explicit include-projection for a retrieval stage. With the card cache enabled the
+        stage returns only ids and scores; documents are hydrated from the cache.
+        """
+        projection: Dict[str, Any] = {"_id": 1}
+        if self.card_cache is None:
+            projection.update({field: 1 for field in (fields or RESULT_FIELDS)})
+        projection["score"] = {"$meta": score_meta}
+        return projection
+
+    def hydrate(self, hits: List[Dict], fields: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fills id/score hits with card fields, serving from the card cache and fetching
+        only the missing ids (one $in query, full card so later requests can reuse it).
+        Hits are returned unchanged when the card cache is disabled.
+        """
+        if self.card_cache is None or not hits:
+            return hits
+        ids = [hit["_id"] for hit in hits]
+        cards = self.card_cache.get_many(ids)
+        missing = [doc_id for doc_id in ids if doc_id not in cards]
+        if missing:
+            fetched = {
+                doc["_id"]: doc
+                for doc in self.collection.find(
+                    {"_id": {"$in": missing}}, {field: 1 for field in RESULT_FIELDS}, **self._time_limit("card fetch", "max_time_ms")
+                )
             }
+            self.card_cache.put_many(fetched)
+            cards.update(fetched)
+
+        wanted = fields or RESULT_FIELDS
+        results = []
+        for hit in hits:
+            card = cards.get(hit["_id"])
+            if card is None:
+                continue  # deleted since it was indexed
+            doc = {field: card.get(field) for field in wanted}
+            doc.update(hit)
+            results.append(doc)
+        return results
+
+    def local_filters(self, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Filters for the local index: required_skills become an "ids" restriction from the
+        skill bitset index (AND of posting bitmaps over the whole corpus) when one is set.
+        """
+        if self.skill_index is None or self.skill_registry is None or not filters or not filters.get("required_skills"):
+            return filters
+        filters = dict(filters)
+        filters["ids"] = self.skill_index.filter_skills(self.skill_registry, filters.pop("required_skills"))
+        return filters
+
+    def atlas_filters(self, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Filters for $vectorSearch/$search: with a skill registry, required_skills become
+        "skill_codes" (taxonomy-canonicalized, like the bitset index). Returns None when
+        a required skill is unknown to the registry, so nothing can match.
+        """
+        if self.skill_registry is None or not filters or not filters.get("required_skills"):
+            return filters
+        filters = dict(filters)
+        codes = self.skill_registry.required_codes(filters.pop("required_skills"))
+        if codes is None:
+            return None
+        filters["skill_codes"] = codes
+        return filters
+
+    def _vector_hits(self, embedding: List[float], top_k: int, filters: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict]:
+        if self.local_index is not None:
+            hits = self.local_index.search(embedding, top_k=top_k, filters=self.local_filters(filters))
+            if self.card_cache is not None:
+                return hits  # hydrated from the card cache by the caller
+            return self.fetch_by_ids([(hit["_id"], hit["score"]) for hit in hits], fields)
+
+        filters = self.atlas_filters(filters)
+        if filters is None:
+            return []
+        mql_filter = build_vector_filter(filters)
+        selectivity = self.estimate_selectivity(mql_filter)
+        if selectivity == 0:
+            return []  # Nothing passes the filter, skip the ANN query entirely
+
+        vector_search = {
+            "index": self.index_name,
+            "queryVector": embedding,
+            "path": self.vector_path,
+            "numCandidates": self.num_candidates_for(top_k, selectivity),
+            "limit": top_k
+        }
+        if mql_filter:
+            vector_search["filter"] = mql_filter
+
+        pipeline = [
+            {"$vectorSearch": vector_search},
+            # Include-projection: never ship embedding/vector/raw text for result cards.
+            {"$project": self.projection(fields, "vectorSearchScore")}
             # The 'limit' in $vectorSearch handles the final number of results.
             # An additional $limit stage is usually not needed unless applied after further processing.
         ]
@@ -42,9 +306,112 @@ class CandidateSearcher:
             # For debugging:
             # import json
             # print(f"MongoDB Aggregation Pipeline ($vectorSearch): {json.dumps(pipeline, indent=2)}")
-            results = list(self.collection.aggregate(pipeline))
+            results = list(self.collection.aggregate(pipeline, **self._time_limit("vector search")))
             # print(f"Raw results from MongoDB ($vectorSearch): {results}")
             return results
         except Exception as e:
             print(f"Error during MongoDB aggregation ($vectorSearch): {e}, full error: {getattr(e, 'details', {})}")
-            raise
\ No newline at end of file
+            raise
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Performs a vector search on MongoDB Atlas using the $vectorSearch operator.
+        Structured filters are pushed down into the $vectorSearch pre-filter; only
+        `fields` (default RESULT_FIELDS) are returned for each hit.
+        """
+        return self.hydrate(self._vector_hits(embedding, top_k, filters, fields), fields)
+
+    def fetch_by_ids(self, hits: List[Tuple[Any, float]], fields: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Loads candidate cards for previously ranked (id, score) pairs, preserving
+        the ranking order. Ids that no longer exist are skipped.
+        """
+        ranked = [{"_id": doc_id, "score": score} for doc_id, score in hits]
+        if self.card_cache is not None:
+            return self.hydrate(ranked, fields)
+
+        ids = [hit["_id"] for hit in ranked]
+        projection = {field: 1 for field in (fields or RESULT_FIELDS)}
+        docs = {
+            doc["_id"]: doc
+            for doc in self.collection.find({"_id": {"$in": ids}}, projection, **self._time_limit("document fetch", "max_time_ms"))
+        }
+        results = []
+        for hit in ranked:
+            doc = docs.get(hit["_id"])
+            if doc is not None:
+                doc["score"] = hit["score"]
+                results.append(doc)
+        return results
+
+    def _lexical_hits(self, query_text: str, top_k: int, filters: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict]:
+        filters = self.atlas_filters(filters)
+        if filters is None:
+            return []
+        compound: Dict[str, Any] = {
+            "should": [
+                {"text": {"query": query_text, "path": "skills", "score": {"boost": {"value": 2}}}},
+                {"text": {"query": query_text, "path": "summary"}},
+            ],
+            "minimumShouldMatch": 1,
+        }
+        search_filter = build_search_filter(filters)
+        if search_filter:
+            compound["filter"] = search_filter
+
+        pipeline = [
+            {"$search": {"index": self.lexical_index_name, "compound": compound}},
+            {"$limit": top_k},
+            {"$project": self.projection(fields, "searchScore")}
+        ]
+        try:
+            return list(self.collection.aggregate(pipeline, **self._time_limit("lexical search")))
+        except Exception as e:
+            print(f"Error during MongoDB aggregation ($search): {e}, full error: {getattr(e, 'details', {})}")
+            raise
+
+    def lexical_search(
+        self,
+        query_text: str,
+        top_k: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        BM25 full-text search over candidate skills and summary using Atlas $search.
+        """
+        return self.hydrate(self._lexical_hits(query_text, top_k, filters, fields), fields)
+
+    def hybrid_search(
+        self,
+        embedding: List[float],
+        query_text: str,
+        top_k: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        lexical_weight: float = config.HYBRID_LEXICAL_WEIGHT,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Runs $vectorSearch and $search in parallel and fuses the two rankings with
+        weighted reciprocal rank fusion. lexical_weight=0 degrades to pure vector order.
+        """
+        fetch_k = min(top_k * config.HYBRID_OVERFETCH, 1000)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            vector_future = pool.submit(self._vector_hits, embedding, fetch_k, filters, fields)
+            lexical_future = pool.submit(self._lexical_hits, query_text, fetch_k, filters, fields)
+            rankings = {"vector": vector_future.result(), "lexical": lexical_future.result()}
+
+        fused = reciprocal_rank_fusion(
+            rankings,
+            weights={"vector": 1.0 - lexical_weight, "lexical": lexical_weight},
+            k=config.RRF_K,
+            top_k=top_k,
+        )
+        # Hydrate once, after fusion, so only the final top_k cards are looked up.
+        return self.hydrate(fused, fields)
@@ -0,0 +1,263 @@
+# backend/core/skill_index.py
+"""
+Integer skill ids, per-candidate skill bitsets and an in-memory posting index.
+
+At ingestion, candidate skills are canonicalized through the taxonomy and mapped
+to stable integer codes (SkillRegistry, persisted in Mongo so every writer agrees).
+Each candidate document then carries:
+
+    skill_codes        sorted list of integer codes
+    skill_bitset       bytes, bit i set when the candidate has skill code i
+    skills_indexed_at  write time, used as the incremental sync watermark
+
+SkillBitsetIndex keeps the bitsets as a uint64 matrix (one row per candidate) plus
+a skill -> packed row bitmap posting index, so overlap counts are a vectorized
+popcount and required-skill filters are bitmap intersections over the corpus.
+"""
+import datetime
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from bson import Binary
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+from backend import config
+from backend.core.projection import POPCOUNT
+from backend.core.taxonomy import get_taxonomy
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a 2-d uint64 array."""
+    return POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int32)
+
+
+def bitset_bytes(codes: Iterable[int]) -> bytes:
+    codes = list(codes)
+    if not codes:
+        return b""
+    bits = np.zeros(max(codes) + 1, dtype=bool)
+    bits[codes] = True
+    return np.packbits(bits, bitorder="little").tobytes()
+
+
+class SkillRegistry:
+    """
+    canonical skill id <-> integer code, stored in the `skill_registry` collection
+    ({_id: canonical id, code: n}) with codes allocated from a counter document, so
+    codes are stable across processes and restarts.
+    """
+
+    def __init__(self, db):
+        self.codes_collection = db[config.SKILL_REGISTRY_COLLECTION]
+        self.counters = db[config.SKILL_REGISTRY_COLLECTION + "_counters"]
+        self._codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _allocate(self, canonical: str) -> int:
+        existing = self.codes_collection.find_one({"_id": canonical})
+        if existing:
+            return existing["code"]
+        counter = self.counters.find_one_and_update(
+            {"_id": "skill_code"}, {"$inc": {"seq": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        try:
+            self.codes_collection.insert_one({"_id": canonical, "code": counter["seq"] - 1})
+            return counter["seq"] - 1
+        except DuplicateKeyError:  # another writer registered it first; its code wins
+            return self.codes_collection.find_one({"_id": canonical})["code"]
+
+    def codes_for(self, canonical_ids: Iterable[str], create: bool = True) -> List[int]:
+        codes = []
+        for canonical in canonical_ids:
+            with self._lock:
+                code = self._codes.get(canonical)
+            if code is None:
+                if create:
+                    code = self._allocate(canonical)
+                else:
+                    found = self.codes_collection.find_one({"_id": canonical})
+                    code = found["code"] if found else None
+                if code is None:
+                    continue
+                with self._lock:
+                    self._codes[canonical] = code
+            codes.append(code)
+        return sorted(set(codes))
+
+    def required_codes(self, skills: Iterable[str]) -> Optional[List[int]]:
+        """
+        Codes for a required-skills filter. Skills are canonicalized through the taxonomy
+        (so "k8s" and "Kubernetes" are the same requirement); returns None when one of
+        them was never registered, i.e. no candidate can hold it.
+        """
+        canonical = get_taxonomy().canonicalize(skills, "skills")
+        codes = self.codes_for(canonical, create=False)
+        return codes if len(codes) == len(canonical) else None
+
+    def skill_fields(self, skills: Iterable[str]) -> Dict[str, Any]:
+        """Fields to $set on a candidate document whose `skills` are being written."""
+        codes = self.codes_for(get_taxonomy().canonicalize(skills, "skills"))
+        return {
+            "skill_codes": codes,
+            "skill_bitset": Binary(bitset_bytes(codes)),
+            "skills_indexed_at": datetime.datetime.now(datetime.timezone.utc),
+        }
+
+
+class SkillBitsetIndex:
+    """
+    In-memory bitset index over every candidate with skill_codes.
+
+    - rows: one uint64 bitset row per candidate (width grows with the largest code)
+    - postings: skill code -> packed bitmap over rows
+    - overlap(job_codes, ids): popcount(row & job) for the given candidates
+    - filter_ids(required_codes): ids of candidates holding every required skill
+
+    sync() applies documents written since the last watermark, so the index follows
+    ResumeAgent.sendToMongo / process_candidates writes without a rebuild. Removed
+    candidates are only dropped by a full rebuild (sync(full=True)).
+    """
+
+    def __init__(self, collection: Collection, sync_interval: float = config.SKILL_INDEX_SYNC_INTERVAL):
+        self.collection = collection
+        self.sync_interval = sync_interval
+        self._synced_at = 0.0
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ids: List[Any] = []
+        self.rows: Dict[Any, int] = {}
+        self.bits = np.zeros((0, 1), dtype=np.uint64)
+        self.postings: Dict[int, np.ndarray] = {}
+        self.watermark: Optional[datetime.datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def key(doc_id: Any) -> str:
+        # Search results and rank requests carry ids as strings.
+        return str(doc_id)
+
+    def _ensure_capacity(self, rows: int, width: int) -> None:
+        capacity, words = self.bits.shape
+        if rows <= capacity and width <= words:
+            return
+        new_capacity = max(rows, capacity * 2, 1024) if rows > capacity else capacity
+        new_words = max(width, words)
+        grown = np.zeros((new_capacity, new_words), dtype=np.uint64)
+        grown[:capacity, :words] = self.bits
+        self.bits = grown
+        if new_capacity != capacity:
+            posting_words = (new_capacity + 63) // 64
+            for code, bitmap in self.postings.items():
+                self.postings[code] = np.concatenate([bitmap, np.zeros(posting_words - bitmap.size, dtype=np.uint64)])
+
+    def _set_posting(self, code: int, row: int, value: bool) -> None:
+        bitmap = self.postings.get(code)
+        if bitmap is None:
+            bitmap = self.postings[code] = np.zeros((self.bits.shape[0] + 63) // 64, dtype=np.uint64)
+        mask = np.uint64(1) << np.uint64(row % 64)
+        if value:
+            bitmap[row // 64] |= mask
+        else:
+            bitmap[row // 64] &= ~mask
+
+    def upsert(self, doc_id: Any, codes: Iterable[int]) -> None:
+        codes = sorted(set(codes))
+        key = self.key(doc_id)
+        with self._lock:
+            row = self.rows.get(key)
+            if row is None:
+                row = len(self.ids)
+                self.ids.append(key)
+                self.rows[key] = row
+            self._ensure_capacity(row + 1, (max(codes) // 64 + 1) if codes else 1)
+
+            old = set(self.codes_of_row(row))
+            for code in old - set(codes):
+                self._set_posting(code, row, False)
+            for code in set(codes) - old:
+                self._set_posting(code, row, True)
+            self.bits[row] = self.encode(codes, self.bits.shape[1])
+
+    def codes_of_row(self, row: int) -> List[int]:
+        bits = np.unpackbits(self.bits[row].view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits).tolist()
+
+    @staticmethod
+    def encode(codes: Iterable[int], words: int) -> np.ndarray:
+        bits = np.zeros(words * 64, dtype=bool)
+        codes = [c for c in codes if c < words * 64]
+        bits[codes] = True
+        return np.packbits(bits, bitorder="little").view(np.uint64)
+
+    def sync(self, full: bool = False) -> int:
+        """Loads documents indexed since the watermark (everything when full). Returns rows applied."""
+        with self._lock:
+            if full:
+                self._reset()
+            query: Dict[str, Any] = {"skill_codes": {"$exists": True}}
+            if self.watermark is not None:
+                # $gte: writes sharing the watermark's timestamp are re-applied (upsert is idempotent).
+                query["skills_indexed_at"] = {"$gte": self.watermark}
+            applied = 0
+            cursor = self.collection.find(query, {"skill_codes": 1, "skills_indexed_at": 1}).sort("skills_indexed_at", 1)
+            for doc in cursor:
+                self.upsert(doc["_id"], doc.get("skill_codes") or [])
+                stamp = doc.get("skills_indexed_at")
+                if stamp is not None:
+                    if stamp.tzinfo is None:
+                        stamp = stamp.replace(tzinfo=datetime.timezone.utc)
+                    self.watermark = stamp if self.watermark is None else max(self.watermark, stamp)
+                applied += 1
+            self._synced_at = time.monotonic()
+            if applied:
+                print(f"SkillBitsetIndex: applied {applied} candidates ({len(self.ids)} indexed)")
+            return applied
+
+    def maybe_sync(self) -> None:
+        if time.monotonic() - self._synced_at >= self.sync_interval:
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"SkillBitsetIndex sync failed, serving the previous state: {e}")
+
+    def overlap(self, job_codes: Iterable[int], ids: Iterable[Any]) -> List[Optional[int]]:
+        """Shared-skill counts for each id (None for ids not in the index)."""
+        ids = [self.key(doc_id) for doc_id in ids]
+        with self._lock:
+            rows = np.array([self.rows.get(doc_id, -1) for doc_id in ids], dtype=np.int64)
+            indexed = rows >= 0
+            counts = np.zeros(rows.size, dtype=np.int32)
+            if indexed.any():
+                job = self.encode(job_codes, self.bits.shape[1])
+                counts[indexed] = popcount(self.bits[rows[indexed]] & job)
+        return [int(c) if r >= 0 else None for c, r in zip(counts, rows)]
+
+    def filter_ids(self, required_codes: Iterable[int]) -> List[Any]:
+        """Ids of indexed candidates that hold every required skill (AND of postings)."""
+        with self._lock:
+            words = (self.bits.shape[0] + 63) // 64
+            result = np.full(words, np.iinfo(np.uint64).max, dtype=np.uint64)
+            for code in required_codes:
+                bitmap = self.postings.get(code)
+                if bitmap is None:
+                    return []
+                result &= bitmap
+            rows = np.flatnonzero(np.unpackbits(result.view(np.uint8), bitorder="little")[:len(self.ids)])
+            return [self.ids[row] for row in rows]
+
+    def filter_skills(self, registry: SkillRegistry, skills: Iterable[str]) -> List[Any]:
+        """
+        filter_ids for skill names, mapped through registry.required_codes. A skill
+        that no candidate was ever indexed with matches nobody.
+        """
+        codes = registry.required_codes(skills)
+        if codes is None:
+            return []
+        self.maybe_sync()
+        return self.filter_ids(codes)
@@ -0,0 +1,166 @@
+# backend/core/taxonomy.py
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Iterable, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "skills_taxonomy.json"
+)
+
+
+def normalize(term: str) -> str:
+    return re.sub(r"\s+", " ", term.strip().lower())
+
+
+def slugify(term: str) -> str:
+    """Fallback id for skills that are not in the taxonomy."""
+    return re.sub(r"[^a-z0-9+#]+", "_", normalize(term)).strip("_")
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of every pattern in one linear
+    pass over the text (goto/fail automaton over characters).
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]  # state -> [(pattern length, value)]
+        self._built = False
+
+    def add(self, pattern: str, value: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """Yields (start, end, value) for every match, in order of end position."""
+        if not self._built:
+            self.build()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, value in self._out[state]:
+                yield i - length + 1, i + 1, value
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class SkillTaxonomy:
+    """
+    Skills/qualifications dictionary with synonyms (e.g. "k8s" -> kubernetes).
+
+    - match(text, kind) scans free text (job descriptions) in a single pass and returns
+      canonical ids, keeping the leftmost-longest match at word boundaries.
+    - canonicalize(terms, kind) maps already-tokenized values (candidate skills lists,
+      LLM output) to the same ids, so ranking features compare normalized ids.
+
+    Entries may also list "exact_only" aliases: short or ambiguous words ("Go", "MS")
+    that are accepted as a whole skill value but never matched inside free text.
+    """
+
+    KINDS = ("skills", "qualifications")
+
+    def __init__(self, entries: Dict[str, Dict[str, Dict]]):
+        self.labels: Dict[str, Dict[str, str]] = {}
+        self._aliases: Dict[str, Dict[str, str]] = {}
+        self._matchers: Dict[str, AhoCorasick] = {}
+
+        for kind in self.KINDS:
+            labels, aliases, matcher = {}, {}, AhoCorasick()
+            for canonical_id, entry in entries.get(kind, {}).items():
+                labels[canonical_id] = entry["label"]
+                scanned = [entry["label"], *entry.get("synonyms", [])]
+                for term in scanned:
+                    aliases[normalize(term)] = canonical_id
+                    matcher.add(normalize(term), canonical_id)
+                for term in entry.get("exact_only", []):
+                    aliases[normalize(term)] = canonical_id
+                aliases[canonical_id] = canonical_id
+            matcher.build()
+            self.labels[kind], self._aliases[kind], self._matchers[kind] = labels, aliases, matcher
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match(self, text: str, kind: str = "skills") -> List[str]:
+        """
+        Canonical ids found in text, in order of first appearance, without duplicates.
+        """
+        lowered = text.lower()
+        spans = [
+            (start, end, value)
+            for start, end, value in self._matchers[kind].iter_matches(lowered)
+            if _is_boundary(lowered, start - 1) and _is_boundary(lowered, end)
+        ]
+        # Leftmost-longest, non-overlapping: "apache spark" wins over "spark".
+        spans.sort(key=lambda span: (span[0], -(span[1] - span[0])))
+        found, last_end = [], -1
+        for start, end, value in spans:
+            if start < last_end:
+                continue
+            last_end = end
+            if value not in found:
+                found.append(value)
+        return found
+
+    def canonical_id(self, term: str, kind: str = "skills") -> str:
+        """
+        Exact alias lookup first, then a scan of the value itself (so "MSc Computer
+        Science" -> masters), then a slug so unknown skills still compare consistently.
+        """
+        canonical = self._aliases[kind].get(normalize(term))
+        if canonical:
+            return canonical
+        scanned = self.match(term, kind)
+        return scanned[0] if scanned else slugify(term)
+
+    def canonicalize(self, terms: Iterable[str], kind: str = "skills") -> List[str]:
+        ids = []
+        for term in terms or []:
+            if not isinstance(term, str) or not term.strip():
+                continue
+            canonical = self.canonical_id(term, kind)
+            if canonical not in ids:
+                ids.append(canonical)
+        return ids
+
+    def label(self, canonical_id: str, kind: str = "skills") -> str:
+        return self.labels[kind].get(canonical_id, canonical_id)
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy() -> SkillTaxonomy:
+    return SkillTaxonomy.load()
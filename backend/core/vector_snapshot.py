@@ -0,0 +1,193 @@
+# backend/core/vector_snapshot.py
+"""
+On-disk candidate vector snapshots shared by every worker on a host.
+
+A snapshot is a single file:
+
+    header (128 bytes) magic, version, dim, count, section offsets, created_at
+    matrix             count x dim float32, L2-normalized, row-major, 64-byte aligned
+    id table           Extended JSON list of candidate _ids (row order)
+    metadata           Extended JSON list of filter fields per row (location, experience, ...)
+
+scripts/refresh_vector_snapshot.py writes a new file next to the old ones and then
+publishes it by atomically replacing the CURRENT pointer file (os.replace). Workers
+np.memmap the matrix read-only, so the page cache holds one copy of the corpus per
+host no matter how many uvicorn workers map it, and SnapshotWatcher swaps each
+worker to the new snapshot once it is published.
+"""
+import os
+import struct
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from bson import json_util
+from backend import config
+from backend.core.local_index import LocalVectorIndex
+from backend.core.projection import VectorProjection
+
+MAGIC = b"CVSNAP01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQd")  # magic, version, dim, count, matrix/ids/meta offsets+lengths, created_at
+HEADER_SIZE = 128
+POINTER_FILE = "CURRENT"
+METADATA_FIELDS = ["location", "experience", "skills", "qualifications"]
+
+
+def _align(offset: int, alignment: int = 64) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def write_snapshot(
+    path: str,
+    batches: Iterable[Tuple[List[Any], np.ndarray, List[Dict[str, Any]]]],
+    dim: int = config.EMBEDDING_DIM,
+) -> int:
+    """
+    Streams (ids, vectors, metadata) batches into a new snapshot file at `path`; the
+    matrix is written batch by batch so the corpus never has to fit in memory twice.
+    Returns the number of rows written.
+
+    The file is written under a unique temporary name and renamed into place, and an
+    existing `path` is never overwritten: workers may have it mapped, and truncating a
+    mapped file crashes them with SIGBUS.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists; snapshot files are never rewritten")
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        count = _write_snapshot_file(tmp, batches, dim)
+        if os.path.exists(path):
+            raise FileExistsError(f"{path} already exists; snapshot files are never rewritten")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return count
+
+
+def _write_snapshot_file(
+    path: str,
+    batches: Iterable[Tuple[List[Any], np.ndarray, List[Dict[str, Any]]]],
+    dim: int,
+) -> int:
+    ids: List[Any] = []
+    metadata: List[Dict[str, Any]] = []
+    with open(path, "xb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        for batch_ids, vectors, batch_meta in batches:
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, dim)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            f.write(np.ascontiguousarray(vectors / norms).tobytes())
+            ids.extend(batch_ids)
+            metadata.extend({field: m.get(field) for field in METADATA_FIELDS} for m in batch_meta)
+
+        ids_offset = _align(HEADER_SIZE + len(ids) * dim * 4)
+        id_table = json_util.dumps(ids).encode("utf-8")
+        meta_offset = ids_offset + len(id_table)
+        meta_table = json_util.dumps(metadata).encode("utf-8")
+        f.seek(ids_offset)
+        f.write(id_table)
+        f.write(meta_table)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, dim, len(ids), HEADER_SIZE,
+                            ids_offset, len(id_table), meta_offset, len(meta_table), time.time()))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(ids)
+
+
+def publish_snapshot(snapshot_dir: str, filename: str, keep: int = 2) -> None:
+    """
+    Points CURRENT at `filename` (atomic rename) and deletes all but the `keep` newest
+    snapshots. Workers still mapping a deleted file keep reading it until they swap.
+    """
+    tmp = os.path.join(snapshot_dir, f".{POINTER_FILE}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(filename)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(snapshot_dir, POINTER_FILE))
+
+    snapshots = sorted(name for name in os.listdir(snapshot_dir) if name.endswith(".snap"))
+    for name in snapshots[:-keep] if keep else []:
+        if name != filename:
+            os.remove(os.path.join(snapshot_dir, name))
+
+
+class VectorSnapshot:
+    """A read-only mapping of one snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+            (magic, version, self.dim, self.count, matrix_offset,
+             ids_offset, ids_length, meta_offset, meta_length, self.created_at) = header
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} vector snapshot")
+            f.seek(ids_offset)
+            self.ids = json_util.loads(f.read(ids_length).decode("utf-8"))
+            f.seek(meta_offset)
+            self.metadata = json_util.loads(f.read(meta_length).decode("utf-8"))
+        if self.count:
+            self.vectors = np.memmap(path, dtype=np.float32, mode="r", offset=matrix_offset, shape=(self.count, self.dim))
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)  # mmap cannot map a zero-length region
+
+    def to_index(self, projection: Optional[VectorProjection] = None) -> LocalVectorIndex:
+        return LocalVectorIndex(self.ids, self.vectors, self.metadata, projection=projection, normalized=True)
+
+
+def current_snapshot_path(snapshot_dir: str = config.SNAPSHOT_DIR) -> Optional[str]:
+    try:
+        with open(os.path.join(snapshot_dir, POINTER_FILE), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(snapshot_dir, name) if name else None
+
+
+class SnapshotWatcher:
+    """
+    Per-worker handle on the published snapshot. current() re-reads the CURRENT
+    pointer at most every check_interval seconds and, when it names a new file,
+    maps it and swaps the index in one assignment; in-flight searches keep using
+    the index they already hold.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: str = config.SNAPSHOT_DIR,
+        check_interval: float = config.SNAPSHOT_CHECK_INTERVAL,
+        projection: Optional[VectorProjection] = None,
+    ):
+        self.snapshot_dir = snapshot_dir
+        self.check_interval = check_interval
+        self.projection = projection
+        self.path: Optional[str] = None
+        self.index: Optional[LocalVectorIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[LocalVectorIndex]:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval and self._lock.acquire(blocking=self.index is None):
+            try:
+                self._checked_at = now
+                path = current_snapshot_path(self.snapshot_dir)
+                if path and path != self.path:
+                    snapshot = VectorSnapshot(path)
+                    self.index = snapshot.to_index(self.projection)
+                    self.path = path
+                    print(f"Mapped vector snapshot {path}: {snapshot.count} x {snapshot.dim}")
+            except Exception as e:
+                print(f"Could not load vector snapshot, keeping {self.path}: {e}")
+            finally:
+                self._lock.release()
+        return self.index
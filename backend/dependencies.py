@@ -1,14 +1,72 @@
 from pymongo import MongoClient
 from pymongo.collection import Collection
+from functools import lru_cache
+from typing import Dict
+import json
 import os
+from backend.core.embedder import SemanticEmbedder
+from backend.core.skill_index import SkillBitsetIndex, SkillRegistry
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "candidates")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "resumes")
 
+# Optional candidate shards for scatter-gather search (e.g. one per region or business
+# unit): a JSON list of {"name", "uri", "db", "collection", "max_pool_size"}. Missing
+# keys fall back to the settings above. Empty means single-collection search.
+SEARCH_SHARDS = os.getenv("SEARCH_SHARDS", "")
+
 client = MongoClient(MONGO_URI)
 db = client[DB_NAME]
 collection = db[COLLECTION_NAME]
 
+
+def _load_shards() -> Dict[str, Collection]:
+    if not SEARCH_SHARDS.strip():
+        return {}
+    shards = {}
+    for spec in json.loads(SEARCH_SHARDS):
+        # One client (and so one connection pool) per shard, so a slow cluster cannot
+        # exhaust the connections the other shards need.
+        shard_client = MongoClient(spec.get("uri", MONGO_URI), maxPoolSize=spec.get("max_pool_size", 50))
+        name = spec.get("name") or f"shard{len(shards)}"
+        shards[name] = shard_client[spec.get("db", DB_NAME)][spec.get("collection", COLLECTION_NAME)]
+    return shards
+
+
+shard_collections = _load_shards()
+
+
 def get_mongo_collection() -> Collection:
-    return collection
\ No newline at end of file
+    return collection
+
+
+def get_shard_collections() -> Dict[str, Collection]:
+    return shard_collections
+
+
+@lru_cache(maxsize=1)
+def get_skill_index() -> SkillBitsetIndex:
+    """
+    Process-wide skill bitset index, shared by ranking and snapshot search. The corpus
+    is loaded here, when the routers are built at startup, so no request pays for the
+    full load (or waits on the index lock while it runs); requests only apply deltas.
+    """
+    index = SkillBitsetIndex(collection)
+    try:
+        index.sync(full=True)
+    except Exception as e:
+        # Mongo not reachable yet: the first maybe_sync() retries.
+        print(f"SkillBitsetIndex initial load failed, will retry on first use: {e}")
+    return index
+
+
+@lru_cache(maxsize=1)
+def get_skill_registry() -> SkillRegistry:
+    return SkillRegistry(db)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> SemanticEmbedder:
+    """Process-wide embedder, loaded on first use rather than at import."""
+    return SemanticEmbedder()
@@ -1,7 +1,12 @@
 from fastapi import FastAPI
+from backend import config
 from backend.api.routes import all_routers
 
 app = FastAPI()
 
+if config.PROFILING_ENABLED:
+    from backend.core.profiling import install_fastapi_profiler
+    install_fastapi_profiler(app)
+
 for router in all_routers:
     app.include_router(router, prefix="/api")
@@ -1,9 +1,12 @@
 import os
 import pymongo
+from pymongo import UpdateOne
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+from backend.core.bulk_importer import build_candidate_summary
 from backend.core.embedder import SemanticEmbedder
+from backend.core.skill_index import SkillRegistry
 
 load_dotenv()
 
@@ -16,37 +19,36 @@ client = pymongo.MongoClient(MONGO_URI)
 db = client[DB_NAME]
 collection = db[COLLECTION_NAME]
 
-embedder = SemanticEmbedder()
 
-
-def build_candidate_summary(candidate: dict) -> str:
-    name = candidate.get("name", "A candidate")
-    experience = candidate.get("experience", 0)
-    experience_str = f"{experience}+ years of experience" if experience else "some experience"
-
-    skills = candidate.get("skills", [])
-    skills_str = ", ".join(skills) if skills else "various skills"
-
-    qualifications = candidate.get("qualifications", [])
-    qualifications_str = ", ".join(qualifications) if qualifications else "relevant qualifications"
-
-    return f"{name} with {experience_str}, skilled in {skills_str}, and holding {qualifications_str}."
+BATCH_SIZE = int(os.getenv("PROCESS_BATCH_SIZE", "256"))
 
 
 def update_candidates_with_summaries_and_vectors():
-    candidates = list(collection.find({}))
-
-    for candidate in tqdm(candidates, desc="Processing candidates"):
-        summary = build_candidate_summary(candidate)
-        embedding = embedder.encode(summary)
-
-        collection.update_one(
-            {"_id": candidate["_id"]},
-            {"$set": {
-                "summary": summary,
-                "vector": embedding
-            }}
-        )
+    # Built here, not at import: with EMBEDDER_BACKEND=pool the spawned workers re-import
+    # this script, and a module-level embedder would make each of them start its own pool.
+    embedder = SemanticEmbedder()
+    skill_registry = SkillRegistry(db)
+    candidates = list(collection.find({}, {"name": 1, "experience": 1, "skills": 1, "qualifications": 1}))
+
+    # Summaries are embedded in batches (EMBEDDER_BACKEND=pool spreads each batch across
+    # worker processes) and written back with one bulk_write per batch, together with
+    # the skill codes/bitset the ranker's SkillBitsetIndex picks up on its next sync.
+    for start in tqdm(range(0, len(candidates), BATCH_SIZE), desc="Processing candidates"):
+        batch = candidates[start:start + BATCH_SIZE]
+        summaries = [build_candidate_summary(candidate) for candidate in batch]
+        embeddings = embedder.encode_batch(summaries)
+
+        collection.bulk_write([
+            UpdateOne(
+                {"_id": candidate["_id"]},
+                {"$set": {
+                    "summary": summary,
+                    "vector": embedding,
+                    **skill_registry.skill_fields(candidate.get("skills", [])),
+                }}
+            )
+            for candidate, summary, embedding in zip(batch, summaries, embeddings)
+        ], ordered=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+"""
+Benchmark: embedding throughput of the process-pool engine from 1 to N workers,
+against in-process encoding (EMBEDDER_BACKEND=torch).
+
+Usage:
+    python -m scripts.bench_embedding_pool --texts 4000 --max-workers 8 --threads-per-worker 1
+"""
+import argparse
+import os
+import random
+import time
+
+from backend.core.embedding_pool import EmbeddingPool
+
+WORDS = ("python kubernetes data engineer backend frontend react pipelines spark aws docker "
+         "machine learning experience years leadership startup platform scalable systems").split()
+
+
+def make_texts(n: int, rng: random.Random) -> list[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=4000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts, random.Random(7))
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer("all-MiniLM-L6-v2")
+    model.encode(texts[:64])  # warm up
+    start = time.perf_counter()
+    model.encode(texts, batch_size=args.chunk_size)
+    baseline = args.texts / (time.perf_counter() - start)
+    print(f"in-process (torch threads={torch.get_num_threads()}): {baseline:8.1f} texts/s")
+
+    print(f"\n{'workers':>7} {'texts/s':>9} {'vs 1 worker':>12} {'vs in-process':>14}")
+    single = None
+    workers = 1
+    while workers <= args.max_workers:
+        pool = EmbeddingPool(workers=workers, threads_per_worker=args.threads_per_worker, chunk_size=args.chunk_size)
+        try:
+            pool.encode_batch(texts[:workers * args.chunk_size])  # warm up every worker
+            start = time.perf_counter()
+            pool.encode_batch(texts)
+            throughput = args.texts / (time.perf_counter() - start)
+        finally:
+            pool.close()
+        single = single or throughput
+        print(f"{workers:>7} {throughput:>9.1f} {throughput / single:>11.2f}x {throughput / baseline:>13.2f}x")
+        workers = workers * 2 if workers * 2 <= args.max_workers or workers == args.max_workers else args.max_workers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: vector-only vs hybrid (BM25 + vector, RRF) retrieval on a synthetic corpus.
+
+Relevance is "candidate lists every skill named in the query", which is exactly the
+case where MiniLM embeddings tend to blur rare skill tokens. Reports recall@k and
+per-query latency for each mode, plus the latency overhead of hybrid over vector.
+
+Usage:
+    python -m scripts.bench_hybrid --candidates 5000 --queries 200 --top-k 50
+"""
+import argparse
+import random
+import statistics
+import time
+
+from backend.core.embedder import SemanticEmbedder
+from backend.core.lexical import BM25Index, reciprocal_rank_fusion
+from backend.core.local_index import LocalVectorIndex
+
+SKILLS = [
+    "Python", "Java", "SQL", "AWS", "Docker", "Kubernetes", "PySpark", "Terraform",
+    "React", "TypeScript", "Go", "Rust", "Kafka", "Airflow", "TensorFlow", "PyTorch",
+    "GraphQL", "Node.js", "C++", "Scala", "Snowflake", "dbt", "Redis", "Elasticsearch",
+]
+TITLES = ["Data Engineer", "Backend Developer", "ML Engineer", "Platform Engineer", "Frontend Developer"]
+
+
+def make_corpus(n: int, rng: random.Random) -> list[dict]:
+    corpus = []
+    for i in range(n):
+        skills = rng.sample(SKILLS, rng.randint(2, 6))
+        title = rng.choice(TITLES)
+        summary = f"{title} with {rng.randint(1, 12)} years of experience, skilled in {', '.join(skills)}."
+        corpus.append({"_id": i, "skills": skills, "summary": summary})
+    return corpus
+
+
+def recall(results: list[dict], relevant: set, k: int) -> float:
+    if not relevant:
+        return 1.0
+    hits = sum(1 for doc in results[:k] if doc["_id"] in relevant)
+    return hits / min(len(relevant), k)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--lexical-weight", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = make_corpus(args.candidates, rng)
+    embedder = SemanticEmbedder()
+
+    print(f"Embedding {len(corpus)} candidate summaries...")
+    vectors = embedder.encode_batch([c["summary"] for c in corpus])
+    vector_index = LocalVectorIndex([c["_id"] for c in corpus], vectors)
+    lexical_index = BM25Index.from_documents(corpus)
+
+    stats = {mode: {"recall": [], "ms": []} for mode in ("vector", "lexical", "hybrid")}
+    for _ in range(args.queries):
+        query_skills = rng.sample(SKILLS, rng.randint(1, 2))
+        relevant = {c["_id"] for c in corpus if set(query_skills) <= set(c["skills"])}
+        query_text = " ".join(query_skills)
+        embedding, embed_ms = timed(embedder.encode, f"Seeking a candidate with skills in {', '.join(query_skills)}.")
+
+        vector_hits, vector_ms = timed(vector_index.search, embedding, args.top_k * 2)
+        lexical_hits, lexical_ms = timed(lexical_index.search, query_text, args.top_k * 2)
+        fused, fuse_ms = timed(
+            reciprocal_rank_fusion,
+            {"vector": vector_hits, "lexical": lexical_hits},
+            {"vector": 1 - args.lexical_weight, "lexical": args.lexical_weight},
+            top_k=args.top_k,
+        )
+
+        stats["vector"]["recall"].append(recall(vector_hits, relevant, args.top_k))
+        stats["vector"]["ms"].append(vector_ms)
+        stats["lexical"]["recall"].append(recall(lexical_hits, relevant, args.top_k))
+        stats["lexical"]["ms"].append(lexical_ms)
+        stats["hybrid"]["recall"].append(recall(fused, relevant, args.top_k))
+        # On Atlas both legs run concurrently, so hybrid latency is max(legs) + fusion.
+        stats["hybrid"]["ms"].append(max(vector_ms, lexical_ms) + fuse_ms)
+
+    print(f"\n{'mode':<8} {'recall@' + str(args.top_k):>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, values in stats.items():
+        ms = sorted(values["ms"])
+        p95 = ms[int(0.95 * (len(ms) - 1))]
+        print(f"{mode:<8} {statistics.mean(values['recall']):>10.3f} {statistics.median(ms):>8.2f} {p95:>8.2f}")
+
+    overhead = statistics.median(stats["hybrid"]["ms"]) - statistics.median(stats["vector"]["ms"])
+    print(f"\nHybrid latency overhead vs vector (p50): {overhead:+.2f} ms (query embedding excluded)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Report: fp32 vs quantized MiniLM backends (EMBEDDER_QUANTIZATION).
+
+For each backend this measures encode throughput (single query and batched), the
+resident memory added by loading the model, the cosine agreement with fp32 on the
+probe sentences and on a synthetic candidate corpus, and the effect on search:
+recall@k of each backend's brute-force top-k against the fp32 top-k.
+
+Usage:
+    python -m scripts.bench_quantized_embedder --corpus 5000 --queries 200 --top-k 10 100
+    python -m scripts.bench_quantized_embedder --backends none int8 onnx-int8
+"""
+import argparse
+import gc
+import random
+import time
+
+import numpy as np
+
+from backend.core.embedder import PROBE_SENTENCES, cosine_agreement, load_sentence_model
+
+SKILLS = ("Python Java Go Rust TypeScript React Angular Kubernetes Docker AWS GCP Azure Spark PySpark "
+          "Kafka PostgreSQL MongoDB Redis TensorFlow PyTorch Terraform Airflow Django FastAPI Spring").split()
+TITLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "ML Engineer", "DevOps Engineer",
+          "Full Stack Developer", "Data Engineer", "Platform Engineer", "QA Engineer", "Engineering Manager"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "B.Tech", "MBA", "PhD Machine Learning", ""]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def make_summaries(n: int, rng: random.Random) -> list[str]:
+    return [
+        f"{rng.choice(TITLES)} with {rng.randint(0, 15)} years of experience. "
+        f"Skills: {', '.join(rng.sample(SKILLS, rng.randint(3, 8)))}. {rng.choice(DEGREES)}"
+        for _ in range(n)
+    ]
+
+
+def make_queries(n: int, rng: random.Random) -> list[str]:
+    return [
+        f"Seeking a candidate with skills in {', '.join(rng.sample(SKILLS, rng.randint(2, 5)))}; "
+        f"experience of {rng.randint(1, 10)}."
+        for _ in range(n)
+    ]
+
+
+def top_k(queries: np.ndarray, corpus: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ corpus.T
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["none", "int8", "onnx", "onnx-int8"])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--corpus", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    corpus_texts = make_summaries(args.corpus, rng)
+    query_texts = make_queries(args.queries, rng)
+
+    reference = load_sentence_model(args.model, "none")
+    ref_corpus = reference.encode(corpus_texts, batch_size=args.batch_size, normalize_embeddings=True)
+    ref_queries = reference.encode(query_texts, normalize_embeddings=True)
+    ref_top = {k: top_k(ref_queries, ref_corpus, k) for k in args.top_k}
+
+    rows = []
+    for backend in args.backends:
+        gc.collect()
+        before = rss_mb()
+        try:
+            model = reference if backend == "none" else load_sentence_model(args.model, backend)
+        except Exception as e:
+            print(f"{backend}: unavailable ({e})")
+            continue
+        added_mb = rss_mb() - before if backend != "none" else None
+
+        model.encode(query_texts[:16])  # warm up
+        start = time.perf_counter()
+        for text in query_texts:
+            model.encode(text)
+        single_ms = (time.perf_counter() - start) * 1000 / len(query_texts)
+        start = time.perf_counter()
+        corpus = model.encode(corpus_texts, batch_size=args.batch_size, normalize_embeddings=True)
+        batch_tps = len(corpus_texts) / (time.perf_counter() - start)
+        queries = model.encode(query_texts, normalize_embeddings=True)
+
+        corpus_cos = np.sum(corpus * ref_corpus, axis=1)
+        recalls = {}
+        for k in args.top_k:
+            found = top_k(queries, corpus, k)
+            recalls[k] = np.mean([len(set(a) & set(b)) / k for a, b in zip(found, ref_top[k])])
+        rows.append({
+            "backend": backend,
+            "single_ms": single_ms,
+            "batch_tps": batch_tps,
+            "added_mb": added_mb,
+            "probe_min_cos": cosine_agreement(model, reference, PROBE_SENTENCES),
+            "corpus_min_cos": float(corpus_cos.min()),
+            "corpus_mean_cos": float(corpus_cos.mean()),
+            "recall": recalls,
+        })
+        if model is not reference:
+            del model
+
+    base = next((r for r in rows if r["backend"] == "none"), rows[0] if rows else None)
+    if base is None:
+        return
+    header = f"{'backend':>10} {'query ms':>9} {'speedup':>8} {'batch/s':>9} {'speedup':>8} {'+RSS MB':>8} " \
+             f"{'probe cos':>10} {'min cos':>8} {'mean cos':>9}"
+    header += "".join(f" {'R@' + str(k):>7}" for k in args.top_k)
+    print(header)
+    for r in rows:
+        added = f"{r['added_mb']:.0f}" if r["added_mb"] is not None else "-"
+        line = (f"{r['backend']:>10} {r['single_ms']:>9.2f} {base['single_ms'] / r['single_ms']:>7.2f}x "
+                f"{r['batch_tps']:>9.1f} {r['batch_tps'] / base['batch_tps']:>7.2f}x {added:>8} "
+                f"{r['probe_min_cos']:>10.4f} {r['corpus_min_cos']:>8.4f} {r['corpus_mean_cos']:>9.4f}")
+        line += "".join(f" {r['recall'][k]:>7.3f}" for k in args.top_k)
+        print(line)
+    print("\n+RSS MB is resident memory added by loading the backend next to the fp32 model; "
+          "R@k is overlap with the fp32 top-k.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Bulk-load candidates from a JSONL or CSV file (same pipeline as POST /api/candidates/bulk-import).
+
+The file is read line by line; records are validated, summarized, embedded in
+batches of --batch-size and inserted with unordered insert_many. Progress is printed
+per batch and rejected rows are written to --errors as NDJSON.
+
+CSV files need a header row; list columns (skills, qualifications) use ";" or ","
+between values.
+
+Usage:
+    python -m scripts.bulk_import candidates.jsonl
+    python -m scripts.bulk_import candidates.csv --batch-size 512 --errors import_errors.ndjson
+"""
+import argparse
+import json
+import os
+
+from backend import config
+from backend.core.bulk_importer import BulkImporter
+from backend.core.embedder import SemanticEmbedder
+from backend.core.skill_index import SkillRegistry
+from backend.dependencies import db, get_mongo_collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=config.IMPORT_BATCH_SIZE)
+    parser.add_argument("--errors", default=None, help="write per-row errors to this NDJSON file")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if os.path.splitext(args.path)[1].lower() == ".csv" else "jsonl")
+    importer = BulkImporter(get_mongo_collection(), SemanticEmbedder(), SkillRegistry(db), batch_size=args.batch_size)
+
+    errors = open(args.errors, "w", encoding="utf-8") if args.errors else None
+    try:
+        with open(args.path, encoding="utf-8", newline="") as f:
+            for event in importer.run(f, fmt):
+                if event["event"] == "error":
+                    if errors:
+                        errors.write(json.dumps(event) + "\n")
+                    continue
+                print(f"{event['event']:>8}: {event['rows']} rows, {event['inserted']} inserted, "
+                      f"{event['failed']} failed ({event['rows_per_s']} rows/s)")
+    finally:
+        if errors:
+            errors.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Columnar export/import of the candidate collection (Parquet fields + .npy vectors).
+
+export writes manifest.json, part-NNNNN.parquet chunks and one <field>.npy per
+vector field into a directory, streaming --chunk-size documents at a time. import
+loads such a directory into a collection with unordered insert_many batches (or
+ReplaceOne upserts with --upsert), e.g. to seed a test environment.
+
+Offline tools read exports directly through backend.core.columnar (read_vectors,
+iter_chunks, load_local_index) instead of scanning Mongo.
+
+Usage:
+    python -m scripts.columnar_snapshot export data/exports/resumes --vector-fields embedding vector
+    python -m scripts.columnar_snapshot import data/exports/resumes --collection resumes_test --upsert
+"""
+import argparse
+import time
+
+from backend import config
+from backend.core.columnar import export_collection, import_collection
+from backend.dependencies import db, get_mongo_collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="collection -> export directory")
+    export.add_argument("out_dir")
+    export.add_argument("--vector-fields", nargs="+", default=[config.VECTOR_PATH])
+    export.add_argument("--dim", type=int, default=config.EMBEDDING_DIM)
+    export.add_argument("--chunk-size", type=int, default=10000)
+
+    imp = sub.add_parser("import", help="export directory -> collection")
+    imp.add_argument("export_dir")
+    imp.add_argument("--batch-size", type=int, default=1000)
+    imp.add_argument("--upsert", action="store_true", help="replace documents with the same _id instead of failing")
+
+    for p in (export, imp):
+        p.add_argument("--collection", default=None, help="collection name in DB_NAME (default COLLECTION_NAME)")
+    args = parser.parse_args()
+
+    collection = db[args.collection] if args.collection else get_mongo_collection()
+    start = time.perf_counter()
+    if args.command == "export":
+        manifest = export_collection(collection, args.out_dir, args.vector_fields, args.dim, args.chunk_size)
+        print(f"Exported {manifest['count']} candidates from {manifest['collection']} "
+              f"in {len(manifest['chunks'])} chunks ({time.perf_counter() - start:.1f}s)")
+    else:
+        stats = import_collection(collection, args.export_dir, args.batch_size, args.upsert)
+        print(f"Imported {stats['written']} candidates into {collection.full_name}, "
+              f"{stats['errors']} errors ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
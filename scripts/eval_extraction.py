@@ -0,0 +1,95 @@
+"""
+Offline evaluation of the tiered job extractor against the LLM extractor.
+
+Input is JSONL with a "text" field and, optionally, gold "skills", "experience" and
+"qualifications". When gold labels are missing the LLM output is used as reference.
+Skills/qualifications are compared as canonical taxonomy ids.
+
+Usage:
+    python -m scripts.eval_extraction --input data/labeled_jds.jsonl [--threshold 0.7]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from backend.core.extractor import SemanticJobExtractor, TieredJobExtractor
+from backend.core.llm_clients.gemini_client import GeminiClient
+from backend.core.taxonomy import get_taxonomy
+
+
+def f1(predicted: set, gold: set) -> float:
+    if not predicted and not gold:
+        return 1.0
+    if not predicted or not gold:
+        return 0.0
+    tp = len(predicted & gold)
+    precision, recall = tp / len(predicted), tp / len(gold)
+    return 0.0 if tp == 0 else 2 * precision * recall / (precision + recall)
+
+
+def score(fields: dict, reference: dict) -> dict:
+    taxonomy = get_taxonomy()
+    return {
+        "skills_f1": f1(
+            set(taxonomy.canonicalize(fields.get("skills", []), "skills")),
+            set(taxonomy.canonicalize(reference.get("skills", []), "skills")),
+        ),
+        "qualifications_f1": f1(
+            set(taxonomy.canonicalize(fields.get("qualifications", []), "qualifications")),
+            set(taxonomy.canonicalize(reference.get("qualifications", []), "qualifications")),
+        ),
+        "experience_match": float((fields.get("experience") or 0) == (reference.get("experience") or 0)),
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="data/labeled_jds.jsonl")
+    parser.add_argument("--threshold", type=float, default=None, help="override EXTRACTION_CONFIDENCE_THRESHOLD")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    llm_client = GeminiClient()
+    llm = SemanticJobExtractor(llm_client=llm_client)
+    tiered = TieredJobExtractor(llm_client=llm_client, embedder=llm.embedder)
+    if args.threshold is not None:
+        tiered.confidence_threshold = args.threshold
+
+    metrics = {"tiered": [], "llm": []}
+    latency = {"tiered": [], "llm": []}
+    for i, row in enumerate(rows):
+        llm_fields, llm_ms = timed(llm.extract_fields, row["text"])
+        tiered_fields, tiered_ms = timed(tiered.extract_fields, row["text"])
+        reference = row if "skills" in row else llm_fields
+
+        metrics["llm"].append(score(llm_fields, reference))
+        metrics["tiered"].append(score(tiered_fields, reference))
+        latency["llm"].append(llm_ms)
+        latency["tiered"].append(tiered_ms)
+        print(f"[{i}] path={tiered_fields['extraction_path']:<14} confidence={tiered_fields['extraction_confidence']:.2f} "
+              f"tiered_skills_f1={metrics['tiered'][-1]['skills_f1']:.2f} llm_skills_f1={metrics['llm'][-1]['skills_f1']:.2f}")
+
+    print(f"\n{'extractor':<10} {'skills_f1':>10} {'quals_f1':>9} {'exp_acc':>8} {'p50 ms':>8}")
+    for name in ("llm", "tiered"):
+        rows_metrics = metrics[name]
+        print(f"{name:<10} "
+              f"{statistics.mean(m['skills_f1'] for m in rows_metrics):>10.3f} "
+              f"{statistics.mean(m['qualifications_f1'] for m in rows_metrics):>9.3f} "
+              f"{statistics.mean(m['experience_match'] for m in rows_metrics):>8.3f} "
+              f"{statistics.median(latency[name]):>8.1f}")
+
+    rates = tiered.hit_rates()
+    print(f"\nLLM calls skipped: {rates['local_rate']:.1%} ({rates['counts']})")
+
+
+if __name__ == "__main__":
+    main()
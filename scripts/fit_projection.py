@@ -0,0 +1,98 @@
+"""
+Fit the low-dimension first-pass projection for LocalVectorIndex and report the
+recall/latency trade-off of two-tier search.
+
+Loads every candidate vector, fits each --kinds x --dims projection on a sample,
+and for each --oversample factor measures recall@k of the two-tier search against
+exact brute-force top-k, plus p50 query latency and memory per vector. Queries are
+corpus vectors perturbed with Gaussian noise. The projection selected by --kind and
+--dim is written to --out (PROJECTION_PATH), where LocalVectorIndex users load it.
+--from-export reads the vectors from a columnar export instead of Mongo.
+
+Usage:
+    python -m scripts.fit_projection --kinds pca truncate binary --dims 32 64 128 --top-k 10 100
+    python -m scripts.fit_projection --kind pca --dim 64 --out data/projection.npz
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from backend import config
+from backend.core.columnar import load_local_index
+from backend.core.local_index import LocalVectorIndex
+from backend.core.projection import VectorProjection
+from backend.dependencies import get_mongo_collection
+
+
+def evaluate(index: LocalVectorIndex, queries: np.ndarray, truth: list, top_k: int) -> tuple[float, float]:
+    recalls, latencies = [], []
+    for query, gold in zip(queries, truth):
+        start = time.perf_counter()
+        hits = index.search(query, top_k=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(gold.intersection(h["_id"] for h in hits)) / len(gold))
+    return statistics.mean(recalls), statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", default=list(VectorProjection.KINDS))
+    parser.add_argument("--dims", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--oversample", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.05, help="std of noise added to the query vectors")
+    parser.add_argument("--fit-sample", type=int, default=50000, help="max vectors used to fit PCA")
+    parser.add_argument("--kind", default="pca", help="projection to save")
+    parser.add_argument("--dim", type=int, default=128, help="dimension of the saved projection")
+    parser.add_argument("--out", default=config.PROJECTION_PATH)
+    parser.add_argument("--from-export", default=None, help="columnar export directory (scripts/columnar_snapshot.py)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print("Loading candidate vectors...")
+    if args.from_export:
+        index = load_local_index(args.from_export)
+    else:
+        index = LocalVectorIndex.from_collection(get_mongo_collection())
+    if not len(index):
+        raise SystemExit(f"No candidates with a '{config.VECTOR_PATH}' vector found.")
+    sample = index.vectors[rng.choice(len(index), size=min(args.fit_sample, len(index)), replace=False)]
+
+    rows = rng.choice(len(index), size=min(args.queries, len(index)), replace=False)
+    queries = index.vectors[rows] + rng.normal(0, args.noise, size=index.vectors[rows].shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ index.vectors.T
+    truth = {
+        k: [{index.ids[i] for i in row[:min(k, len(index))]} for row in np.argsort(-scores, axis=1)]
+        for k in args.top_k
+    }
+    print(f"{len(index)} candidates, {len(queries)} queries\n")
+
+    exact = {k: evaluate(index, queries, truth[k], k)[1] for k in args.top_k}
+    full_bytes = index.vectors.shape[1] * 4
+    print(f"{'kind':>8} {'dim':>4} {'bytes/vec':>9} {'top_k':>5} {'oversample':>10} {'recall@k':>9} {'p50 ms':>8} {'speedup':>8}")
+    for k in args.top_k:
+        print(f"{'exact':>8} {index.vectors.shape[1]:>4} {full_bytes:>9} {k:>5} {'-':>10} {1.0:>9.3f} {exact[k]:>8.2f} {1.0:>7.2f}x")
+
+    for kind in args.kinds:
+        dims = [index.vectors.shape[1]] if kind == "binary" else args.dims
+        for dim in dims:
+            index.set_projection(VectorProjection.fit(sample, kind, dim))
+            width = index.reduced.shape[1] * index.reduced.itemsize
+            for k in args.top_k:
+                for oversample in args.oversample:
+                    index.oversample = oversample
+                    recall, p50 = evaluate(index, queries, truth[k], k)
+                    print(f"{kind:>8} {dim:>4} {width:>9} {k:>5} {oversample:>10} {recall:>9.3f} {p50:>8.2f} {exact[k] / p50:>7.2f}x")
+
+    projection = VectorProjection.fit(sample, args.kind, args.dim)
+    projection.save(args.out)
+    print(f"\nSaved {args.kind} projection (dim {projection.dim}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
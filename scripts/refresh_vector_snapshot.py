@@ -0,0 +1,74 @@
+"""
+Refresh job for the shared vector snapshot (VECTOR_BACKEND=snapshot).
+
+Streams every candidate vector plus its filter fields out of Mongo into a new
+snapshot file in SNAPSHOT_DIR, then publishes it by atomically replacing the
+CURRENT pointer. Running workers map the new file within SNAPSHOT_CHECK_INTERVAL.
+Run it from cron or after bulk imports; --loop keeps it running.
+
+Usage:
+    python -m scripts.refresh_vector_snapshot
+    python -m scripts.refresh_vector_snapshot --loop 600 --keep 3
+"""
+import argparse
+import datetime
+import os
+import time
+import uuid
+
+import numpy as np
+
+from backend import config
+from backend.core.vector_snapshot import METADATA_FIELDS, VectorSnapshot, publish_snapshot, write_snapshot
+from backend.dependencies import get_mongo_collection
+
+
+def iter_batches(collection, batch_size: int):
+    projection = {config.VECTOR_PATH: 1, **{field: 1 for field in METADATA_FIELDS}}
+    ids, vectors, metadata = [], [], []
+    cursor = collection.find({config.VECTOR_PATH: {"$exists": True}}, projection, batch_size=batch_size)
+    for doc in cursor:
+        vector = doc[config.VECTOR_PATH]
+        if len(vector) != config.EMBEDDING_DIM:
+            print(f"Skipping {doc['_id']}: vector has {len(vector)} dimensions")
+            continue
+        ids.append(doc["_id"])
+        vectors.append(vector)
+        metadata.append(doc)
+        if len(ids) == batch_size:
+            yield ids, np.array(vectors, dtype=np.float32), metadata
+            ids, vectors, metadata = [], [], []
+    if ids:
+        yield ids, np.array(vectors, dtype=np.float32), metadata
+
+
+def refresh(args) -> None:
+    os.makedirs(args.snapshot_dir, exist_ok=True)
+    # Unique even for refreshes within the same second; names still sort by creation time.
+    filename = f"candidates-{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.snap"
+    path = os.path.join(args.snapshot_dir, filename)
+    start = time.perf_counter()
+    count = write_snapshot(path, iter_batches(get_mongo_collection(), args.batch_size))
+    VectorSnapshot(path)  # refuse to publish a file that does not read back
+    publish_snapshot(args.snapshot_dir, filename, keep=args.keep)
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"Published {filename}: {count} vectors, {size_mb:.1f} MB in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot-dir", default=config.SNAPSHOT_DIR)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--keep", type=int, default=2, help="snapshot files to keep, including the new one")
+    parser.add_argument("--loop", type=float, default=0, help="refresh every N seconds instead of once")
+    args = parser.parse_args()
+
+    while True:
+        refresh(args)
+        if not args.loop:
+            break
+        time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    main()
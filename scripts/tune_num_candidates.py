@@ -0,0 +1,131 @@
+"""
+Auto-tuner for $vectorSearch numCandidates.
+
+Computes exact top-k ground truth (brute-force cosine over every candidate vector) for
+a sample of queries, then sweeps numCandidates against Atlas and records recall@k and
+latency for each top_k. The result is written as the policy table CandidateSearcher
+loads at runtime (NUM_CANDIDATES_POLICY_PATH), where TARGET_RECALL picks the value.
+
+Queries are real job descriptions from --queries-file (JSONL with a "text" field) and/or
+synthetic ones: randomly sampled corpus vectors perturbed with Gaussian noise.
+
+Usage:
+    python -m scripts.tune_num_candidates --synthetic 200 --top-k 10 50 100 500 1000
+"""
+import argparse
+import datetime
+import json
+import statistics
+import time
+
+import numpy as np
+
+from backend import config
+from backend.core.columnar import load_local_index
+from backend.core.local_index import LocalVectorIndex
+from backend.core.searcher import CandidateSearcher
+from backend.dependencies import get_mongo_collection
+
+MULTIPLIERS = [1, 1.5, 2, 3, 5, 8, 12, 20, 35, 60, 100]
+
+
+def load_queries(args, index: LocalVectorIndex, rng: np.random.Generator) -> np.ndarray:
+    queries = []
+    if args.queries_file:
+        from backend.core.embedder import SemanticEmbedder
+        with open(args.queries_file, encoding="utf-8") as f:
+            texts = [json.loads(line)["text"] for line in f if line.strip()]
+        queries.extend(SemanticEmbedder().encode_batch(texts))
+    if args.synthetic:
+        rows = rng.choice(len(index), size=min(args.synthetic, len(index)), replace=False)
+        noisy = index.vectors[rows] + rng.normal(0, args.noise, size=index.vectors[rows].shape).astype(np.float32)
+        queries.extend(noisy)
+    queries = np.asarray(queries, dtype=np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def ann_ids(searcher: CandidateSearcher, query: np.ndarray, top_k: int, num_candidates: int) -> tuple[list, float]:
+    pipeline = [
+        {"$vectorSearch": {
+            "index": searcher.index_name,
+            "queryVector": query.tolist(),
+            "path": searcher.vector_path,
+            "numCandidates": num_candidates,
+            "limit": top_k,
+        }},
+        {"$project": {"_id": 1}},
+    ]
+    start = time.perf_counter()
+    ids = [doc["_id"] for doc in searcher.collection.aggregate(pipeline)]
+    return ids, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[10, 50, 100, 500, 1000])
+    parser.add_argument("--queries-file", default=None)
+    parser.add_argument("--synthetic", type=int, default=200, help="number of synthetic queries")
+    parser.add_argument("--noise", type=float, default=0.05, help="std of noise added to synthetic queries")
+    parser.add_argument("--out", default=config.NUM_CANDIDATES_POLICY_PATH)
+    parser.add_argument("--from-export", default=None, help="read ground-truth vectors from a columnar export")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    collection = get_mongo_collection()
+    searcher = CandidateSearcher(collection)
+
+    print("Loading candidate vectors for exact ground truth...")
+    if args.from_export:
+        index = load_local_index(args.from_export)
+    else:
+        index = LocalVectorIndex.from_collection(collection)
+    if not len(index):
+        raise SystemExit(f"No candidates with a '{config.VECTOR_PATH}' vector found.")
+    queries = load_queries(args, index, rng)
+    print(f"{len(index)} candidates, {len(queries)} queries")
+
+    max_k = min(max(args.top_k), len(index))
+    scores = queries @ index.vectors.T
+    truth = np.argsort(-scores, axis=1)[:, :max_k]
+
+    sweeps = {}
+    for top_k in args.top_k:
+        k = min(top_k, len(index))
+        expected = [{index.ids[i] for i in row[:k]} for row in truth]
+        values = sorted({min(int(top_k * m), config.NUM_CANDIDATES_MAX) for m in MULTIPLIERS if top_k * m >= top_k})
+        rows = []
+        print(f"\ntop_k={top_k}")
+        print(f"{'numCandidates':>14} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for num_candidates in values:
+            recalls, latencies = [], []
+            for query, gold in zip(queries, expected):
+                ids, ms = ann_ids(searcher, query, top_k, num_candidates)
+                recalls.append(len(gold.intersection(ids)) / len(gold))
+                latencies.append(ms)
+            latencies.sort()
+            row = {
+                "num_candidates": num_candidates,
+                "recall": round(statistics.mean(recalls), 4),
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+            }
+            rows.append(row)
+            print(f"{num_candidates:>14} {row['recall']:>9.4f} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f}")
+            if row["recall"] >= 0.999:
+                break  # larger values cannot improve recall further
+        sweeps[str(top_k)] = rows
+
+    policy = {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "corpus_size": len(index),
+        "queries": len(queries),
+        "sweeps": sweeps,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(policy, f, indent=2)
+    print(f"\nWrote numCandidates policy to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
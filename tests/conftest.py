@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# backend.* from the repository root; ResumeParsing uses flat imports from its own directory.
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "ResumeParsing")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """Circuit breakers are process-wide by name; give every test closed ones."""
+    from backend.core.llm_clients import structured
+    structured._breakers.clear()
+    yield
+    structured._breakers.clear()
@@ -0,0 +1,89 @@
+"""
+Stand-in for the Gemini text client used by BatchResumeAgent in tests. It answers batch prompts with a JSON array built from
+simple heuristics over each <resume> block, and can inject the failure modes the
+batch path has to handle (dropped items, invalid items, malformed or failed calls).
+"""
+import json
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+RESUME_BLOCK_RE = re.compile(r'<resume index="(\d+)">\n(.*?)\n</resume>', re.S)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+
+def fake_parse(text: str) -> Dict:
+    """Name from the first line, email by regex, skills from a "Skills:" line."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = EMAIL_RE.search(text)
+    skills = []
+    for line in lines:
+        if line.lower().startswith("skills:"):
+            skills = [s.strip() for s in re.split(r"[,;]", line.split(":", 1)[1]) if s.strip()]
+    return {
+        "id": "1",
+        "name": lines[0] if lines else "",
+        "title": lines[1] if len(lines) > 1 else "",
+        "company": "",
+        "summary": " ".join(lines[2:4]),
+        "skills": skills,
+        "location": "",
+        "email": email.group(0) if email else "",
+    }
+
+
+class FakeLLMClient:
+    """
+    generate(prompt) -> JSON text. Failure injection, matched by each resume's text:
+    - drop_when(text): leave the resume out of batch responses
+    - invalid_when(text): return it with a non-list "skills" (fails validation)
+    - fail_calls: the first N calls raise (transport error)
+    - malformed_calls: the next N calls return unparsable text
+    Prompts are recorded in self.prompts.
+    """
+
+    def __init__(
+        self,
+        parse: Callable[[str], Dict] = fake_parse,
+        drop_when: Optional[Callable[[str], bool]] = None,
+        invalid_when: Optional[Callable[[str], bool]] = None,
+        fail_calls: int = 0,
+        malformed_calls: int = 0,
+    ):
+        self.parse = parse
+        self.drop_when = drop_when
+        self.invalid_when = invalid_when
+        self.fail_calls = fail_calls
+        self.malformed_calls = malformed_calls
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+            if self.fail_calls > 0:
+                self.fail_calls -= 1
+                raise ConnectionError("fake transport failure")
+            if self.malformed_calls > 0:
+                self.malformed_calls -= 1
+                return "Sorry, I cannot help with that."
+
+        blocks = RESUME_BLOCK_RE.findall(prompt)
+        output = []
+        for index, text in blocks:
+            if self.drop_when and len(blocks) > 1 and self.drop_when(text):
+                continue
+            item = dict(self.parse(text), index=int(index))
+            if self.invalid_when and len(blocks) > 1 and self.invalid_when(text):
+                item["skills"] = "not a list"
+            output.append(item)
+        return json.dumps(output)
+
+    @property
+    def calls(self) -> int:
+        return len(self.prompts)
+
+
+def sample_resumes(texts: Iterable[str]) -> List[tuple]:
+    """(source, text) pairs with synthetic source names, for BatchResumeAgent.parseAll."""
+    return [(f"resume-{i}.txt", text) for i, text in enumerate(texts)]
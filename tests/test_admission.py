@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from backend.core.admission import AdaptiveConcurrencyLimiter, Deadline, DeadlineExceeded
+
+
+def test_deadline_counts_down_and_raises_per_stage():
+    deadline = Deadline(0.05)
+    assert 0 < deadline.remaining() <= 0.05
+    assert 1 <= deadline.remaining_ms() <= 50
+    deadline.check("extraction")
+
+    time.sleep(0.06)
+    assert deadline.expired()
+    assert deadline.remaining_ms() == 1  # never 0, which Mongo would read as "no limit"
+    with pytest.raises(DeadlineExceeded) as error:
+        deadline.check("vector search")
+    assert error.value.stage == "vector search"
+
+
+def test_limiter_rejects_over_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=4)
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release(0.1)
+    assert limiter.try_acquire()
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_fast_requests_grow_the_limit_additively_up_to_max():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=3, latency_target=1.0)
+    for _ in range(2):
+        limiter.try_acquire()
+        limiter.release(0.1)
+    assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+    for _ in range(20):
+        limiter.try_acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 3
+
+
+def test_slow_requests_back_off_and_drops_halve():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=2, max_limit=32, latency_target=1.0, backoff=0.9)
+    limiter.try_acquire()
+    limiter.release(5.0)
+    assert limiter.limit == pytest.approx(9.0)
+    limiter.try_acquire()
+    limiter.release(5.0, dropped=True)
+    assert limiter.limit == pytest.approx(4.5)
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release(5.0, dropped=True)
+    assert limiter.limit == 2
+    assert limiter.stats()["dropped"] == 6
+
+
+def test_retry_after_follows_latency():
+    limiter = AdaptiveConcurrencyLimiter()
+    assert limiter.retry_after() == 1
+    limiter.try_acquire()
+    limiter.release(3.2)
+    assert limiter.retry_after() == 4
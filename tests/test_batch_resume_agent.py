@@ -0,0 +1,118 @@
+import json
+import re
+
+from BatchResumeAgent import BatchResumeAgent, buildBatchPrompt, mapBatchOutput, packBatches
+from Promptvariable import BATCH_SYSTEM_PROMPT
+from backend.core.llm_clients.rate_limiter import estimate_tokens
+from fake_llm_client import FakeLLMClient, sample_resumes
+
+
+def resume(name, skills="Python, SQL"):
+    return f"{name}\nBackend Engineer\nBuilt services.\nSkills: {skills}\n{name.lower()}@example.com"
+
+
+def make_agent(client, **kwargs):
+    return BatchResumeAgent(client, concurrency=1, baseDelay=0, **kwargs)
+
+
+def test_pack_batches_respects_budget_and_max_resumes():
+    items = sample_resumes(["x" * 400] * 7)
+    base = estimate_tokens(BATCH_SYSTEM_PROMPT, expected_output=0)
+    budget = base + 3 * (estimate_tokens("x" * 400, expected_output=0) + 16)
+
+    assert packBatches(items, tokenBudget=budget, maxResumes=10) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert packBatches(items, tokenBudget=10 ** 6, maxResumes=2) == [[0, 1], [2, 3], [4, 5], [6]]
+
+
+def test_pack_batches_gives_oversized_resume_its_own_batch():
+    items = sample_resumes(["short", "x" * 100000, "short"])
+    assert packBatches(items, tokenBudget=2000, maxResumes=10) == [[0], [1], [2]]
+
+
+def test_map_batch_output_uses_index_field():
+    output = [{"index": 1, "name": "b"}, {"index": 0, "name": "a"}, {"index": 7, "name": "out of range"}]
+    assert mapBatchOutput(output, 2) == {0: {"name": "a"}, 1: {"name": "b"}}
+
+
+def test_map_batch_output_falls_back_to_position_only_for_complete_output():
+    assert mapBatchOutput([{"name": "a"}, {"name": "b"}], 2) == {0: {"name": "a"}, 1: {"name": "b"}}
+    assert mapBatchOutput([{"name": "a"}], 2) == {}
+
+
+def test_map_batch_output_keeps_first_duplicate_and_skips_non_objects():
+    output = ["junk", {"index": 0, "name": "first"}, {"index": 0, "name": "second"}]
+    assert mapBatchOutput(output, 3) == {0: {"name": "first"}}
+
+
+def test_build_batch_prompt_tags_each_resume():
+    prompt = buildBatchPrompt(["one", "two"])
+    assert prompt.startswith(BATCH_SYSTEM_PROMPT)
+    assert '<resume index="0">\none\n</resume>' in prompt
+    assert '<resume index="1">\ntwo\n</resume>' in prompt
+
+
+def test_parse_all_batches_resumes_in_input_order():
+    client = FakeLLMClient()
+    agent = make_agent(client, maxResumes=3)
+    results = agent.parseAll(sample_resumes([resume(n) for n in ("Ann", "Bob", "Cid", "Dee")]))
+
+    assert [r["resume"]["name"] for r in results] == ["Ann", "Bob", "Cid", "Dee"]
+    assert all(r["mode"] == "batch" for r in results)
+    assert results[1]["resume"]["skills"] == ["Python", "SQL"]
+    assert client.calls == 2
+    assert agent.stats == {"calls": 2, "batched": 4, "retried": 0, "failed": 0}
+
+
+def test_dropped_and_invalid_items_are_retried_individually():
+    client = FakeLLMClient(drop_when=lambda text: text.startswith("Bob"), invalid_when=lambda text: text.startswith("Cid"))
+    agent = make_agent(client)
+    results = agent.parseAll(sample_resumes([resume(n) for n in ("Ann", "Bob", "Cid")]))
+
+    assert [r["mode"] for r in results] == ["batch", "single", "single"]
+    assert [r["resume"]["name"] for r in results] == ["Ann", "Bob", "Cid"]
+    assert agent.stats == {"calls": 3, "batched": 1, "retried": 2, "failed": 0}
+    # Retries send only the affected resume.
+    assert [len(re.findall(r'<resume index="\d+">', p)) for p in client.prompts] == [3, 1, 1]
+
+
+def test_failed_batch_falls_back_to_single_calls():
+    client = FakeLLMClient(fail_calls=3)  # every attempt of the batch call
+    agent = make_agent(client)
+    results = agent.parseAll(sample_resumes([resume("Ann"), resume("Bob")]))
+
+    assert [r["mode"] for r in results] == ["single", "single"]
+    assert all("resume" in r for r in results)
+    assert agent.stats["retried"] == 2
+
+
+def test_single_retries_do_not_share_the_batch_circuit():
+    # Enough failing batches to open the batch breaker (5 consecutive failures).
+    client = FakeLLMClient(fail_calls=15)
+    agent = make_agent(client, maxResumes=1, tokenBudget=10 ** 6)
+    items = sample_resumes([resume(n) for n in ("Ann", "Bob", "Cid", "Dee", "Eve", "Fay")])
+    results = agent.parseAll(items)
+
+    assert agent.batchCaller.breaker.state == "open"
+    assert agent.singleCaller.breaker.state == "closed"
+    assert [r["mode"] for r in results] == ["single"] * 6
+    assert all("resume" in r for r in results)
+
+
+def test_unparseable_single_retry_is_reported_as_error():
+    client = FakeLLMClient(parse=lambda text: {"name": text.split()[0], "skills": "nope"} if text.startswith("Bob") else {"name": "ok"})
+    agent = make_agent(client)
+    results = agent.parseAll(sample_resumes([resume("Ann"), resume("Bob")]))
+
+    assert results[0]["resume"]["name"] == "ok"
+    assert results[1] == {"source": "resume-1.txt", "error": "could not parse resume", "mode": "single"}
+    assert agent.stats["failed"] == 1
+
+
+def test_malformed_batch_response_is_retried():
+    client = FakeLLMClient(malformed_calls=1)
+    agent = make_agent(client)
+    results = agent.parseAll(sample_resumes([resume("Ann"), resume("Bob")]))
+
+    assert [r["mode"] for r in results] == ["batch", "batch"]
+    assert client.calls == 2
+    assert json.loads(json.dumps(results))  # results are JSON-serializable
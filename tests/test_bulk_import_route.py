@@ -0,0 +1,120 @@
+import asyncio
+import importlib.util
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+
+from backend import config
+from backend.dependencies import get_embedder, get_mongo_collection, get_skill_registry
+from conftest import REPO_ROOT
+
+# Loaded by path: importing it as backend.api.routes.bulk_import would run the routes
+# package __init__, which loads the sentence model for the other routers.
+_spec = importlib.util.spec_from_file_location(
+    "bulk_import_route", os.path.join(REPO_ROOT, "backend", "api", "routes", "bulk_import.py")
+)
+bulk_import = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bulk_import)
+
+
+class FakeEmbedder:
+    def encode_batch(self, texts):
+        return [[0.0, 1.0] for _ in texts]
+
+
+class FakeInsertResult:
+    def __init__(self, ids):
+        self.inserted_ids = ids
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+
+    def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+        return FakeInsertResult(list(range(len(docs))))
+
+
+def make_app(collection):
+    app = FastAPI()
+    app.include_router(bulk_import.router, prefix="/api")
+    app.dependency_overrides[get_mongo_collection] = lambda: collection
+    app.dependency_overrides[get_embedder] = FakeEmbedder
+    app.dependency_overrides[get_skill_registry] = lambda: None
+    return app
+
+
+def post(app, body: bytes, chunk_size: int, spec_version: str, query: bytes = b"format=jsonl"):
+    """
+    Drives the app through raw ASGI messages: the body arrives in chunk_size pieces
+    and http.disconnect only once the response is complete, as from a real server.
+    """
+    async def run():
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+        messages = [
+            {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+            for i, chunk in enumerate(chunks)
+        ]
+        done = asyncio.Event()
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(0)  # let the response side run between chunks
+            if messages:
+                return messages.pop(0)
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                done.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": spec_version},
+            "http_version": "1.1", "method": "POST", "scheme": "http",
+            "path": "/api/candidates/bulk-import", "raw_path": b"/api/candidates/bulk-import",
+            "root_path": "", "query_string": query, "headers": [(b"content-type", b"application/x-ndjson")],
+            "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=10)
+        status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+        text = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body").decode()
+        return status, [json.loads(line) for line in text.splitlines()]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("spec_version", ["2.3", "2.4"])
+def test_multi_chunk_upload_imports_every_row(spec_version):
+    collection = FakeCollection()
+    body = "".join(json.dumps({"name": f"Candidate {i}", "skills": ["Python"], "experience": i % 7}) + "\n"
+                   for i in range(1000)).encode()
+    status, events = post(make_app(collection), body, chunk_size=97, spec_version=spec_version)
+
+    assert status == 200
+    assert [e for e in events if e["event"] == "error"] == []
+    assert events[-1]["event"] == "done"
+    assert events[-1]["rows"] == events[-1]["inserted"] == 1000
+    assert [doc["name"] for doc in collection.docs] == [f"Candidate {i}" for i in range(1000)]
+    # The slot was released: every permit is available again.
+    assert all(bulk_import.import_slots.acquire(blocking=False) for _ in range(config.IMPORT_MAX_CONCURRENT))
+    for _ in range(config.IMPORT_MAX_CONCURRENT):
+        bulk_import.import_slots.release()
+
+
+def test_line_limit_counts_encoded_bytes(monkeypatch):
+    monkeypatch.setattr(config, "IMPORT_MAX_LINE_BYTES", 40)
+    collection = FakeCollection()
+    wide = json.dumps({"name": "é" * 15}, ensure_ascii=False)  # 27 characters, 42 bytes
+    body = f'{{"name": "Ada"}}\n{wide}\n{{"name": "Bo"}}'.encode()
+    status, events = post(make_app(collection), body, chunk_size=7, spec_version="2.3")
+
+    assert status == 200
+    assert [e for e in events if e["event"] == "error"] == [
+        {"event": "error", "row": 2, "error": "line longer than 40 bytes"}
+    ]
+    assert [doc["name"] for doc in collection.docs] == ["Ada", "Bo"]
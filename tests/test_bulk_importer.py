@@ -0,0 +1,61 @@
+import pytest
+
+from backend import config
+from backend.core.bulk_importer import RecordParser, validate_record
+
+
+def feed_all(parser, lines):
+    parsed = [p for p in map(parser.feed, lines) if p is not None]
+    trailing = parser.finish()
+    return parsed + ([trailing] if trailing else [])
+
+
+def test_validate_record_normalizes_fields():
+    doc = validate_record({"name": " Ada ", "skills": "Python; AWS", "qualifications": ["BSc "], "experience": "4.0"})
+    assert doc == {"name": "Ada", "skills": ["Python", "AWS"], "qualifications": ["BSc"], "experience": 4}
+    assert validate_record({"name": "Bo", "skills": "Go, Rust"})["skills"] == ["Go", "Rust"]
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({}, "name is required"),
+    ({"name": "Ada", "experience": -1}, "experience must be >= 0"),
+    ({"name": "Ada", "experience": "lots"}, "experience must be a number"),
+    ({"name": "Ada", "experience": "nan"}, "experience must be a finite number"),
+    ({"name": "Ada", "experience": float("inf")}, "experience must be a finite number"),
+    ({"name": "Ada", "skills": [1]}, "skills must be a list of strings"),
+    ({"name": "Ada", "title": 3}, "title must be a string"),
+])
+def test_validate_record_rejects(raw, message):
+    with pytest.raises(ValueError, match=message):
+        validate_record(raw)
+
+
+def test_jsonl_rows_and_errors():
+    parsed = feed_all(RecordParser("jsonl"), ['{"name": "Ada"}\n', "\n", "{oops\n", '{"name": "Bo"}'])
+    assert parsed[0] == (1, {"name": "Ada"})
+    assert parsed[1][0] == 2 and parsed[1][1].startswith("invalid JSON")
+    assert parsed[2] == (3, {"name": "Bo"})
+
+
+def test_csv_multiline_quoted_field_and_column_count():
+    lines = ["name,summary\n", 'Ada,"line one\n', 'line two"\n', "Bo,x,extra\n", 'Cy,"never closed\n']
+    parsed = feed_all(RecordParser("csv"), lines)
+    assert parsed == [
+        (1, {"name": "Ada", "summary": "line one\nline two"}),
+        (2, "expected 2 columns, got 3"),
+        (3, "unterminated quoted field"),
+    ]
+
+
+def test_oversized_line_counts_as_one_row_and_resets_pending():
+    parser = RecordParser("csv")
+    parser.feed("name,summary\n")
+    assert parser.feed('Ada,"open\n') is None
+    assert parser.oversized() == (1, f"line longer than {config.IMPORT_MAX_LINE_BYTES} bytes")
+    assert parser.feed("Bo,ok\n") == (2, {"name": "Bo", "summary": "ok"})
+    assert parser.finish() is None
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        RecordParser("xml")
@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+import pytest
+from bson import ObjectId
+
+pytest.importorskip("pyarrow")
+
+from backend.core.columnar import export_collection, import_collection, load_local_index, read_vectors
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self.docs, key=lambda doc: doc[key], reverse=direction < 0))
+
+    def limit(self, n):
+        return FakeCursor(self.docs[:n] if n else self.docs)  # pymongo: limit(0) is no limit
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeInsertResult:
+    def __init__(self, ids):
+        self.inserted_ids = ids
+
+
+class FakeCollection:
+    full_name = "candidates.resumes"
+
+    def __init__(self, docs=(), on_count=None):
+        self.docs = list(docs)
+        self.on_count = on_count
+
+    def count_documents(self, query):
+        count = len(self.docs)
+        if self.on_count:
+            self.on_count(self)
+        return count
+
+    def find(self, query, batch_size=None):
+        return FakeCursor(list(self.docs))
+
+    def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+        return FakeInsertResult([doc["_id"] for doc in docs])
+
+
+def candidate(i, dim=4):
+    return {
+        "_id": ObjectId(),
+        "name": f"Candidate {i}",
+        "skills": ["Python", "AWS"][: i % 3],
+        "experience": i if i % 2 else 2.5,
+        "location": "Berlin",
+        "imported_at": datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+        "embedding": [float(i + j) for j in range(dim)] if i % 4 else [1.0, 2.0],  # wrong dim every 4th
+        "notes": {"source": "csv", "tags": [1, 2]},
+    }
+
+
+def test_export_import_round_trip(tmp_path):
+    docs = [candidate(i) for i in range(25)]
+    manifest = export_collection(FakeCollection(docs), str(tmp_path), ["embedding"], dim=4, chunk_size=10)
+    assert manifest["count"] == 25 and [c["rows"] for c in manifest["chunks"]] == [10, 10, 5]
+
+    target = FakeCollection()
+    assert import_collection(target, str(tmp_path), batch_size=7) == {"written": 25, "errors": 0}
+    restored = {doc["_id"]: doc for doc in target.docs}
+    for doc in docs:
+        back = restored[doc["_id"]]
+        if back["imported_at"].tzinfo is None:  # Extended JSON dates come back naive
+            back["imported_at"] = back["imported_at"].replace(tzinfo=datetime.timezone.utc)
+        assert back == doc
+
+    index = load_local_index(str(tmp_path))
+    assert len(index) == 25 - 7  # rows whose vector had the wrong dimension are skipped
+    assert read_vectors(str(tmp_path)).shape == (25, 4)
+
+
+def test_empty_export_ignores_documents_inserted_after_the_count(tmp_path):
+    late = candidate(1)
+    collection = FakeCollection(on_count=lambda c: c.docs.append(late))
+    manifest = export_collection(collection, str(tmp_path), ["embedding"], dim=4)
+    assert manifest["count"] == 0 and manifest["chunks"] == []
+    assert read_vectors(str(tmp_path)).shape == (0, 4)
+    assert import_collection(FakeCollection(), str(tmp_path)) == {"written": 0, "errors": 0}
@@ -0,0 +1,45 @@
+import logging
+
+import numpy as np
+
+from backend.core.extractor import TieredJobExtractor
+from backend.core.taxonomy import get_taxonomy
+
+
+class LabelEmbedder:
+    """encode_batch(): one axis per skill label, set when the label occurs in the text."""
+
+    def __init__(self):
+        taxonomy = get_taxonomy()
+        self.labels = [taxonomy.label(i, "skills").lower() for i in taxonomy.labels["skills"]]
+        self.batches = []
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        vectors = np.zeros((len(texts), len(self.labels) + 1), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hits = [i for i, label in enumerate(self.labels) if label in text.lower()]
+            vectors[row, hits or [-1]] = 3.0  # unnormalized on purpose
+        return vectors.tolist()
+
+
+class NoLLM:
+    def complete(self, prompt):
+        raise AssertionError("the confident local path must not call the LLM")
+
+
+def test_classify_skills_encodes_through_the_shared_embedder():
+    embedder = LabelEmbedder()
+    extractor = TieredJobExtractor(llm_client=NoLLM(), embedder=embedder)
+    classified = extractor.classify_skills("We build services in Python. Deploys run on Kubernetes.")
+    assert classified == ["python", "kubernetes"]
+    assert embedder.batches[-1] == ["We build services in Python.", "Deploys run on Kubernetes."]
+
+
+def test_extraction_logs_at_debug_instead_of_printing(capsys, caplog):
+    extractor = TieredJobExtractor(llm_client=NoLLM(), embedder=LabelEmbedder(), confidence_threshold=0.5)
+    with caplog.at_level(logging.DEBUG, logger="backend.core.extractor"):
+        fields = extractor.extract_fields("Python, Docker and Kubernetes. 5 years of experience.")
+    assert fields["extraction_path"] == "local"
+    assert capsys.readouterr().out == ""
+    assert "Job extraction via local" in caplog.text
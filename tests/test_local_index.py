@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from backend.core.local_index import LocalVectorIndex
+from backend.core.projection import VectorProjection
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    ids = [f"c{i}" for i in range(200)]
+    metadata = [{"location": "Berlin" if i % 2 else "Paris", "experience": i % 10, "skills": ["python"] if i % 3 == 0 else []}
+                for i in range(200)]
+    return ids, vectors, metadata
+
+
+def exact_top(vectors, query, k, rows=None):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    rows = np.arange(len(vectors)) if rows is None else np.asarray(rows)
+    return [f"c{i}" for i in rows[np.argsort(-scores[rows])][:k]]
+
+
+def test_search_matches_brute_force_with_filters(corpus):
+    ids, vectors, metadata = corpus
+    index = LocalVectorIndex(ids, vectors, metadata)
+    query = vectors[7]
+    assert [h["_id"] for h in index.search(query, top_k=5)] == exact_top(vectors, query, 5)
+
+    filters = {"locations": ["Berlin"], "min_experience": 5, "required_skills": ["python"]}
+    allowed = [i for i, m in enumerate(metadata) if m["location"] == "Berlin" and m["experience"] >= 5 and m["skills"]]
+    assert [h["_id"] for h in index.search(query, top_k=5, filters=filters)] == exact_top(vectors, query, 5, allowed)
+    assert all(0 <= h["score"] <= 1 for h in index.search(query, top_k=5))
+
+
+@pytest.mark.parametrize("kind", ["pca", "truncate", "binary"])
+def test_projection_first_pass_keeps_the_top_results(corpus, kind):
+    ids, vectors, metadata = corpus
+    projection = VectorProjection.fit(vectors, kind=kind, dim=8)
+    index = LocalVectorIndex(ids, vectors, metadata, projection=projection, oversample=10)
+    query = vectors[3]
+    assert [h["_id"] for h in index.search(query, top_k=3)][0] == "c3"
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, fields):
+        return iter(self.docs)
+
+
+def test_from_collection_keeps_the_projection(corpus):
+    ids, vectors, _ = corpus
+    docs = [{"_id": i, "embedding": list(v)} for i, v in zip(ids, vectors)]
+    projection = VectorProjection.fit(vectors, kind="pca", dim=8)
+    index = LocalVectorIndex.from_collection(FakeCollection(docs), vector_path="embedding", projection=projection)
+    assert index.projection is projection
+    assert index.reduced.shape == (200, 8)
+    assert len(LocalVectorIndex.from_collection(FakeCollection([]))) == 0
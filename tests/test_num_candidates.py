@@ -0,0 +1,64 @@
+import json
+
+from backend.core.num_candidates import NumCandidatesPolicy, default_num_candidates
+
+SWEEPS = {
+    "10": [
+        {"num_candidates": 100, "recall": 0.97},
+        {"num_candidates": 20, "recall": 0.80},
+        {"num_candidates": 50, "recall": 0.95},
+    ],
+    "100": [
+        {"num_candidates": 200, "recall": 0.90},
+        {"num_candidates": 400, "recall": 0.96},
+    ],
+}
+
+
+def test_default_rule():
+    assert default_num_candidates(10) == 60
+    assert default_num_candidates(100) == 200
+
+
+def test_picks_cheapest_value_meeting_target():
+    policy = NumCandidatesPolicy(SWEEPS)
+    assert policy.num_candidates(10, target_recall=0.95) == 50
+    assert policy.num_candidates(10, target_recall=0.5) == 20
+
+
+def test_uses_closest_tuned_top_k_at_or_above_request():
+    policy = NumCandidatesPolicy(SWEEPS)
+    assert policy.num_candidates(5, target_recall=0.95) == 50
+    assert policy.num_candidates(50, target_recall=0.95) == 400
+
+
+def test_unreachable_target_uses_largest_swept_value():
+    assert NumCandidatesPolicy(SWEEPS).num_candidates(10, target_recall=0.999) == 100
+
+
+def test_scales_above_largest_tuned_top_k_and_never_below_top_k():
+    policy = NumCandidatesPolicy(SWEEPS)
+    assert policy.num_candidates(200, target_recall=0.95) == 800
+    assert NumCandidatesPolicy({"10": [{"num_candidates": 5, "recall": 1.0}]}).num_candidates(10) == 10
+
+
+def test_load(tmp_path):
+    assert NumCandidatesPolicy.load(str(tmp_path / "missing.json")) is None
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"sweeps": {"10": []}}))
+    assert NumCandidatesPolicy.load(str(path)) is None
+    path.write_text(json.dumps({"corpus_size": 1000, "sweeps": SWEEPS}))
+    assert NumCandidatesPolicy.load(str(path)).num_candidates(10, 0.95) == 50
+
+
+def test_searcher_scales_by_filter_selectivity():
+    from backend import config
+    from backend.core.searcher import CandidateSearcher
+
+    searcher = CandidateSearcher(collection=None)
+    searcher.num_candidates_policy = NumCandidatesPolicy(SWEEPS)
+    assert searcher.num_candidates_for(10, selectivity=1.0) == 50
+    assert searcher.num_candidates_for(10, selectivity=0.1) == 500
+    # Selectivity is floored, and the result capped at Atlas' limit.
+    assert searcher.num_candidates_for(10, selectivity=0.0) == min(int(50 / config.MIN_FILTER_SELECTIVITY), config.NUM_CANDIDATES_MAX)
+    assert searcher.num_candidates_for(100, selectivity=0.0001) == config.NUM_CANDIDATES_MAX
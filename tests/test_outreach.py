@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+import pytest
+
+from backend.core.outreach import OutreachGenerator, TemplateCache, jd_hash, validate_template
+
+TEMPLATE = {
+    "subject": "[Candidate Name], a role for you",
+    "emailTemplate": "<p>Hi [Candidate Name],</p><p>[Personal Note]</p>"
+                     "<p>As [Current Title] at [Current Company] in [Location]...</p><p>[Sender Name]</p>",
+}
+
+
+class FakeClient:
+    """complete_json stand-in: the template for template prompts, scripted notes otherwise."""
+
+    def __init__(self, template=TEMPLATE, notes=None, fail_refine=False, delay=0.0):
+        self.template = template
+        self.notes = notes or (lambda prompt: [])
+        self.fail_refine = fail_refine
+        self.delay = delay
+        self.template_calls = 0
+        self.refine_calls = 0
+        self._lock = threading.Lock()
+
+    def complete_json(self, prompt, response_schema=None, timeout=None):
+        time.sleep(self.delay)
+        with self._lock:
+            if response_schema is not None:
+                self.template_calls += 1
+                return json.dumps(self.template)
+            self.refine_calls += 1
+        if self.fail_refine:
+            raise ConnectionError("down")
+        return json.dumps(self.notes(prompt))
+
+
+def generator(client):
+    gen = OutreachGenerator(client, cache=TemplateCache(max_size=4, ttl=60))
+    for llm in (gen.template_caller, gen.refine_caller):
+        llm.base_delay = 0
+    return gen
+
+
+CANDIDATES = [
+    {"name": "Ann <Lee>", "title": "Data Engineer", "company": "Acme", "location": "Berlin", "skills": ["python", "k8s"]},
+    {"name": "Bob"},
+]
+
+
+def test_jd_hash_ignores_whitespace_and_case_but_not_sender():
+    assert jd_hash("Senior  Python\nEngineer ", "Sam") == jd_hash("senior python engineer", "Sam")
+    assert jd_hash("senior python engineer", "Sam") != jd_hash("senior python engineer", "Kim")
+
+
+def test_validate_template_inserts_missing_note_slot_or_rejects():
+    fixed = validate_template({"subject": "s", "emailTemplate": "<p>Hi [Candidate Name],</p><p>Body</p>"})
+    assert fixed["emailTemplate"] == "<p>Hi [Candidate Name],</p><p>[Personal Note]</p><p>Body</p>"
+    with pytest.raises(ValueError):
+        validate_template({"subject": "s", "emailTemplate": "Hi [Candidate Name], plain text"})
+    with pytest.raises(ValueError):
+        validate_template({"subject": "s", "emailTemplate": "<p>Hi there</p>"})
+    with pytest.raises(ValueError):
+        validate_template({"emailTemplate": "<p>Hi [Candidate Name]</p>"})
+
+
+def test_template_cache_lru_and_ttl():
+    cache = TemplateCache(max_size=2, ttl=60)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None and cache.get("a") == {"n": 1}
+
+    expiring = TemplateCache(max_size=2, ttl=0)
+    expiring.put("a", {"n": 1})
+    time.sleep(0.01)
+    assert expiring.get("a") is None
+
+
+def test_template_is_generated_once_per_jd():
+    client = FakeClient(delay=0.05)
+    gen = generator(client)
+    threads = [threading.Thread(target=gen.template, args=("Python engineer", "Sam")) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert client.template_calls == 1
+    assert gen.template("python   ENGINEER", "Sam")["cached"] is True
+
+
+def test_fill_escapes_values_and_defaults_missing_fields():
+    gen = generator(FakeClient())
+    email = gen.fill(TEMPLATE, CANDIDATES[0], "Sam & Co", "A <b>note</b>")
+    assert email["subject"] == "Ann <Lee>, a role for you"
+    assert "Hi Ann &lt;Lee&gt;," in email["body"]
+    assert "<p>A &lt;b&gt;note&lt;/b&gt;</p>" in email["body"]
+    assert "As Data Engineer at Acme in Berlin" in email["body"]
+    assert "Sam &amp; Co" in email["body"]
+    assert "[" not in email["body"]
+
+    bare = gen.fill(TEMPLATE, {"name": ""}, "Sam", "n")["body"]
+    assert "Hi there," in bare and "As your current role at your current company" in bare
+
+
+def test_local_note_uses_skills_shared_with_the_job():
+    gen = generator(FakeClient())
+    job_skills = gen.taxonomy.match("Python and Kubernetes engineers", "skills")
+    note = gen.local_note(CANDIDATES[0], job_skills)
+    assert "Data Engineer at Acme" in note and "Python" in note and "Kubernetes" in note
+    assert gen.local_note({}, job_skills) == "Your background caught our attention for this role."
+
+
+def test_emails_without_refine_stream_in_order():
+    client = FakeClient()
+    events = list(generator(client).emails("Python engineer", "Sam", CANDIDATES))
+    assert [e["event"] for e in events] == ["template", "email", "email", "done"]
+    assert [e["index"] for e in events[1:3]] == [0, 1]
+    assert not any(e["refined"] for e in events[1:3])
+    assert client.refine_calls == 0
+
+
+def test_refine_uses_llm_notes_and_falls_back_per_batch():
+    def notes(prompt):
+        return [{"index": 0, "note": "Great pipeline work."}] if "Ann" in prompt else [{"index": "x", "note": "bad"}]
+
+    client = FakeClient(notes=notes)
+    events = list(generator(client).emails("Python engineer", "Sam", CANDIDATES, refine=True, batch_size=1))
+    emails = {e["index"]: e for e in events if e["event"] == "email"}
+    assert emails[0]["refined"] and "Great pipeline work." in emails[0]["body"]
+    assert not emails[1]["refined"]
+    assert client.refine_calls == 2
+
+
+def test_failed_refine_batches_do_not_open_the_template_circuit():
+    client = FakeClient(fail_refine=True)
+    gen = generator(client)
+    candidates = [{"name": f"c{i}"} for i in range(8)]
+    events = list(gen.emails("jd one", "Sam", candidates, refine=True, batch_size=1, concurrency=2))
+    assert sum(e["event"] == "email" and not e["refined"] for e in events) == 8
+    assert gen.refine_caller.breaker.state == "open"
+    assert gen.template("jd two", "Sam")["cached"] is False
+
+
+def test_closing_the_stream_cancels_queued_batches():
+    client = FakeClient(notes=lambda prompt: [{"index": 0, "note": "n"}], delay=0.05)
+    stream = generator(client).emails("jd", "Sam", [{"name": f"c{i}"} for i in range(20)],
+                                      refine=True, batch_size=1, concurrency=2)
+    next(stream)  # template
+    next(stream)  # first email
+    stream.close()
+    time.sleep(0.2)
+    assert client.refine_calls < 6
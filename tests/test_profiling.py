@@ -0,0 +1,28 @@
+import logging
+
+from backend import config
+from backend.core import profiling
+
+
+def test_header_needs_a_configured_token(monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(config, "PROFILE_TOKEN", "")
+    assert not profiling.should_profile("anything")
+    assert not profiling.should_profile("")
+
+    monkeypatch.setattr(config, "PROFILE_TOKEN", "s3cret")
+    assert profiling.should_profile("s3cret")
+    assert not profiling.should_profile("guess")
+    assert not profiling.should_profile(None)
+
+
+def test_profile_is_written_and_logged(monkeypatch, tmp_path, caplog, capsys):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILE_TOKEN", "s3cret")
+    with caplog.at_level(logging.INFO, logger="backend.core.profiling"):
+        profile = profiling.begin("GET", "/api/search", "s3cret", mode="sample")
+        assert profiling.begin("GET", "/api/search", "s3cret") is None  # one at a time
+        name = profiling.end(profile, 200)
+    assert (tmp_path / name).exists()
+    assert "Profiled GET /api/search" in caplog.text
+    assert capsys.readouterr().out == ""
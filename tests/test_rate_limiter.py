@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.llm_clients.rate_limiter import RateLimitTimeout, SQLiteRateLimiter, estimate_tokens
+
+
+@pytest.fixture
+def make_limiter(tmp_path):
+    def make(rpm=0, tpm=0):
+        limiter = SQLiteRateLimiter(path=str(tmp_path / "rate.sqlite3"), rpm=rpm, tpm=tpm)
+        limiter.shares = {"interactive": 1.0, "default": 1.0, "bulk": 0.5}
+        return limiter
+    return make
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("x" * 400, expected_output=100) == 201
+    assert estimate_tokens(["x" * 40, object()], expected_output=0) == 11 + 258
+
+
+def test_requests_per_minute(make_limiter):
+    limiter = make_limiter(rpm=2)
+    limiter.acquire(1, "interactive")
+    limiter.acquire(1, "interactive")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(1, "interactive", timeout=0.05)
+    assert limiter.stats()["rpm_used"] == 2
+
+
+def test_tokens_per_minute_and_record_usage(make_limiter):
+    limiter = make_limiter(tpm=1000)
+    call_id = limiter.acquire(100, "interactive")
+    limiter.record_usage(call_id, 950)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(100, "interactive", timeout=0.05)
+    assert limiter.stats()["tpm_used"] == 950
+
+
+def test_oversized_call_is_admitted_into_an_empty_window(make_limiter):
+    limiter = make_limiter(tpm=100)
+    assert limiter.acquire(5000, "interactive", timeout=0.05)
+
+
+def test_bulk_only_fills_its_share(make_limiter):
+    limiter = make_limiter(rpm=4)
+    limiter.acquire(1, "bulk")
+    limiter.acquire(1, "bulk")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(1, "bulk", timeout=0.05)
+    limiter.acquire(1, "interactive", timeout=0.05)
+
+
+def test_lower_priority_waits_behind_a_waiting_higher_priority(make_limiter):
+    limiter = make_limiter(rpm=1)
+    limiter.acquire(1, "interactive")
+    admitted = []
+    waiting = threading.Thread(target=lambda: admitted.append(limiter.acquire(1, "interactive", timeout=2)))
+    waiting.start()
+    time.sleep(0.1)
+    assert limiter.stats()["waiting"] == 1
+
+    # Bulk is held back while the interactive caller waits, even once the window frees up.
+    with limiter._connect() as db:
+        db.execute("DELETE FROM calls")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(1, "bulk", timeout=0.5)
+    waiting.join()
+    assert admitted
+
+
+def test_disabled_limits_admit_everything(make_limiter):
+    limiter = make_limiter()
+    for _ in range(50):
+        limiter.acquire(10 ** 6, "bulk", timeout=0)
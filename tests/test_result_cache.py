@@ -0,0 +1,85 @@
+import numpy as np
+
+from backend.core.result_cache import CachedSearch, SemanticResultCache
+
+
+def entry(hits, key="k", top_k=10):
+    return CachedSearch(key=key, top_k=top_k, query="q", features={}, hits=hits)
+
+
+def vec(*values):
+    return list(np.asarray(values + (0.0,) * (4 - len(values)), dtype=np.float32))
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("threshold", 0.95)
+    return SemanticResultCache(ttl=60, max_entries=4, dim=4, **kwargs)
+
+
+def test_near_duplicate_hits_and_distinct_misses():
+    cache = make_cache()
+    cache.store(vec(1, 0), entry([("a", 0.9)]))
+    assert cache.lookup(vec(1, 0.1), "k", 10).hits == [("a", 0.9)]
+    assert cache.lookup(vec(0, 1), "k", 10) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_and_top_k_must_fit():
+    cache = make_cache()
+    cache.store(vec(1), entry([("a", 0.9)], key="k", top_k=10))
+    assert cache.lookup(vec(1), "other filters", 10) is None
+    assert cache.lookup(vec(1), "k", 20) is None
+    assert cache.lookup(vec(1), "k", 5) is not None
+
+
+def test_refresh_replaces_the_stale_entry_in_place():
+    cache = make_cache()
+    cache.store(vec(1), entry([("old", 0.5)]))
+    stale = cache.lookup(vec(1), "k", 10)
+    cache.store(vec(1), entry([("new", 0.7)]), replace=stale)
+    assert cache.lookup(vec(1), "k", 10).hits == [("new", 0.7)]
+    assert cache.stats()["entries"] == 1
+
+
+def test_text_past_the_embedding_window_must_match():
+    cache = make_cache(embed_words=5)
+    head = "senior python engineer berlin remote"
+    cache.store(vec(1), entry([("a", 0.9)]), text=head + " must know kafka")
+    assert cache.lookup(vec(1), "k", 10, text=head + " must know kafka") is not None
+    assert cache.lookup(vec(1), "k", 10, text=head.upper() + "  MUST know   kafka") is not None
+    assert cache.lookup(vec(1), "k", 10, text=head + " must know cobol") is None
+    short = make_cache(embed_words=5)
+    short.store(vec(1), entry([("a", 0.9)]), text="python engineer")
+    assert short.lookup(vec(1), "k", 10, text="python developer") is not None
+
+
+class FakeCollection:
+    def __init__(self, count, newest):
+        self.count, self.newest = count, newest
+
+    def find_one(self, *args, **kwargs):
+        return {"_id": self.newest}
+
+    def estimated_document_count(self):
+        return self.count
+
+
+def test_corpus_change_on_any_shard_invalidates():
+    cache = make_cache(corpus_check_interval=0)
+    shards = [FakeCollection(10, 1), FakeCollection(20, 2)]
+    cache.refresh_corpus_version(*shards)
+    cache.store(vec(1), entry([("a", 0.9)]))
+    cache.refresh_corpus_version(*shards)
+    assert cache.lookup(vec(1), "k", 10) is not None
+
+    shards[1].count, shards[1].newest = 21, 3
+    cache.refresh_corpus_version(*shards)
+    assert cache.lookup(vec(1), "k", 10) is None
+
+
+def test_ring_buffer_overwrites_oldest():
+    cache = make_cache(threshold=0.999)
+    for i in range(5):
+        cache.store(vec(*([0.0] * i + [1.0])) if i < 4 else vec(1, 1), entry([(i, 1.0)]))
+    assert cache.lookup(vec(1), "k", 10) is None  # slot 0 was reused by the fifth entry
+    assert cache.lookup(vec(0, 1), "k", 10).hits == [(1, 1.0)]
@@ -0,0 +1,132 @@
+import datetime
+
+import numpy as np
+
+from backend import dependencies
+from backend.core.local_index import LocalVectorIndex
+from backend.core.searcher import CandidateSearcher, build_search_filter, build_vector_filter
+from backend.core.skill_index import SkillBitsetIndex, SkillRegistry, bitset_bytes, popcount
+
+
+class StaticRegistry(SkillRegistry):
+    """codes_for() over a fixed canonical id -> code table (no Mongo)."""
+
+    def __init__(self, codes):
+        self.codes = codes
+
+    def codes_for(self, canonical_ids, create=True):
+        return sorted({self.codes[c] for c in canonical_ids if c in self.codes})
+
+
+def make_index():
+    index = SkillBitsetIndex(collection=None, sync_interval=float("inf"))
+    index._synced_at = float("inf")  # never sync from Mongo in tests
+    return index
+
+
+def test_bitset_helpers():
+    assert bitset_bytes([]) == b""
+    assert bitset_bytes([0, 3, 9]) == bytes([0b00001001, 0b00000010])
+    assert popcount(np.array([[3, 1], [0, 2 ** 63]], dtype=np.uint64)).tolist() == [3, 1]
+
+
+def test_overlap_on_empty_index_returns_none():
+    assert make_index().overlap([1, 2], ["a", "b"]) == [None, None]
+    assert make_index().overlap([1], []) == []
+
+
+def test_overlap_counts_shared_codes():
+    index = make_index()
+    index.upsert("a", [1, 2, 70])
+    index.upsert("b", [2])
+    assert index.overlap([2, 70, 500], ["a", "b", "missing"]) == [2, 1, None]
+
+
+def test_upsert_replaces_codes_and_postings():
+    index = make_index()
+    index.upsert("a", [1, 2])
+    index.upsert("a", [2, 3])
+    assert index.codes_of_row(index.rows["a"]) == [2, 3]
+    assert index.filter_ids([1]) == []
+    assert index.filter_ids([2, 3]) == ["a"]
+
+
+def test_filter_ids_intersects_postings_across_growth():
+    index = make_index()
+    for i in range(1500):  # grows past the initial 1024-row capacity
+        index.upsert(i, [1] + ([2] if i % 3 == 0 else []) + ([3] if i % 5 == 0 else []))
+    assert index.filter_ids([2, 3]) == [str(i) for i in range(0, 1500, 15)]
+    assert len(index.filter_ids([1])) == 1500
+    assert index.filter_ids([4]) == []
+
+
+def test_filter_skills_canonicalizes_names():
+    index = make_index()
+    index.upsert("a", [0, 1])
+    index.upsert("b", [0])
+    registry = StaticRegistry({"python": 0, "kubernetes": 1})
+    assert index.filter_skills(registry, ["Python", "k8s"]) == ["a"]
+    assert index.filter_skills(registry, ["python3"]) == ["a", "b"]
+    assert index.filter_skills(registry, ["Python", "Cobol"]) == []  # never indexed
+
+
+def test_local_search_filters_required_skills_through_bitmaps():
+    index = make_index()
+    index.upsert("a", [0, 1])
+    index.upsert("b", [0])
+    local = LocalVectorIndex(["a", "b", "c"], np.eye(3, dtype=np.float32),
+                             [{"skills": ["Python"]}, {"skills": ["Python"]}, {}])
+    searcher = CandidateSearcher(None, local_index=local, skill_index=index,
+                                 skill_registry=StaticRegistry({"python": 0, "kubernetes": 1}))
+
+    filters = searcher.local_filters({"required_skills": ["k8s"], "min_experience": 0})
+    assert filters == {"ids": ["a"], "min_experience": 0}
+    hits = local.search([1, 1, 1], top_k=3, filters=filters)
+    assert [hit["_id"] for hit in hits] == ["a"]
+    # "Kubernetes" is not in a's raw skills list: the canonical bitmap is what matched.
+    assert local.search([1, 1, 1], top_k=3, filters={"required_skills": ["k8s"]}) == []
+
+
+def test_atlas_filters_match_the_same_canonical_codes():
+    searcher = CandidateSearcher(None, skill_registry=StaticRegistry({"python": 0, "kubernetes": 1}))
+
+    filters = searcher.atlas_filters({"required_skills": ["k8s", "Python"], "locations": ["Berlin"]})
+    assert filters == {"skill_codes": [0, 1], "locations": ["Berlin"]}
+    assert build_vector_filter(filters) == {"$and": [
+        {"location": {"$in": ["Berlin"]}},
+        {"skill_codes": {"$eq": 0}},
+        {"skill_codes": {"$eq": 1}},
+    ]}
+    assert build_search_filter({"skill_codes": [1]}) == [{"equals": {"path": "skill_codes", "value": 1}}]
+    # A skill nobody was indexed with: no Atlas query is needed at all.
+    assert searcher.atlas_filters({"required_skills": ["Cobol"]}) is None
+    assert searcher.search([0.0], filters={"required_skills": ["Cobol"]}) == []
+    # Without a registry the raw strings are passed through unchanged.
+    assert CandidateSearcher(None).atlas_filters({"required_skills": ["k8s"]}) == {"required_skills": ["k8s"]}
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[key], reverse=direction < 0))
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, fields):
+        return FakeCursor(self.docs)
+
+
+def test_dependency_factory_loads_the_corpus_before_any_request(monkeypatch):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    docs = [{"_id": "a", "skill_codes": [0, 1], "skills_indexed_at": now},
+            {"_id": "b", "skill_codes": [1], "skills_indexed_at": now}]
+    monkeypatch.setattr(dependencies, "collection", FakeCollection(docs))
+    dependencies.get_skill_index.cache_clear()
+    try:
+        index = dependencies.get_skill_index()
+        assert len(index) == 2 and index.watermark == now
+        assert index.filter_ids([1]) == ["a", "b"]
+    finally:
+        dependencies.get_skill_index.cache_clear()
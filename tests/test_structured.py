@@ -0,0 +1,144 @@
+import time
+
+import pytest
+
+from backend.core.llm_clients.structured import (
+    CircuitBreaker,
+    CircuitOpenError,
+    JSONExtractionError,
+    LLMCallError,
+    StructuredLLMCaller,
+    extract_json,
+    failure_counts,
+)
+
+
+class FakeDeadline:
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+def scripted(*responses):
+    """generate() returning (or raising) the given responses in order."""
+    responses = list(responses)
+
+    def generate(prompt, timeout=None):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    generate.remaining = responses
+    return generate
+
+
+def caller(generate, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker("test", failure_threshold=2, reset_timeout=60))
+    return StructuredLLMCaller("test", generate, sleep=lambda delay: None, **kwargs)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', {"a": 1}),
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Sure! Here it is: {"a": [1, 2,],} Hope that helps.', {"a": [1, 2]}),
+    ('{"a": "x", "b": [1, 2', {"a": "x", "b": [1, 2]}),
+    ('{"a": "trunc', {"a": "trunc"}),
+    ('{"a": 1, "b":', {"a": 1}),
+])
+def test_extract_json_repairs_common_llm_output(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_extract_json_lists_and_type_mismatch():
+    assert extract_json('result: [{"i": 0}, {"i": 1}]', expect=list) == [{"i": 0}, {"i": 1}]
+    with pytest.raises(JSONExtractionError):
+        extract_json('{"a": 1}', expect=list)
+    with pytest.raises(JSONExtractionError):
+        extract_json("   ")
+
+
+def test_call_json_retries_until_valid():
+    generate = scripted(ConnectionError("down"), "no json here", '{"ok": true}')
+    assert caller(generate).call_json("prompt") == {"ok": True}
+    assert generate.remaining == []
+
+
+def test_validator_rejection_is_retried_and_can_transform():
+    def validate(value):
+        if "name" not in value:
+            raise ValueError("missing name")
+        return {**value, "checked": True}
+
+    generate = scripted('{"x": 1}', '{"name": "a"}')
+    assert caller(generate).call_json("prompt", validate=validate) == {"name": "a", "checked": True}
+
+
+def test_exhausted_attempts_raise_with_failure_mode():
+    with pytest.raises(LLMCallError) as error:
+        caller(scripted("", "", ""), max_attempts=3).call_json("prompt")
+    assert error.value.failure_mode == "empty_response"
+
+
+def test_breaker_opens_then_half_open_trial_closes_it():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    llm = caller(scripted(*[ConnectionError()] * 2, '{"ok": 1}'), max_attempts=1, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(LLMCallError):
+            llm.call_json("prompt")
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        llm.call_json("prompt")
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert llm.call_json("prompt") == {"ok": 1}
+    assert breaker.state == "closed"
+
+
+def test_unexpected_validator_error_does_not_wedge_half_open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    def validate(value):
+        raise KeyError("bug")
+
+    llm = caller(scripted('{"a": 1}', '{"a": 1}'), max_attempts=1, breaker=breaker)
+    with pytest.raises(LLMCallError):
+        llm.call_json("prompt", validate=validate)
+    assert breaker.allow()  # the trial slot was released
+
+
+def test_caller_deadline_does_not_count_against_the_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+
+    def slow(prompt, timeout=None):
+        time.sleep(timeout)
+        raise TimeoutError("timed out")
+
+    with pytest.raises(LLMCallError) as error:
+        caller(slow, breaker=breaker).call_json("prompt", deadline=FakeDeadline(0.02))
+    assert error.value.failure_mode == "deadline_exceeded"
+    assert breaker.state == "closed"
+
+
+def test_garbage_under_a_tight_deadline_still_charges_the_breaker():
+    breaker = CircuitBreaker("tight", failure_threshold=1, reset_timeout=60)
+    llm = StructuredLLMCaller("tight", scripted("not json", "not json"), breaker=breaker, sleep=lambda delay: None)
+    llm.backoff = lambda attempt: 60.0  # longer than the time left
+
+    with pytest.raises(LLMCallError) as error:
+        llm.call_json("prompt", deadline=FakeDeadline(5))
+    assert error.value.failure_mode == "parse_error"
+    assert breaker.state == "open"
+    assert failure_counts()["failures"].get("tight.parse_error") == 1
+    assert "tight.deadline_exceeded" not in failure_counts()["failures"]
+
+
+def test_expired_deadline_makes_no_call():
+    generate = scripted('{"a": 1}')
+    with pytest.raises(LLMCallError) as error:
+        caller(generate).call_json("prompt", deadline=FakeDeadline(0))
+    assert error.value.failure_mode == "deadline_exceeded"
+    assert generate.remaining == ['{"a": 1}']
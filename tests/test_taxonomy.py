@@ -0,0 +1,79 @@
+import pytest
+
+from backend.core.taxonomy import AhoCorasick, SkillTaxonomy, get_taxonomy, slugify
+
+ENTRIES = {
+    "skills": {
+        "spark": {"label": "Spark", "synonyms": []},
+        "apache_spark": {"label": "Apache Spark", "synonyms": []},
+        "kubernetes": {"label": "Kubernetes", "synonyms": ["k8s"]},
+        "golang": {"label": "Golang", "synonyms": [], "exact_only": ["Go"]},
+        "c++": {"label": "C++", "synonyms": ["cpp"]},
+    },
+    "qualifications": {
+        "masters": {"label": "Master", "synonyms": ["MSc"], "exact_only": ["MS"]},
+    },
+}
+
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy(ENTRIES)
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick()
+    for pattern in ("he", "she", "hers"):
+        matcher.add(pattern, pattern)
+    assert sorted(matcher.iter_matches("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_match_maps_synonyms_in_order_without_duplicates(taxonomy):
+    text = "Deploys with K8s and kubernetes, writes C++ services"
+    assert taxonomy.match(text) == ["kubernetes", "c++"]
+
+
+def test_match_prefers_leftmost_longest(taxonomy):
+    assert taxonomy.match("Experience with Apache Spark required") == ["apache_spark"]
+    assert taxonomy.match("Spark or Apache Spark") == ["spark", "apache_spark"]
+
+
+def test_match_requires_word_boundaries(taxonomy):
+    assert taxonomy.match("sparkling kubernetesx") == []
+
+
+def test_exact_only_aliases_are_not_matched_in_free_text(taxonomy):
+    assert taxonomy.match("We go fast") == []
+    assert taxonomy.canonicalize(["Go"]) == ["golang"]
+    assert taxonomy.canonicalize(["MS"], "qualifications") == ["masters"]
+
+
+def test_canonicalize_scans_values_and_slugs_unknown_terms(taxonomy):
+    assert taxonomy.canonicalize(["MSc Computer Science"], "qualifications") == ["masters"]
+    assert taxonomy.canonicalize(["k8s", "Kubernetes", "  ", None, "Fancy Tool 2"]) == ["kubernetes", "fancy_tool_2"]
+    assert slugify("C# / .NET") == "c#_net"
+
+
+def test_label_falls_back_to_id(taxonomy):
+    assert taxonomy.label("kubernetes") == "Kubernetes"
+    assert taxonomy.label("unknown_skill") == "unknown_skill"
+
+
+def test_shipped_taxonomy_loads():
+    taxonomy = get_taxonomy()
+    assert taxonomy.canonicalize(["python3", "JS"]) == ["python", "javascript"]
+    assert taxonomy.match("Python and JavaScript developer") == ["python", "javascript"]
+
+
+@pytest.mark.parametrize("tool, umbrella", [
+    ("OpenSearch", "Elasticsearch"),
+    ("Jenkins", "CI/CD"),
+    ("GitHub Actions", "CI/CD"),
+    ("Unix", "Linux"),
+    ("GenAI", "LLM"),
+    ("TailwindCSS", "CSS"),
+    ("Scrum", "Agile"),
+])
+def test_shipped_taxonomy_keeps_distinct_tools_apart(tool, umbrella):
+    taxonomy = get_taxonomy()
+    assert taxonomy.canonicalize([tool]) != taxonomy.canonicalize([umbrella])
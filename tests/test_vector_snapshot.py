@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from backend.core.local_index import LocalVectorIndex
+from backend.core.vector_snapshot import VectorSnapshot, current_snapshot_path, publish_snapshot, write_snapshot
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    ids = [f"c{i}" for i in range(50)]
+    metadata = [{"location": "Berlin" if i % 2 else "Paris", "experience": i} for i in range(50)]
+    return ids, vectors, metadata
+
+
+def test_snapshot_round_trip_and_no_overwrite(tmp_path, corpus):
+    ids, vectors, metadata = corpus
+    path = tmp_path / "a.snap"
+    assert write_snapshot(str(path), [(ids[:20], vectors[:20], metadata[:20]), (ids[20:], vectors[20:], metadata[20:])], dim=8) == 50
+    snapshot = VectorSnapshot(str(path))
+    assert snapshot.ids == ids and snapshot.metadata[1]["location"] == "Berlin"
+    expected = LocalVectorIndex(ids, vectors, metadata).search(vectors[5], top_k=3)
+    assert [h["_id"] for h in snapshot.to_index().search(vectors[5], top_k=3)] == [h["_id"] for h in expected]
+
+    with pytest.raises(FileExistsError):
+        write_snapshot(str(path), [], dim=8)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.snap"]
+
+    publish_snapshot(str(tmp_path), "a.snap")
+    assert current_snapshot_path(str(tmp_path)) == str(path)
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    def batches():
+        yield ["a"], np.ones((1, 8), dtype=np.float32), [{}]
+        raise RuntimeError("mongo went away")
+
+    with pytest.raises(RuntimeError):
+        write_snapshot(str(tmp_path / "b.snap"), batches(), dim=8)
+    assert list(tmp_path.iterdir()) == []